@@ -0,0 +1,171 @@
+import time
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from database import load_data
+from models import now_timestamp
+
+DAY = 24 * 3600
+
+# Seconds between rollup refreshes
+ROLLUP_SECONDS = 5 * 60
+
+# Days before today that are still recounted on each refresh; older days are frozen
+ROLLUP_REOPEN_DAYS = 2
+
+# Daily rollup column -> human label
+METRICS = {
+    'signups': "Signups",
+    'messages': "Messages Sent",
+    'confessions_submitted': "Confessions Submitted",
+    'confessions_approved': "Confessions Approved",
+    'listings_created': "Listings Created",
+    'listings_sold': "Listings Sold"
+}
+
+WEEKDAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+def local_offset():
+    """Seconds east of UTC, so day buckets follow the server's calendar"""
+    return int(datetime.now().astimezone().utcoffset().total_seconds())
+
+def day_counts(timestamps, offset):
+    """Count timestamps per local day, as a Series indexed by day"""
+    if not timestamps:
+        return pd.Series(dtype='int64', index=pd.DatetimeIndex([]))
+    days = (np.asarray(timestamps, dtype=np.int64) + offset) // DAY * DAY
+    values, counts = np.unique(days, return_counts=True)
+    return pd.Series(counts, index=pd.to_datetime(values, unit='s'))
+
+def collect_timestamps(since):
+    """Timestamps at or after `since` for every rollup metric.
+    
+    Messages are appended in time order, so each chat is read from the end
+    and chats idle since before `since` are skipped entirely: a refresh costs
+    the recent traffic, not the whole chat history.
+    """
+    collected = {metric: [] for metric in METRICS}
+    
+    for user in list(load_data('users').values()):
+        if user.get('joined_date', 0) >= since:
+            collected['signups'].append(user['joined_date'])
+    
+    for chat in list(load_data('chats').values()):
+        if chat.get('last_activity', chat.get('created_at', 0)) < since:
+            continue
+        for message in reversed(list(chat['messages'])):
+            if message.get('timestamp', 0) < since:
+                break
+            collected['messages'].append(message['timestamp'])
+    
+    for confession in list(load_data('confessions').values()):
+        if confession.get('created_at', 0) >= since:
+            collected['confessions_submitted'].append(confession['created_at'])
+        if confession.get('status') == 'approved' and confession.get('approved_at', 0) >= since:
+            collected['confessions_approved'].append(confession['approved_at'])
+    
+    for listing in list(load_data('marketplace').values()):
+        if listing.get('created_at', 0) >= since:
+            collected['listings_created'].append(listing['created_at'])
+        if listing.get('status') == 'sold' and listing.get('sold_at', 0) >= since:
+            collected['listings_sold'].append(listing['sold_at'])
+    
+    return collected
+
+def event_rollup():
+    """One row per event: RSVPs, waitlist and fill rate"""
+    rows = [
+        {
+            'id': event['id'],
+            'title': event['title'],
+            'date': event.get('date'),
+            'rsvps': len(event.get('rsvps', [])),
+            'waitlist': len(event.get('waitlist', [])),
+            'capacity': event.get('max_attendees') or 50
+        }
+        for event in list(load_data('events').values())
+    ]
+    frame = pd.DataFrame(rows, columns=['id', 'title', 'date', 'rsvps', 'waitlist', 'capacity'])
+    frame['date'] = pd.to_datetime(frame['date'], unit='s')
+    frame['fill_rate'] = frame['rsvps'] / frame['capacity']
+    return frame
+
+class Rollups:
+    """Daily activity counts plus a per-event RSVP table, refreshed in the background.
+    
+    Days older than ROLLUP_REOPEN_DAYS are frozen once counted, so each
+    refresh only recounts the last few days; frozen days also keep their
+    counts after listings expire or chats are archived. Dashboards read the
+    published frames and never touch raw collections.
+    """
+    
+    def __init__(self):
+        self.daily = pd.DataFrame(columns=list(METRICS), index=pd.DatetimeIndex([]), dtype='int64')
+        self.events = None
+        self.frozen_until = None
+        self.computed_at = None
+        self.duration = None
+        self._lock = threading.Lock()
+    
+    def update(self):
+        """Recount the open days and republish; returns the number of days held"""
+        with self._lock:
+            start = time.time()
+            offset = local_offset()
+            today = (now_timestamp() + offset) // DAY * DAY - offset
+            boundary = today - ROLLUP_REOPEN_DAYS * DAY
+            since = self.frozen_until if self.frozen_until is not None else 0
+            
+            collected = collect_timestamps(since)
+            recent = pd.DataFrame({metric: day_counts(collected[metric], offset) for metric in METRICS})
+            
+            frozen = self.daily[self.daily.index < pd.to_datetime(since + offset, unit='s')]
+            daily = pd.concat([frozen, recent]).fillna(0).astype('int64').sort_index()
+            if len(daily):
+                # Days with no activity are zero rows, so rolling windows line up with the calendar
+                daily = daily.reindex(pd.date_range(daily.index[0], pd.to_datetime(today + offset, unit='s'), freq='D'), fill_value=0)
+            
+            self.daily = daily
+            self.events = event_rollup()
+            self.frozen_until = max(boundary, since)
+            self.computed_at = time.time()
+            self.duration = self.computed_at - start
+            return len(daily)
+
+ROLLUPS = Rollups()
+
+def update_rollups():
+    """Background job entry point"""
+    return ROLLUPS.update()
+
+def window(daily, days):
+    """The last `days` days of a daily frame (all of it for None)"""
+    if days is None or daily.empty:
+        return daily
+    return daily[daily.index > daily.index[-1] - pd.Timedelta(days=days)]
+
+def previous_window(daily, days):
+    """The `days` days before the current window, for deltas"""
+    if days is None or daily.empty:
+        return daily.iloc[0:0]
+    end = daily.index[-1] - pd.Timedelta(days=days)
+    return daily[(daily.index <= end) & (daily.index > end - pd.Timedelta(days=days))]
+
+def daily_percentiles(daily, quantiles=(0.5, 0.9, 0.99)):
+    """Per-metric percentiles of daily counts"""
+    table = daily.quantile(list(quantiles)).T
+    table.columns = [f"p{int(q * 100)}" for q in quantiles]
+    table['mean'] = daily.mean()
+    table['max'] = daily.max()
+    return table
+
+def rolling_average(daily, days=7):
+    return daily.rolling(days, min_periods=1).mean()
+
+def weekday_profile(daily):
+    """Mean count per weekday, Monday first"""
+    profile = daily.groupby(daily.index.dayofweek).mean()
+    profile.index = [WEEKDAY_LABELS[day] for day in profile.index]
+    return profile
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""Page render benchmark at synthetic scale.
+
+Seeds DATA_STORE (see seed.py), then renders each page entry point headlessly
+with Streamlit's AppTest as the benchmark admin and times it. The first render
+of each page is reported as cold (empty view caches); the rest give warm
+median/p95. Results are written as JSON and, with --baseline, compared
+against a stored run: a page whose warm median grows past the tolerance is a
+regression. A page that raises is a failure and is left out of the
+comparison, since its timings measure the crash. Either makes the exit
+status 1.
+
+Usage:
+    python benchmarks/page_benchmark.py --scale 10k --output bench-10k.json
+    python benchmarks/page_benchmark.py --scale 10k --baseline benchmarks/baseline-10k.json
+    python benchmarks/page_benchmark.py --scale 1k --messages 50000 --save-baseline benchmarks/baseline-1k.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from seed import SCALES, COLLECTIONS, BENCH_ADMIN, scale_counts, seed_data_store, store_counts
+from streamlit.testing.v1 import AppTest
+from storage_metrics import STORAGE_METRICS
+
+# Page entry point -> module, as registered in streamlit_app.PAGE_REGISTRY
+PAGES = {
+    'home_page': 'pages.home',
+    'clubs_page': 'pages.clubs',
+    'events_page': 'pages.events',
+    'marketplace_page': 'pages.marketplace',
+    'confessions_page': 'pages.confessions',
+    'chat_page': 'pages.chat',
+    'admin_page': 'pages.admin',
+    'profile_page': 'pages.profile'
+}
+
+# A page is a regression when its warm median exceeds the baseline by this
+# fraction and by at least MIN_REGRESSION_MS (so tiny pages don't flap)
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_MS = 5.0
+
+def render_page(module_name, func_name):
+    """AppTest script: import a page module and call its entry point"""
+    import importlib
+    getattr(importlib.import_module(module_name), func_name)()
+
+def storage_loads():
+    return sum(row['calls'] for row in STORAGE_METRICS.snapshot() if row['operation'] == 'load')
+
+def time_page(module_name, func_name, runs, timeout):
+    """Render a page `runs` times; returns timings and any exception text"""
+    timings = []
+    loads = []
+    error = None
+    for _ in range(runs):
+        at = AppTest.from_function(render_page, args=(module_name, func_name), default_timeout=timeout)
+        at.session_state.user = dict(BENCH_ADMIN)
+        at.session_state.privacy_consent = True
+        
+        before = storage_loads()
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        loads.append(storage_loads() - before)
+        
+        if at.exception and error is None:
+            error = at.exception[0].value
+    
+    warm = timings[1:] or timings
+    ordered = sorted(warm)
+    return {
+        'runs': runs,
+        'cold_ms': round(timings[0], 2),
+        'median_ms': round(statistics.median(warm), 2),
+        'p95_ms': round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)], 2),
+        'min_ms': round(ordered[0], 2),
+        'loads_per_render': round(statistics.mean(loads), 1),
+        'error': error
+    }
+
+def compare(results, baseline, tolerance):
+    """Per-page change against a baseline run; returns (rows, regressions)"""
+    rows = []
+    regressions = []
+    for page, result in results['pages'].items():
+        if result['error']:
+            rows.append({'page': page, 'status': 'error'})
+            continue
+        before = baseline.get('pages', {}).get(page)
+        if before is None or before.get('error'):
+            rows.append({'page': page, 'status': 'new'})
+            continue
+        change = result['median_ms'] - before['median_ms']
+        ratio = result['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        regressed = ratio > 1 + tolerance and change >= MIN_REGRESSION_MS
+        row = {
+            'page': page,
+            'baseline_ms': before['median_ms'],
+            'median_ms': result['median_ms'],
+            'change_ms': round(change, 2),
+            'ratio': round(ratio, 3),
+            'status': 'regression' if regressed else 'ok'
+        }
+        rows.append(row)
+        if regressed:
+            regressions.append(page)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='1k', help=f"records per collection: {', '.join(SCALES)} or a number")
+    for name in COLLECTIONS:
+        parser.add_argument(f'--{name}', type=int, help=f"override the number of {name}")
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+    parser.add_argument('--runs', type=int, default=5, help="renders per page (the first is cold)")
+    parser.add_argument('--timeout', type=float, default=300, help="AppTest timeout per render, seconds")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    parser.add_argument('--baseline', help="compare against this results JSON")
+    parser.add_argument('--save-baseline', help="also write results to this path as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    
+    scale = SCALES.get(args.scale) or int(args.scale)
+    counts = scale_counts(scale, **{name: getattr(args, name) for name in COLLECTIONS})
+    
+    start = time.perf_counter()
+    seed_data_store(counts, args.seed)
+    seed_seconds = time.perf_counter() - start
+    print(f"Seeded {counts} in {seed_seconds:.1f}s", file=sys.stderr)
+    
+    results = {
+        'scale': args.scale,
+        'counts': store_counts(),
+        'seed_seconds': round(seed_seconds, 2),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'pages': {}
+    }
+    for func_name in args.pages:
+        result = time_page(PAGES[func_name], func_name, max(args.runs, 1), args.timeout)
+        results['pages'][func_name] = result
+        print(f"{func_name:<20} cold {result['cold_ms']:>9.1f} ms  median {result['median_ms']:>9.1f} ms  "
+              f"p95 {result['p95_ms']:>9.1f} ms" + (f"  ERROR {result['error']}" if result['error'] else ""),
+              file=sys.stderr)
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        results['comparison'], regressions = compare(results, baseline, args.tolerance)
+        results['baseline'] = args.baseline
+        for row in results['comparison']:
+            if row['status'] not in ('new', 'error'):
+                print(f"{row['page']:<20} {row['baseline_ms']:>9.1f} -> {row['median_ms']:>9.1f} ms  "
+                      f"x{row['ratio']:.2f}  {row['status']}", file=sys.stderr)
+    
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as fh:
+            fh.write(text + '\n')
+    
+    failures = [page for page, result in results['pages'].items() if result['error']]
+    if failures:
+        print(f"Failed: {', '.join(failures)}", file=sys.stderr)
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+    if failures or regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""Synthetic campus data for benchmarks.
+
+Fills DATA_STORE with users, clubs, events, listings, confessions and chat
+messages at a chosen scale. Ids are deterministic for a given seed so runs are
+comparable. The first user is an admin the benchmarks run as; they are a
+member of some clubs, RSVP'd to some events and a participant in some chats.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DATA_STORE, save_data, VIEW_CACHE
+from models import now_timestamp
+
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+COLLECTIONS = ('users', 'clubs', 'events', 'listings', 'confessions', 'messages')
+
+DAY = 24 * 3600
+
+YEARS = ["Freshman", "Sophomore", "Junior", "Senior", "Graduate"]
+BRANCHES = ["Computer Science", "Electrical Engineering", "Mechanical Engineering", "Business", "Arts", "Physics"]
+INTERESTS = ["Programming", "AI/ML", "Web Development", "Data Science", "Engineering", "Business",
+             "Arts", "Sports", "Music", "Dance", "Photography", "Writing", "Research", "Gaming"]
+CLUB_TAGS = ["Programming", "Technology", "Arts", "Sports", "Music", "Debate", "Academic", "Social", "Cultural", "Gaming"]
+EVENT_TAGS = ["Social", "Academic", "Workshop", "Sports", "Cultural", "Networking"]
+LISTING_CATEGORIES = ["Books", "Electronics", "Furniture", "Clothing", "Other"]
+CONFESSION_CATEGORIES = ["General", "Love & Relationships", "Academic", "Social", "Funny", "Advice"]
+SCHEDULES = ["Wednesdays 6-8 PM", "Every Friday 5 PM", "Tuesdays and Thursdays 7-9 PM", "Biweekly Saturdays 10am-12pm"]
+
+BENCH_ADMIN = {
+    'id': 'bench_admin',
+    'email': 'bench.admin@university.edu',
+    'name': 'Bench Admin',
+    'role': 'admin',
+    'year': 'Graduate',
+    'branch': 'Computer Science',
+    'interests': ['AI/ML', 'Programming', 'Music']
+}
+
+# Members, RSVPs and messages per record
+CLUB_MEMBERS = 30
+EVENT_RSVPS = 20
+MESSAGES_PER_CHAT = 50
+
+def scale_counts(scale, **overrides):
+    """Record count per collection: the scale for each, unless overridden"""
+    counts = {name: scale for name in COLLECTIONS}
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    return counts
+
+def seed_data_store(counts, seed=42):
+    """Replace DATA_STORE contents with synthetic data; returns the user ids"""
+    rng = random.Random(seed)
+    now = now_timestamp()
+    
+    user_ids = [BENCH_ADMIN['id']] + [f"user_{i:06d}" for i in range(1, max(counts['users'], 2))]
+    users = {
+        user_id: {
+            'id': user_id,
+            'email': f"{user_id}@university.edu",
+            'name': f"Student {i}",
+            'year': rng.choice(YEARS),
+            'branch': rng.choice(BRANCHES),
+            'interests': rng.sample(INTERESTS, 3),
+            'password': 'x' * 60,
+            'is_verified': True,
+            'joined_date': now - rng.randrange(365 * DAY),
+            'role': 'student'
+        }
+        for i, user_id in enumerate(user_ids)
+    }
+    users[BENCH_ADMIN['id']].update(BENCH_ADMIN)
+    
+    def some_users(k, include_admin=False):
+        picked = [user_ids[i] for i in rng.sample(range(len(user_ids)), min(k, len(user_ids)))]
+        if include_admin and BENCH_ADMIN['id'] not in picked:
+            picked[0] = BENCH_ADMIN['id']
+        return picked
+    
+    clubs = {}
+    for i in range(counts['clubs']):
+        members = some_users(CLUB_MEMBERS, include_admin=i < 10)
+        clubs[f"club_{i:06d}"] = {
+            'id': f"club_{i:06d}",
+            'name': f"Club {i}",
+            'description': "A synthetic club for benchmarking. " * 3,
+            'members': members,
+            'admins': members[:1],
+            'tags': rng.sample(CLUB_TAGS, 2),
+            'meeting_schedule': rng.choice(SCHEDULES),
+            'location': f"Room {rng.randrange(100, 500)}",
+            'max_members': 100,
+            'created_at': now - rng.randrange(365 * DAY),
+            'created_by': members[0]
+        }
+    
+    events = {}
+    club_ids = list(clubs) or ['personal']
+    for i in range(counts['events']):
+        start = now + rng.randrange(-30 * DAY, 60 * DAY)
+        rsvps = some_users(EVENT_RSVPS, include_admin=i < 10)
+        events[f"event_{i:06d}"] = {
+            'id': f"event_{i:06d}",
+            'title': f"Event {i}",
+            'description': "A synthetic event for benchmarking. " * 3,
+            'date': start,
+            'end_date': start + 2 * 3600,
+            'location': "Main Hall",
+            'max_attendees': 50,
+            'club_id': rng.choice(club_ids),
+            'created_by': rsvps[0],
+            'rsvps': rsvps,
+            'tags': rng.sample(EVENT_TAGS, 2),
+            'created_at': start - 14 * DAY
+        }
+    
+    marketplace = {}
+    for i in range(counts['listings']):
+        seller = rng.choice(user_ids)
+        sold = rng.random() < 0.3
+        created = now - rng.randrange(60 * DAY)
+        marketplace[f"listing_{i:06d}"] = {
+            'id': f"listing_{i:06d}",
+            'title': f"Item {i}",
+            'description': "Gently used, pick up on campus.",
+            'price': round(rng.uniform(1, 500), 2),
+            'category': rng.choice(LISTING_CATEGORIES),
+            'condition': "Good",
+            'contact_method': "Chat",
+            'location': "Library",
+            'seller_id': seller,
+            'seller_name': users[seller]['name'],
+            'status': 'sold' if sold else 'available',
+            'created_at': created,
+            'sold_at': created + DAY if sold else None,
+            'views': rng.randrange(200)
+        }
+    
+    confessions = {}
+    for i in range(counts['confessions']):
+        status = rng.choices(['approved', 'pending', 'rejected'], weights=[8, 1, 1])[0]
+        created = now - rng.randrange(90 * DAY)
+        confessions[f"confession_{i:06d}"] = {
+            'id': f"confession_{i:06d}",
+            'content': f"Synthetic confession number {i}. " * 2,
+            'category': rng.choice(CONFESSION_CATEGORIES),
+            'status': status,
+            'upvotes': rng.randrange(100),
+            'downvotes': rng.randrange(20),
+            'comments': [
+                {'id': f"comment_{i}_{j}", 'content': "Same here", 'timestamp': created + (j + 1) * 3600}
+                for j in range(rng.randrange(4))
+            ],
+            'created_at': created,
+            'approved_at': created + 3600 if status == 'approved' else None,
+            'approved_by': BENCH_ADMIN['id'] if status == 'approved' else None
+        }
+    
+    chats = {}
+    remaining = counts['messages']
+    chat_index = 0
+    while remaining > 0:
+        participants = some_users(2, include_admin=chat_index < 20)
+        size = min(MESSAGES_PER_CHAT, remaining)
+        started = now - rng.randrange(30 * DAY)
+        chats[f"chat_{chat_index:06d}"] = {
+            'id': f"chat_{chat_index:06d}",
+            'participants': participants,
+            'type': 'direct',
+            'created_at': started,
+            'last_activity': started + size * 60,
+            'messages': [
+                {'id': f"m{chat_index}_{j}", 'sender': participants[j % 2], 'content': f"Message {j}",
+                 'timestamp': started + (j + 1) * 60, 'read': True}
+                for j in range(size)
+            ]
+        }
+        remaining -= size
+        chat_index += 1
+    
+    for data_type, data in (
+        ('users', users), ('clubs', clubs), ('events', events), ('marketplace', marketplace),
+        ('confessions', confessions), ('chats', chats), ('archived_chats', {}),
+        ('announcements', []), ('reports', []), ('admin_logs', [])
+    ):
+        save_data(data_type, data)
+    VIEW_CACHE.clear()
+    
+    return user_ids
+
+def store_counts():
+    """Records per collection currently in DATA_STORE (messages counted across chats)"""
+    counts = {name: len(data) for name, data in DATA_STORE.items()}
+    counts['messages'] = sum(len(chat['messages']) for chat in DATA_STORE['chats'].values())
+    return counts
\ No newline at end of file
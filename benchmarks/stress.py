@@ -0,0 +1,361 @@
+"""Concurrent-session stress test for the write paths.
+
+Starts N threads, one simulated user each, that hammer a few hot records
+through the same database calls the pages make:
+
+- clubs.join_club / leave_club      -> add_member / remove_member
+- events.rsvp_to_event / cancel     -> add_member_or_wait / remove_member_and_promote
+- confessions.vote_confession       -> VOTES.cast (with a flusher thread running)
+- chat.send_message                 -> append_chat_message (with the archive job running)
+
+Each session pauses a random think time between operations so the threads
+interleave instead of running one after another, and the dormant-chat
+archive job runs throughout with every chat counting as dormant, so sends
+race with archiving and exercise the restore path.
+
+It reports throughput and latency percentiles per operation, then checks
+invariants: no lost or phantom members, no capacity overshoot, waitlists
+only while full, no lost messages, and vote totals equal to the clicks
+issued. Any violation makes the exit status 1.
+
+Usage:
+    python benchmarks/stress.py --sessions 200 --ops 200
+    python benchmarks/stress.py --sessions 500 --capacity 20 --output stress.json
+    python benchmarks/stress.py --think 0 --archive-interval 0.01
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from seed import scale_counts, seed_data_store
+from database import (
+    load_data, get_record, add_member, remove_member, add_member_or_wait,
+    remove_member_and_promote, append_chat_message
+)
+import maintenance
+from models import Message, now_timestamp
+from votes import VOTES, UPVOTE, DOWNVOTE
+
+# Relative frequency of each operation
+OPERATION_WEIGHTS = {
+    'join_club': 3,
+    'leave_club': 1,
+    'rsvp': 3,
+    'cancel_rsvp': 1,
+    'vote': 4,
+    'send_message': 4
+}
+
+# How often the flusher folds buffered votes into the store during the run
+FLUSH_INTERVAL = 0.05
+
+# How often the archive job sweeps chats during the run
+ARCHIVE_INTERVAL = 0.02
+
+# Upper bound of the random pause between a session's operations
+THINK_SECONDS = 0.002
+
+def percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+    return {
+        'p50_ms': round(pick(0.50) * 1000, 3),
+        'p95_ms': round(pick(0.95) * 1000, 3),
+        'p99_ms': round(pick(0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'mean_ms': round(statistics.mean(values) * 1000, 3)
+    }
+
+class Session(threading.Thread):
+    """One simulated user issuing random operations against the hot records"""
+    
+    def __init__(self, user_id, targets, ops, barrier, seed, think=THINK_SECONDS):
+        super().__init__(daemon=True)
+        self.user_id = user_id
+        self.targets = targets
+        self.ops = ops
+        self.think = think
+        self.barrier = barrier
+        self.rng = random.Random(seed)
+        self.latencies = {name: [] for name in OPERATION_WEIGHTS}
+        # Net effect of this session, reconciled against the store afterwards
+        self.clubs = Counter()
+        self.rsvps = Counter()
+        self.waiting = Counter()
+        self.votes = {}
+        self.messages = Counter()
+        self.errors = []
+    
+    def run(self):
+        names = list(OPERATION_WEIGHTS)
+        weights = list(OPERATION_WEIGHTS.values())
+        self.barrier.wait()
+        for _ in range(self.ops):
+            name = self.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                getattr(self, name)()
+            except Exception as e:
+                self.errors.append(f"{name}: {type(e).__name__}: {e}")
+            self.latencies[name].append(time.perf_counter() - start)
+            # Even a zero sleep yields, so other sessions get between our operations
+            time.sleep(self.rng.uniform(0, self.think))
+    
+    def join_club(self):
+        club_id = self.rng.choice(self.targets['clubs'])
+        club = get_record('clubs', club_id)
+        if add_member('clubs', club_id, self.user_id, limit=club.get('max_members', 50)) == 'added':
+            self.clubs[club_id] += 1
+    
+    def leave_club(self):
+        club_id = self.rng.choice(self.targets['clubs'])
+        if remove_member('clubs', club_id, self.user_id, fields=('members', 'admins')) == 'removed':
+            self.clubs[club_id] -= 1
+    
+    def rsvp(self):
+        event_id = self.rng.choice(self.targets['events'])
+        event = get_record('events', event_id)
+        result = add_member_or_wait('events', event_id, self.user_id, 'rsvps', 'waitlist',
+                                    limit=event.get('max_attendees', 50))
+        if result == 'added':
+            self.rsvps[event_id] += 1
+        elif result == 'waitlisted':
+            self.waiting[event_id] += 1
+    
+    def cancel_rsvp(self):
+        event_id = self.rng.choice(self.targets['events'])
+        event = get_record('events', event_id)
+        result, promoted = remove_member_and_promote('events', event_id, self.user_id, 'rsvps', 'waitlist',
+                                                     limit=event.get('max_attendees', 50))
+        if result == 'removed':
+            self.rsvps[event_id] -= 1
+        elif result == 'left_queue':
+            self.waiting[event_id] -= 1
+        # Promotions are credited to the promoted user's side of the ledger
+        for user_id in promoted:
+            self.targets['promotions'].append((event_id, user_id))
+    
+    def vote(self):
+        confession_id = self.rng.choice(self.targets['confessions'])
+        direction = UPVOTE if self.rng.random() < 0.7 else DOWNVOTE
+        self.votes[confession_id] = VOTES.cast(confession_id, self.user_id, direction)
+    
+    def send_message(self):
+        chat_id = self.rng.choice(self.targets['chats'])
+        message = Message(
+            id=str(uuid.uuid4()),
+            sender=self.user_id,
+            content="stress",
+            timestamp=now_timestamp()
+        )
+        # Counted even if the chat went missing, so a dropped send shows up as lost
+        append_chat_message(chat_id, message)
+        self.messages[chat_id] += 1
+
+def prepare_targets(user_ids, args):
+    """Empty the hot records and cap their capacity so sessions contend for seats"""
+    targets = {
+        'clubs': [f"club_{i:06d}" for i in range(args.hot)],
+        'events': [f"event_{i:06d}" for i in range(args.hot)],
+        'confessions': [f"confession_{i:06d}" for i in range(args.hot)],
+        'chats': [f"chat_{i:06d}" for i in range(args.hot)],
+        'promotions': []
+    }
+    for club_id in targets['clubs']:
+        club = get_record('clubs', club_id)
+        club['members'] = []
+        club['admins'] = []
+        club['max_members'] = args.capacity
+    for event_id in targets['events']:
+        event = get_record('events', event_id)
+        event['rsvps'] = []
+        event['waitlist'] = []
+        event['max_attendees'] = args.capacity
+    baseline = {
+        'votes': {cid: (get_record('confessions', cid)['upvotes'], get_record('confessions', cid)['downvotes'])
+                  for cid in targets['confessions']},
+        'messages': {chat_id: len(get_record('chats', chat_id)['messages']) for chat_id in targets['chats']}
+    }
+    return targets, baseline
+
+def chat_messages(chat_id):
+    """Messages of a chat, wherever the archive job left it"""
+    chat = load_data('chats').get(chat_id) or load_data('archived_chats').get(chat_id)
+    return chat['messages'] if chat else []
+
+def check_invariants(sessions, targets, baseline):
+    """List of invariant violations (empty when everything holds)"""
+    violations = []
+    
+    clubs = Counter()
+    rsvps = Counter()
+    waiting = Counter()
+    for session in sessions:
+        for club_id, net in session.clubs.items():
+            clubs[(club_id, session.user_id)] += net
+        for event_id, net in session.rsvps.items():
+            rsvps[(event_id, session.user_id)] += net
+        for event_id, net in session.waiting.items():
+            waiting[(event_id, session.user_id)] += net
+    for event_id, user_id in targets['promotions']:
+        rsvps[(event_id, user_id)] += 1
+        waiting[(event_id, user_id)] -= 1
+    
+    for club_id in targets['clubs']:
+        club = get_record('clubs', club_id)
+        members = set(club['members'])
+        if len(members) > club['max_members']:
+            violations.append(f"{club_id}: {len(members)} members over capacity {club['max_members']}")
+        expected = {user_id for (cid, user_id), net in clubs.items() if cid == club_id and net == 1}
+        if members != expected:
+            violations.append(f"{club_id}: {len(expected - members)} lost, {len(members - expected)} phantom members")
+    
+    for event_id in targets['events']:
+        event = get_record('events', event_id)
+        going = set(event['rsvps'])
+        queue = list(event['waitlist'])
+        if len(going) > event['max_attendees']:
+            violations.append(f"{event_id}: {len(going)} RSVPs over capacity {event['max_attendees']}")
+        if queue and len(going) < event['max_attendees']:
+            violations.append(f"{event_id}: {len(queue)} waiting with {event['max_attendees'] - len(going)} free seats")
+        if going & set(queue):
+            violations.append(f"{event_id}: users both going and waitlisted")
+        expected = {user_id for (eid, user_id), net in rsvps.items() if eid == event_id and net == 1}
+        expected_queue = {user_id for (eid, user_id), net in waiting.items() if eid == event_id and net == 1}
+        if going != expected:
+            violations.append(f"{event_id}: {len(expected - going)} lost, {len(going - expected)} phantom RSVPs")
+        if set(queue) != expected_queue:
+            violations.append(f"{event_id}: waitlist does not match issued joins/leaves")
+    
+    VOTES.flush()
+    for confession_id in targets['confessions']:
+        confession = get_record('confessions', confession_id)
+        base_up, base_down = baseline['votes'][confession_id]
+        finals = [session.votes[confession_id] for session in sessions if confession_id in session.votes]
+        expected = (base_up + finals.count(UPVOTE), base_down + finals.count(DOWNVOTE))
+        actual = (confession['upvotes'], confession['downvotes'])
+        if actual != expected:
+            violations.append(f"{confession_id}: votes {actual} != clicks {expected}")
+    if VOTES.pending():
+        violations.append(f"{VOTES.pending()} confessions still have unflushed votes")
+    
+    for chat_id in targets['chats']:
+        messages = chat_messages(chat_id)
+        sent = sum(session.messages[chat_id] for session in sessions)
+        if len(messages) - baseline['messages'][chat_id] != sent:
+            violations.append(f"{chat_id}: {sent} sent, {len(messages) - baseline['messages'][chat_id]} stored")
+        if len({message['id'] for message in messages}) != len(messages):
+            violations.append(f"{chat_id}: duplicate message ids")
+    
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=200, help="concurrent simulated users")
+    parser.add_argument('--ops', type=int, default=200, help="operations per session")
+    parser.add_argument('--hot', type=int, default=5, help="hot clubs/events/confessions/chats contended for")
+    parser.add_argument('--capacity', type=int, default=50, help="seats per hot club and event")
+    parser.add_argument('--think', type=float, default=THINK_SECONDS,
+                        help="max seconds a session pauses between operations")
+    parser.add_argument('--archive-interval', type=float, default=ARCHIVE_INTERVAL,
+                        help="seconds between archive job sweeps")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write results JSON here")
+    args = parser.parse_args()
+    
+    counts = scale_counts(max(args.sessions + 1, args.hot * 50 + 1))
+    user_ids = seed_data_store(counts, args.seed)
+    targets, baseline = prepare_targets(user_ids, args)
+    
+    barrier = threading.Barrier(args.sessions + 1)
+    sessions = [
+        Session(user_ids[i + 1], targets, args.ops, barrier, args.seed + i, args.think)
+        for i in range(args.sessions)
+    ]
+    for session in sessions:
+        session.start()
+    
+    # Background flushes race with casts, as the scheduler's job does in production
+    done = threading.Event()
+    def flusher():
+        while not done.wait(FLUSH_INTERVAL):
+            VOTES.flush()
+    flush_thread = threading.Thread(target=flusher, daemon=True)
+    flush_thread.start()
+    
+    # Every chat counts as dormant, so the archive job races with every send
+    maintenance.DORMANT_CHAT_DAYS = -1
+    archived = []
+    def archiver():
+        while not done.wait(args.archive_interval):
+            archived.append(maintenance.archive_dormant_chats())
+    archive_thread = threading.Thread(target=archiver, daemon=True)
+    archive_thread.start()
+    
+    barrier.wait()
+    start = time.perf_counter()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    flush_thread.join()
+    archive_thread.join()
+    
+    latencies = {name: [] for name in OPERATION_WEIGHTS}
+    errors = []
+    for session in sessions:
+        for name, values in session.latencies.items():
+            latencies[name].extend(values)
+        errors.extend(session.errors)
+    total_ops = sum(len(values) for values in latencies.values())
+    
+    violations = check_invariants(sessions, targets, baseline)
+    results = {
+        'sessions': args.sessions,
+        'ops_per_session': args.ops,
+        'hot_records': args.hot,
+        'capacity': args.capacity,
+        'think_seconds': args.think,
+        'chats_archived': sum(archived),
+        'seconds': round(elapsed, 3),
+        'throughput_ops_per_sec': round(total_ops / elapsed, 1) if elapsed else None,
+        'operations': {
+            name: {'count': len(values), **percentiles(values)}
+            for name, values in latencies.items()
+        },
+        'errors': errors[:20],
+        'violations': violations
+    }
+    
+    print(f"{args.sessions} sessions x {args.ops} ops: {total_ops} ops in {elapsed:.2f}s "
+          f"({results['throughput_ops_per_sec']} ops/s), {results['chats_archived']} chats archived mid-run")
+    for name, stats in results['operations'].items():
+        if stats['count']:
+            print(f"  {name:<13} {stats['count']:>7}  p50 {stats['p50_ms']:>8.3f} ms  p95 {stats['p95_ms']:>8.3f} ms  "
+                  f"p99 {stats['p99_ms']:>8.3f} ms  max {stats['max_ms']:>8.3f} ms")
+    for error in results['errors']:
+        print(f"  ERROR {error}")
+    print("Invariants: " + ("OK" if not violations else f"{len(violations)} violated"))
+    for violation in violations:
+        print(f"  ✗ {violation}")
+    
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(json.dumps(results, indent=2) + '\n')
+    
+    if violations or errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
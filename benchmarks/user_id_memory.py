@@ -0,0 +1,63 @@
+"""Memory benchmark for interned user ids.
+
+Builds campus-scale club memberships three ways and reports the memory each
+layout takes:
+
+- lists of uuid strings, as loaded from JSON (one string object per entry)
+- sets of uuid strings
+- IdSets of interned integers (the layout the models use)
+
+Usage:
+    python benchmarks/user_id_memory.py --users 20000 --clubs 500 --members 200
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import IdSet, USER_IDS
+
+def measure(build):
+    """Bytes allocated by build() and still alive afterwards"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--clubs', type=int, default=500)
+    parser.add_argument('--members', type=int, default=200, help="members per club")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    user_ids = [str(uuid.uuid4()) for _ in range(args.users)]
+    memberships = [random.sample(user_ids, min(args.members, args.users)) for _ in range(args.clubs)]
+    
+    # JSON-loaded data holds a separate string object per occurrence
+    _, list_bytes = measure(lambda: [[''.join(m) for m in members] for members in memberships])
+    _, set_bytes = measure(lambda: [{''.join(m) for m in members} for members in memberships])
+    
+    _, table_bytes = measure(lambda: [USER_IDS.intern(user_id) for user_id in user_ids])
+    id_sets, id_set_bytes = measure(lambda: [IdSet(members) for members in memberships])
+    
+    total_entries = args.clubs * min(args.members, args.users)
+    print(f"{args.clubs} clubs x {args.members} members ({total_entries} entries), {args.users} users")
+    print(f"{'list of uuid strings':<28}{list_bytes / 1e6:>10.2f} MB")
+    print(f"{'set of uuid strings':<28}{set_bytes / 1e6:>10.2f} MB")
+    print(f"{'IdSet (interned ints)':<28}{id_set_bytes / 1e6:>10.2f} MB")
+    print(f"{'  + intern table (once)':<28}{table_bytes / 1e6:>10.2f} MB")
+    print(f"{'reduction vs sets':<28}{set_bytes / max(id_set_bytes + table_bytes, 1):>10.1f}x")
+    
+    assert all(len(s) == len(m) for s, m in zip(id_sets, memberships))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,7 +1,12 @@
 import streamlit as st
 import uuid
-from datetime import datetime
-from database import load_data, save_data, get_user_by_id
+from database import load_data, save_data, get_user_by_id, get_record, rerun_fragment, cached_view, add_member, remove_member
+from datetime import date
+from models import now_timestamp
+from recurrence import WEEKDAY_NAMES, make_rule, describe
+from recommendations import recommend_clubs
+from schedule import add_commitment, remove_commitment
+from profiling import track_fragment
 
 def clubs_page():
     """Clubs and communities page"""
@@ -21,6 +26,8 @@ def clubs_page():
     with col2:
         filter_tag = st.selectbox("Filter by tag", ["All"] + get_all_club_tags())
     
+    display_recommended_clubs()
+    
     # Display clubs
     display_clubs_grid(search_query, filter_tag)
 
@@ -31,7 +38,9 @@ def create_club_form():
         
         with col1:
             name = st.text_input("Club Name")
-            meeting_schedule = st.text_input("Meeting Schedule", placeholder="e.g., Wednesdays 6-8 PM")
+            meeting_days = st.multiselect("Meeting Days", WEEKDAY_NAMES)
+            start_time = st.time_input("Meeting Starts", value=None)
+            end_time = st.time_input("Meeting Ends", value=None)
             location = st.text_input("Meeting Location")
         
         with col2:
@@ -40,6 +49,9 @@ def create_club_form():
                 "Debate", "Academic", "Social", "Cultural", "Gaming"
             ])
             max_members = st.number_input("Max Members", min_value=5, max_value=500, value=50)
+            every_weeks = st.number_input("Meets every N weeks", min_value=1, max_value=8, value=1)
+            meetings_until = st.date_input("Meetings end on", value=None, min_value=date.today())
+            meeting_schedule = st.text_input("Or describe the schedule", placeholder="e.g., Wednesdays 6-8 PM")
         
         description = st.text_area("Club Description", height=100, 
                                  placeholder="Describe your club's purpose, activities, and who should join...")
@@ -49,6 +61,17 @@ def create_club_form():
                 clubs = load_data('clubs')
                 club_id = f"club_{str(uuid.uuid4())[:8]}"
                 
+                # Structured meeting inputs win over the free-text schedule
+                recurrence = None
+                if meeting_days and start_time:
+                    start = start_time.hour * 60 + start_time.minute
+                    end = end_time.hour * 60 + end_time.minute if end_time else start + 60
+                    recurrence = make_rule('weekly', start, end,
+                                           weekdays=[WEEKDAY_NAMES.index(day) for day in meeting_days],
+                                           interval=every_weeks, starts_on=date.today().isoformat(),
+                                           until=meetings_until.isoformat() if meetings_until else None)
+                    meeting_schedule = describe(recurrence)
+                
                 new_club = {
                     'id': club_id,
                     'name': name,
@@ -57,19 +80,22 @@ def create_club_form():
                     'admins': [st.session_state.user['id']],
                     'tags': tags,
                     'meeting_schedule': meeting_schedule,
+                    'recurrence': recurrence,
                     'location': location,
                     'max_members': max_members,
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': now_timestamp(),
                     'created_by': st.session_state.user['id']
                 }
                 
                 clubs[club_id] = new_club
                 save_data('clubs', clubs)
+                add_commitment(st.session_state.user['id'], 'club', clubs[club_id])
                 st.success(f"🎉 Club '{name}' created successfully!")
                 st.rerun()
             else:
                 st.error("Please fill in club name and description")
 
+@cached_view('club_tags', 'clubs')
 def get_all_club_tags():
     """Get all unique tags from clubs"""
     clubs = load_data('clubs')
@@ -78,6 +104,25 @@ def get_all_club_tags():
         all_tags.update(club.get('tags', []))
     return sorted(list(all_tags))
 
+def display_recommended_clubs():
+    """Clubs matching the user's interests"""
+    picks = recommend_clubs(st.session_state.user['id'])
+    if not picks:
+        return
+    
+    st.subheader("✨ Recommended for you")
+    cols = st.columns(len(picks))
+    
+    for col, (club_id, _, matched) in zip(cols, picks):
+        club = get_record('clubs', club_id)
+        with col:
+            st.write(f"**{club['name']}**")
+            st.caption(f"Matches: {', '.join(matched)}")
+            if st.button("➕ Join Club", key=f"rec_join_{club_id}"):
+                join_club(club_id)
+    
+    st.divider()
+
 def display_clubs_grid(search_query, filter_tag):
     """Display clubs in a grid layout"""
     clubs = load_data('clubs')
@@ -101,7 +146,7 @@ def display_clubs_grid(search_query, filter_tag):
         # Tag filter
         if filter_tag != "All" and filter_tag not in club.get('tags', []):
             continue
-            
+        
         filtered_clubs[club_id] = club
     
     if not filtered_clubs:
@@ -118,10 +163,19 @@ def display_clubs_grid(search_query, filter_tag):
             if i + j < len(clubs_list):
                 club = clubs_list[i + j]
                 with cols[j]:
-                    display_club_card(club)
+                    display_club_card(club['id'])
 
-def display_club_card(club):
-    """Display a single club card"""
+@st.fragment
+@track_fragment("Clubs › card")
+def display_club_card(club_id):
+    """Display a single club card.
+    
+    Runs as a fragment: joining or leaving re-renders this card only.
+    """
+    club = get_record('clubs', club_id)
+    if not club:
+        return
+    
     with st.container():
         st.subheader(club['name'])
         
@@ -156,42 +210,28 @@ def display_club_card(club):
 
 def join_club(club_id):
     """Join a club"""
-    clubs = load_data('clubs')
+    club = get_record('clubs', club_id)
     
-    if club_id in clubs:
-        club = clubs[club_id]
+    if club:
         user_id = st.session_state.user['id']
+        result = add_member('clubs', club_id, user_id, limit=club.get('max_members', 50))
         
-        if user_id not in club.get('members', []):
-            current_members = len(club.get('members', []))
-            max_members = club.get('max_members', 50)
-            
-            if current_members >= max_members:
-                st.error("❌ Club is full!")
-                return
-                
-            club['members'] = club.get('members', []) + [user_id]
-            clubs[club_id] = club
-            save_data('clubs', clubs)
+        if result == 'full':
+            st.error("❌ Club is full!")
+        elif result == 'added':
+            add_commitment(user_id, 'club', club)
             st.success(f"🎉 Joined {club['name']}!")
-            st.rerun()
+            rerun_fragment()
 
 def leave_club(club_id):
     """Leave a club"""
-    clubs = load_data('clubs')
+    club = get_record('clubs', club_id)
     
-    if club_id in clubs:
-        club = clubs[club_id]
+    if club:
         user_id = st.session_state.user['id']
         
-        if user_id in club.get('members', []):
-            club['members'] = [m for m in club.get('members', []) if m != user_id]
-            
-            # Remove from admins if they were one
-            if user_id in club.get('admins', []):
-                club['admins'] = [a for a in club.get('admins', []) if a != user_id]
-            
-            clubs[club_id] = club
-            save_data('clubs', clubs)
+        # Also removes them from admins if they were one
+        if remove_member('clubs', club_id, user_id, fields=('members', 'admins')) == 'removed':
+            remove_commitment(user_id, 'club', club_id)
             st.success(f"👋 Left {club['name']}")
-            st.rerun()
\ No newline at end of file
+            rerun_fragment()
\ No newline at end of file
@@ -1,7 +1,13 @@
 import streamlit as st
-import json
-import pandas as pd
+import sys
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from models import Record, USER_IDS, to_record, migrate_collection, now_timestamp
+from recurrence import next_occurrence, series_ended
+from storage_metrics import STORAGE_METRICS, approximate_bytes
 
 # In-memory storage for MVP
 DATA_STORE = {
@@ -11,20 +17,321 @@ DATA_STORE = {
     'marketplace': {},
     'confessions': {},
     'chats': {},
+    'archived_chats': {},
     'announcements': [],
     'reports': [],
     'admin_logs': []
 }
 
+# Collection versions, bumped on every write so derived views can be invalidated
+COLLECTION_VERSIONS = {data_type: 0 for data_type in DATA_STORE}
+_version_lock = threading.Lock()
+
+# Per-thread load_data/save_data call counts, read by the render profiler
+_call_counts = threading.local()
+
+def storage_call_counts():
+    """(load_data, save_data) calls made so far on the current thread"""
+    return getattr(_call_counts, 'loads', 0), getattr(_call_counts, 'saves', 0)
+
 def load_data(data_type):
     """Load data from storage"""
-    return DATA_STORE.get(data_type, {})
+    _call_counts.loads = getattr(_call_counts, 'loads', 0) + 1
+    start = time.perf_counter()
+    data = DATA_STORE.get(data_type, {})
+    STORAGE_METRICS.observe('load', data_type, time.perf_counter() - start, len(data))
+    return data
 
 def save_data(data_type, data):
-    """Save data to storage"""
+    """Save data to storage, converting new dict records to models"""
+    _call_counts.saves = getattr(_call_counts, 'saves', 0) + 1
+    start = time.perf_counter()
+    # Records already stored are not rewritten; only new dict records count as written bytes
+    written = sys.getsizeof(data)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if not isinstance(value, Record):
+                data[key] = to_record(data_type, value)
+                written += approximate_bytes(data[key])
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            if not isinstance(value, Record):
+                data[i] = to_record(data_type, value)
+                written += approximate_bytes(data[i])
     DATA_STORE[data_type] = data
+    bump_collection_version(data_type)
+    STORAGE_METRICS.observe('save', data_type, time.perf_counter() - start, len(data), written)
     return True
 
+def get_record(data_type, record_id):
+    """Get a single record from a collection"""
+    return DATA_STORE.get(data_type, {}).get(record_id)
+
+def save_record(data_type, record_id, record):
+    """Save a single record without rewriting the whole collection"""
+    start = time.perf_counter()
+    record = to_record(data_type, record)
+    DATA_STORE.setdefault(data_type, {})[record_id] = record
+    bump_collection_version(data_type)
+    STORAGE_METRICS.observe('save_record', data_type, time.perf_counter() - start, 1, approximate_bytes(record))
+    return True
+
+def rerun_fragment():
+    """Rerun only the current fragment, or the whole page outside a fragment run"""
+    try:
+        st.rerun(scope="fragment")
+    except st.errors.StreamlitAPIException:
+        st.rerun()
+
+# Serializes read-modify-write updates to individual records
+_record_lock = threading.RLock()
+
+def add_member(data_type, record_id, value, field='members', limit=None):
+    """Atomically add a value to a record's set field without rewriting the collection.
+    
+    Returns 'added', 'exists', 'full' (limit reached) or None if the record
+    does not exist.
+    """
+    with _record_lock:
+        record = get_record(data_type, record_id)
+        if record is None:
+            return None
+        
+        members = record[field]
+        if value in members:
+            return 'exists'
+        if limit is not None and len(members) >= limit:
+            return 'full'
+        
+        members.add(value)
+        bump_collection_version(data_type)
+        return 'added'
+
+def remove_member(data_type, record_id, value, fields=('members',)):
+    """Atomically remove a value from a record's set fields without rewriting the collection.
+    
+    Returns 'removed', 'missing' or None if the record does not exist.
+    """
+    with _record_lock:
+        record = get_record(data_type, record_id)
+        if record is None:
+            return None
+        
+        if value not in record[fields[0]]:
+            return 'missing'
+        
+        for field in fields:
+            record[field].discard(value)
+        bump_collection_version(data_type)
+        return 'removed'
+
+def add_member_or_wait(data_type, record_id, value, field, queue, limit=None):
+    """Atomically add a value to a set field, or to the record's queue when full.
+    
+    Returns 'added', 'exists', 'waitlisted', 'queued' (already waiting) or
+    None if the record does not exist.
+    """
+    with _record_lock:
+        record = get_record(data_type, record_id)
+        if record is None:
+            return None
+        
+        members = record[field]
+        waiting = record[queue]
+        if value in members:
+            return 'exists'
+        if value in waiting:
+            return 'queued'
+        
+        # Seats go to the queue first so newcomers cannot jump it
+        if (limit is None or len(members) < limit) and not len(waiting):
+            members.add(value)
+            result = 'added'
+        else:
+            waiting.append(value)
+            result = 'waitlisted'
+        bump_collection_version(data_type)
+        return result
+
+def remove_member_and_promote(data_type, record_id, value, field, queue, limit=None):
+    """Atomically remove a value from a set field or queue, promoting waiters.
+    
+    Freed seats are filled from the head of the queue inside the same lock, so
+    there is no window in which another session can take them. Returns
+    (result, promoted) where result is 'removed', 'left_queue', 'missing' or
+    None, and promoted lists the values moved from the queue.
+    """
+    with _record_lock:
+        record = get_record(data_type, record_id)
+        if record is None:
+            return None, []
+        
+        members = record[field]
+        waiting = record[queue]
+        if value in members:
+            members.discard(value)
+            result = 'removed'
+        elif value in waiting:
+            waiting.discard(value)
+            result = 'left_queue'
+        else:
+            return 'missing', []
+        
+        promoted = []
+        while len(waiting) and (limit is None or len(members) < limit):
+            promoted_value = waiting.popleft()
+            members.add(promoted_value)
+            promoted.append(promoted_value)
+        
+        bump_collection_version(data_type)
+        return result, promoted
+
+def get_collection_version(data_type):
+    """Get the current version of a collection"""
+    return COLLECTION_VERSIONS.get(data_type, 0)
+
+def bump_collection_version(data_type):
+    """Mark a collection as changed"""
+    with _version_lock:
+        COLLECTION_VERSIONS[data_type] = COLLECTION_VERSIONS.get(data_type, 0) + 1
+
+@contextmanager
+def batch_write(*data_types):
+    """Apply several record changes as one transaction.
+    
+    Holds the record lock for the whole block so other writers cannot
+    interleave, and bumps each collection's version once at the end so derived
+    views are invalidated once instead of per record.
+    """
+    with _record_lock:
+        yield
+        for data_type in data_types:
+            bump_collection_version(data_type)
+
+# Derived-view cache shared by all sessions
+VIEW_CACHE_MAX_ENTRIES = 256
+VIEW_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+def estimate_size(obj, _seen=None):
+    """Approximate deep size of a value in bytes"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    elif hasattr(obj, '__slots__'):
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(obj, name):
+                    size += estimate_size(getattr(obj, name), _seen)
+    return size
+
+class ViewCache:
+    """LRU cache of derived views keyed by (view name, params, collection versions)"""
+    
+    def __init__(self, max_entries=VIEW_CACHE_MAX_ENTRIES, max_bytes=VIEW_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._computing = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_or_compute(self, view_name, collections, params, compute):
+        """Return a cached view, computing it at most once per version"""
+        versions = tuple(get_collection_version(c) for c in collections)
+        key = (view_name, params, versions)
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            
+            # Sessions asking for the same view wait for one computation
+            key_lock = self._computing.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+            
+            value = compute()
+            size = estimate_size(value)
+            
+            with self._lock:
+                self._computing.pop(key, None)
+                if size <= self.max_bytes:
+                    self._entries[key] = (value, size)
+                    self.total_bytes += size
+                    self._evict()
+        
+        return value
+    
+    def _evict(self):
+        """Drop least recently used entries until within limits"""
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove all cached views"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        """Cache statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+VIEW_CACHE = ViewCache()
+
+def cached_view(view_name, *collections):
+    """Decorator caching a derived view until one of its collections changes.
+    
+    Positional arguments of the decorated function become part of the cache
+    key. Cached values are shared between sessions and must not be mutated.
+    """
+    def decorator(func):
+        def wrapper(*params):
+            return VIEW_CACHE.get_or_compute(view_name, collections, params, lambda: func(*params))
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+def current_minute():
+    """Time bucket for views that depend on the current time"""
+    return now_timestamp() // 60 * 60
+
+def migrate_data_store():
+    """Convert dict records with ISO-8601 timestamps to models in place"""
+    for data_type, data in DATA_STORE.items():
+        DATA_STORE[data_type] = migrate_collection(data_type, data)
+        bump_collection_version(data_type)
+
 def get_user_by_email(email):
     """Get user by email"""
     users = load_data('users')
@@ -33,6 +340,19 @@ def get_user_by_email(email):
             return user_data
     return None
 
+def intern_user_id(user_id):
+    """Dense integer used internally for a user id"""
+    return USER_IDS.intern(user_id)
+
+def lookup_user_id(index):
+    """User id for an interned integer"""
+    return USER_IDS.lookup(index)
+
+def direct_chat_id(user_id, other_user_id):
+    """Chat id for a direct message between two users"""
+    first, second = sorted((intern_user_id(user_id), intern_user_id(other_user_id)))
+    return f"dm_{first}_{second}"
+
 def get_user_by_id(user_id):
     """Get user by ID"""
     users = load_data('users')
@@ -40,9 +360,7 @@ def get_user_by_id(user_id):
 
 def create_user(user_data):
     """Create new user"""
-    users = load_data('users')
-    users[user_data['id']] = user_data
-    return save_data('users', users)
+    return save_record('users', user_data['id'], user_data)
 
 def get_clubs():
     """Get all clubs"""
@@ -64,17 +382,99 @@ def get_chats():
     """Get all chats"""
     return load_data('chats')
 
+def restore_archived_chat(chat_id):
+    """Move a chat back from the archive; returns it, or None if it was not archived"""
+    with batch_write('chats', 'archived_chats'):
+        chat = load_data('archived_chats').pop(chat_id, None)
+        if chat is not None:
+            load_data('chats')[chat_id] = chat
+        return chat
+
+def append_chat_message(chat_id, message):
+    """Append a message to a chat, bringing it back from the archive if needed.
+    
+    Runs under the chats lock so the archive job cannot move the chat
+    mid-update. Returns the chat, or None if it no longer exists.
+    """
+    with batch_write('chats'):
+        chat = get_record('chats', chat_id) or restore_archived_chat(chat_id)
+        if chat:
+            chat['messages'].append(message)
+            chat['last_activity'] = now_timestamp()
+            save_record('chats', chat_id, chat)
+        return chat
+
+@cached_view('upcoming_events', 'events')
+def _upcoming_events(minute):
+    # Recurring events appear once, at their next occurrence
+    events = load_data('events')
+    upcoming_events = []
+    for event in events.values():
+        occurrence = next_occurrence(event, minute)
+        if occurrence is not None:
+            upcoming_events.append((occurrence[0], event))
+    upcoming_events.sort(key=lambda pair: pair[0])
+    return [event for _, event in upcoming_events]
+
+def get_upcoming_events():
+    """Get upcoming events sorted by (next) date"""
+    return _upcoming_events(current_minute())
+
+@cached_view('past_events', 'events')
+def _past_events(minute):
+    events = load_data('events')
+    past_events = [
+        event for event in events.values()
+        if event.get('date') is not None and event['date'] < minute
+        and (series_ended(event, minute) if event.get('recurrence') else True)
+    ]
+    return sorted(past_events, key=lambda x: x['date'], reverse=True)
+
+def get_past_events():
+    """Get past events (and finished series), most recent first"""
+    return _past_events(current_minute())
+
+@cached_view('home_stats', 'clubs', 'events', 'marketplace', 'users')
+def get_home_stats():
+    """Get counts for the home stat tiles"""
+    return {
+        'clubs': len(load_data('clubs')),
+        'events': len(load_data('events')),
+        'marketplace': len(load_data('marketplace')),
+        'users': len(load_data('users'))
+    }
+
 def log_admin_action(user_id, action, target_type=None, target_id=None):
     """Log admin actions for audit trail"""
     logs = load_data('admin_logs')
-    logs.append({
+    logs.append(to_record('admin_logs', {
+        'admin_id': user_id,
+        'action': action,
+        'target_type': target_type,
+        'target_id': target_id,
+        'timestamp': now_timestamp(),
+        'ip_address': '127.0.0.1'  # In production, get real IP
+    }))
+    save_data('admin_logs', logs)
+
+def log_admin_actions(user_id, action, target_type, target_ids):
+    """Log one admin action over many targets with a single write.
+    
+    Call inside the batch_write that makes the changes being logged, so the
+    changes and their audit entries are applied as one transaction.
+    """
+    if not target_ids:
+        return
+    logs = load_data('admin_logs')
+    timestamp = now_timestamp()
+    logs.extend({
         'admin_id': user_id,
         'action': action,
         'target_type': target_type,
         'target_id': target_id,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp,
         'ip_address': '127.0.0.1'  # In production, get real IP
-    })
+    } for target_id in target_ids)
     save_data('admin_logs', logs)
 
 # Initialize sample data
@@ -116,7 +516,8 @@ def initialize_sample_data():
                 'location': 'Arts Center Room 101'
             }
         }
-        DATA_STORE['clubs'] = sample_clubs
+        DATA_STORE['clubs'] = migrate_collection('clubs', sample_clubs)
+        bump_collection_version('clubs')
     
     if not DATA_STORE['announcements']:
         sample_announcements = [
@@ -151,7 +552,8 @@ def initialize_sample_data():
                 'priority': 'medium'
             }
         ]
-        DATA_STORE['announcements'] = sample_announcements
+        DATA_STORE['announcements'] = migrate_collection('announcements', sample_announcements)
+        bump_collection_version('announcements')
     
     if not DATA_STORE['events']:
         sample_events = {
@@ -201,7 +603,8 @@ def initialize_sample_data():
                 'image_url': 'https://images.unsplash.com/photo-1551818255-e6e109cbcb0e?w=400'
             }
         }
-        DATA_STORE['events'] = sample_events
+        DATA_STORE['events'] = migrate_collection('events', sample_events)
+        bump_collection_version('events')
     
     if not DATA_STORE['users']:
         # Add a sample admin user
@@ -221,4 +624,5 @@ def initialize_sample_data():
             'role': 'admin',
             'last_login': datetime.now().isoformat()
         }
-        DATA_STORE['users'] = {'admin_1': admin_user}
\ No newline at end of file
+        DATA_STORE['users'] = migrate_collection('users', {'admin_1': admin_user})
+        bump_collection_version('users')
\ No newline at end of file
@@ -2,8 +2,8 @@ import streamlit as st
 import re
 import uuid
 import bcrypt
-from datetime import datetime
 from database import get_user_by_email, create_user, load_data, save_data
+from models import now_timestamp
 
 def login_page():
     """Display login/signup page"""
@@ -92,9 +92,9 @@ def signup_form():
                     "interests": interests,
                     "password": hash_password(password),  # ✅ SECURE - hashed password
                     "is_verified": True,
-                    "joined_date": datetime.now().isoformat(),
+                    "joined_date": now_timestamp(),
                     "role": "student",
-                    "last_login": datetime.now().isoformat()
+                    "last_login": now_timestamp()
                 }
                 
                 if create_user(user_data):
@@ -130,7 +130,7 @@ def authenticate_user(email, password):
     user = get_user_by_email(email)
     if user and verify_password(password, user.get('password', '')):
         # Update last login
-        user['last_login'] = datetime.now().isoformat()
+        user['last_login'] = now_timestamp()
         users = load_data('users')
         users[user['id']] = user
         save_data('users', users)
@@ -1,19 +1,23 @@
 import streamlit as st
 import uuid
-from datetime import datetime
-from database import load_data, save_data
+from database import load_data, save_data, get_record, save_record, rerun_fragment
+from models import Comment, now_timestamp, format_date
+from moderation import submit_for_screening, AUTO_APPROVE_CLEAN
+from votes import VOTES, UPVOTE, DOWNVOTE
+from ranking import CONFESSION_FEED, SORT_MODES
+from profiling import track_fragment
 
 def confessions_page():
     """Confessions page"""
     st.title("🗣️ Anonymous Confessions")
-    st.write("Share your thoughts anonymously! All posts are moderated.")
+    st.write("Share your thoughts anonymously! All posts are screened before publishing.")
     
     # Privacy notice
     st.info("""
     🔒 **Your privacy is protected:**
     - Posts are completely anonymous
     - No user information is stored with confessions
-    - Moderators review content before publishing
+    - Every post is screened automatically; flagged posts are held for moderators
     - Be respectful and follow community guidelines
     """)
     
@@ -57,33 +61,35 @@ def submit_confession(content, category):
         'id': confession_id,
         'content': content.strip(),
         'category': category,
-        'status': 'pending',  # Needs moderation
+        'status': 'pending',  # Until screening decides
         'upvotes': 0,
         'downvotes': 0,
         'reports': 0,
         'comments': [],
-        'created_at': datetime.now().isoformat(),
+        'created_at': now_timestamp(),
         'approved_at': None,
         'approved_by': None
     }
     
     confessions[confession_id] = new_confession
     save_data('confessions', confessions)
-    st.success("""
-    📝 Confession submitted for moderation!
-    It will be reviewed by moderators before appearing publicly.
-    """)
+    submit_for_screening(confession_id)
+    if AUTO_APPROVE_CLEAN:
+        st.success("""
+        📝 Confession submitted!
+        It is screened automatically and appears shortly unless flagged for a moderator's review.
+        """)
+    else:
+        st.success("""
+        📝 Confession submitted for moderation!
+        It is screened automatically, then reviewed by moderators before appearing publicly.
+        """)
     st.rerun()
 
 def display_confessions_feed():
     """Display approved confessions"""
-    confessions = load_data('confessions')
-    
-    # Filter approved confessions
-    approved_confessions = [
-        conf for conf in confessions.values() 
-        if conf.get('status') == 'approved'
-    ]
+    sort_label = st.selectbox("Sort by", list(SORT_MODES), key="confession_sort")
+    approved_confessions = CONFESSION_FEED.ranked(SORT_MODES[sort_label])
     
     if not approved_confessions:
         st.info("""
@@ -97,9 +103,6 @@ def display_confessions_feed():
         """)
         return
     
-    # Sort by engagement (upvotes - downvotes)
-    approved_confessions.sort(key=lambda x: (x.get('upvotes', 0) - x.get('downvotes', 0)), reverse=True)
-    
     # Category filter
     categories = list(set(conf.get('category', 'General') for conf in approved_confessions))
     selected_category = st.selectbox("Filter by category", ["All"] + sorted(categories))
@@ -109,10 +112,19 @@ def display_confessions_feed():
     
     # Display confessions
     for confession in approved_confessions:
-        display_confession_card(confession)
+        display_confession_card(confession['id'])
 
-def display_confession_card(confession):
-    """Display a single confession card"""
+@st.fragment
+@track_fragment("Confessions › card")
+def display_confession_card(confession_id):
+    """Display a single confession card.
+    
+    Runs as a fragment: votes, reports and comments re-render this card only.
+    """
+    confession = get_record('confessions', confession_id)
+    if not confession:
+        return
+    
     with st.container():
         # Header with category and engagement
         col1, col2 = st.columns([3, 1])
@@ -121,8 +133,8 @@ def display_confession_card(confession):
             st.caption(f"#{confession.get('category', 'General')}")
         
         with col2:
-            score = confession.get('upvotes', 0) - confession.get('downvotes', 0)
-            st.caption(f"❤️ {score}")
+            upvotes, downvotes = VOTES.counts(confession)
+            st.caption(f"❤️ {upvotes - downvotes}")
         
         # Confession content
         st.write(confession['content'])
@@ -130,13 +142,17 @@ def display_confession_card(confession):
         # Engagement buttons
         col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
         
+        my_vote = VOTES.vote_of(confession['id'], st.session_state.user['id'])
+        
         with col1:
-            if st.button("👍", key=f"up_{confession['id']}"):
-                vote_confession(confession['id'], 'upvote')
+            if st.button("👍", key=f"up_{confession['id']}",
+                         type="primary" if my_vote == UPVOTE else "secondary"):
+                vote_confession(confession['id'], UPVOTE)
         
         with col2:
-            if st.button("👎", key=f"down_{confession['id']}"):
-                vote_confession(confession['id'], 'downvote')
+            if st.button("👎", key=f"down_{confession['id']}",
+                         type="primary" if my_vote == DOWNVOTE else "secondary"):
+                vote_confession(confession['id'], DOWNVOTE)
         
         with col3:
             if st.button("💬 Comment", key=f"comment_{confession['id']}"):
@@ -152,18 +168,11 @@ def display_confession_card(confession):
         
         st.divider()
 
-def vote_confession(confession_id, vote_type):
-    """Vote on a confession"""
-    confessions = load_data('confessions')
-    
-    if confession_id in confessions:
-        if vote_type == 'upvote':
-            confessions[confession_id]['upvotes'] = confessions[confession_id].get('upvotes', 0) + 1
-        else:
-            confessions[confession_id]['downvotes'] = confessions[confession_id].get('downvotes', 0) + 1
-        
-        save_data('confessions', confessions)
-        st.rerun()
+def vote_confession(confession_id, direction):
+    """Cast, switch or retract the current user's vote"""
+    if get_record('confessions', confession_id):
+        VOTES.cast(confession_id, st.session_state.user['id'], direction)
+        rerun_fragment()
 
 def report_confession(confession_id):
     """Report a confession"""
@@ -175,20 +184,20 @@ def report_confession(confession_id):
         'reporter_id': st.session_state.user['id'],
         'reason': 'Inappropriate content',
         'status': 'pending',
-        'created_at': datetime.now().isoformat()
+        'created_at': now_timestamp()
     }
     
     reports.append(new_report)
     save_data('reports', reports)
     
     # Also increment report count on confession
-    confessions = load_data('confessions')
-    if confession_id in confessions:
-        confessions[confession_id]['reports'] = confessions[confession_id].get('reports', 0) + 1
-        save_data('confessions', confessions)
+    confession = get_record('confessions', confession_id)
+    if confession:
+        confession['reports'] = confession.get('reports', 0) + 1
+        save_record('confessions', confession_id, confession)
     
     st.success("🚩 Thank you for reporting. Moderators will review this content.")
-    st.rerun()
+    rerun_fragment()
 
 def display_comments(confession):
     """Display comments for a confession"""
@@ -202,7 +211,7 @@ def display_comments(confession):
     
     for comment in comments:
         st.write(f"**Anonymous:** {comment['content']}")
-        st.caption(f"Posted {format_timestamp(comment.get('timestamp', ''))}")
+        st.caption(f"Posted {format_date(comment.get('timestamp'))}")
         st.divider()
     
     # Add comment form
@@ -216,23 +225,15 @@ def display_comments(confession):
 
 def add_comment(confession_id, content):
     """Add a comment to a confession"""
-    confessions = load_data('confessions')
-    
-    if confession_id in confessions:
-        new_comment = {
-            'id': str(uuid.uuid4()),
-            'content': content,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        confessions[confession_id]['comments'] = confessions[confession_id].get('comments', []) + [new_comment]
-        save_data('confessions', confessions)
-        st.rerun()
-
-def format_timestamp(timestamp):
-    """Format timestamp for display"""
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        return dt.strftime("%b %d, %Y")
-    except:
-        return "Unknown"
\ No newline at end of file
+    confession = get_record('confessions', confession_id)
+    
+    if confession:
+        new_comment = Comment(
+            id=str(uuid.uuid4()),
+            content=content,
+            timestamp=now_timestamp()
+        )
+        
+        confession['comments'] = confession.get('comments', []) + [new_comment]
+        save_record('confessions', confession_id, confession)
+        rerun_fragment()
\ No newline at end of file
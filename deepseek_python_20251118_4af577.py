@@ -1,6 +1,16 @@
 import streamlit as st
-from datetime import datetime
-from database import load_data, save_data, log_admin_action, get_user_by_id
+import os
+from database import load_data, save_data, log_admin_action, log_admin_actions, batch_write, get_user_by_id
+from datetime import datetime, time
+from models import now_timestamp, to_timestamp, format_datetime, format_date
+from scheduler import SCHEDULER
+from moderation import PRIORITIES
+from votes import VOTES
+from export import EXPORT_COLLECTIONS, EXPORT_FORMATS, STATUS_OPTIONS, DATE_FIELDS, DOWNLOAD_MAX_BYTES, export_collection
+from profiling import RENDER_PROFILER, TRACE_FILE_ENV, render_session_id
+from storage_metrics import STORAGE_METRICS, METRICS_FILE_ENV, METRICS_PORT_ENV
+from memory_usage import MEMORY, MB
+from analytics import ROLLUPS, METRICS, window, previous_window, daily_percentiles, rolling_average, weekday_profile
 
 def admin_page():
     """Admin dashboard"""
@@ -11,32 +21,51 @@ def admin_page():
     st.title("⚡ Admin Dashboard")
     st.warning("**RESTRICTED ACCESS** - All actions are logged and monitored")
     
+    for warning in MEMORY.warnings:
+        st.warning(f"🧠 {warning}")
+    
     # Log admin access
     log_admin_action(st.session_state.user['id'], "accessed_admin_dashboard")
     
     # Admin tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
         "📊 Overview", 
+        "📈 Analytics", 
         "👥 User Management", 
         "🚩 Moderation", 
         "📢 Announcements",
-        "📋 Logs"
+        "📋 Logs",
+        "⏱️ Background Jobs",
+        "🚀 Performance",
+        "📤 Export"
     ])
     
     with tab1:
         admin_overview()
     
     with tab2:
-        user_management()
+        analytics_dashboard()
     
     with tab3:
-        content_moderation()
+        user_management()
     
     with tab4:
-        announcement_management()
+        content_moderation()
     
     with tab5:
+        announcement_management()
+    
+    with tab6:
         view_admin_logs()
+    
+    with tab7:
+        background_jobs_status()
+    
+    with tab8:
+        performance_dashboard()
+    
+    with tab9:
+        data_export()
 
 def admin_overview():
     """Admin overview dashboard"""
@@ -67,14 +96,8 @@ def admin_overview():
     st.subheader("Recent Activity")
     
     # Recent signups (last 7 days)
-    recent_users = []
-    for user in users.values():
-        try:
-            join_date = datetime.fromisoformat(user.get('joined_date', ''))
-            if (datetime.now() - join_date).days <= 7:
-                recent_users.append(user)
-        except:
-            pass
+    week_ago = now_timestamp() - 7 * 24 * 3600
+    recent_users = [user for user in users.values() if user.get('joined_date', 0) >= week_ago]
     
     st.write(f"**New users (last 7 days):** {len(recent_users)}")
     
@@ -87,6 +110,62 @@ def admin_overview():
     pending_reports = [r for r in reports if r.get('status') == 'pending']
     st.write(f"**Pending reports:** {len(pending_reports)}")
 
+def analytics_dashboard():
+    """Activity trends from the daily rollups"""
+    st.subheader("📈 Analytics")
+    
+    if ROLLUPS.computed_at is None:
+        st.info("Rollups have not been computed yet")
+        if st.button("🔄 Compute now", key="compute_rollups"):
+            ROLLUPS.update()
+            st.rerun()
+        return
+    
+    st.caption(f"Rollups updated {format_datetime(int(ROLLUPS.computed_at))} in {ROLLUPS.duration * 1000:.1f} ms")
+    
+    ranges = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All time": None}
+    days = ranges[st.selectbox("Range", list(ranges), index=1, key="analytics_range")]
+    current = window(ROLLUPS.daily, days)
+    previous = previous_window(ROLLUPS.daily, days)
+    totals = current.sum()
+    previous_totals = previous.sum()
+    
+    # Totals for the range, with the change against the range before it
+    columns = st.columns(len(METRICS))
+    for column, (metric, label) in zip(columns, METRICS.items()):
+        with column:
+            delta = int(totals[metric] - previous_totals[metric]) if days and len(previous) else None
+            st.metric(label, f"{int(totals[metric]):,}", delta)
+    
+    if current.empty:
+        st.info("No activity recorded yet")
+        return
+    
+    selected = st.multiselect("Metrics", list(METRICS), default=['signups', 'messages'],
+                              format_func=METRICS.get, key="analytics_metrics")
+    if selected:
+        smooth = st.checkbox("7-day average", key="analytics_smooth")
+        chart = rolling_average(current[selected]) if smooth else current[selected]
+        st.line_chart(chart.rename(columns=METRICS))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Daily percentiles**")
+        st.dataframe(daily_percentiles(current).rename(index=METRICS).round(1), use_container_width=True)
+    with col2:
+        st.write("**Average by weekday**")
+        st.bar_chart(weekday_profile(current)[selected or list(METRICS)].rename(columns=METRICS))
+    
+    events = ROLLUPS.events
+    if events is not None and len(events):
+        st.write("**RSVPs per event**")
+        fill = events['fill_rate'].quantile([0.5, 0.9]).tolist()
+        st.caption(f"Median fill rate {fill[0]:.0%} • p90 {fill[1]:.0%} • {int(events['waitlist'].sum())} waiting")
+        st.dataframe(
+            events.nlargest(20, 'rsvps')[['title', 'date', 'rsvps', 'waitlist', 'capacity', 'fill_rate']],
+            use_container_width=True, hide_index=True
+        )
+
 def user_management():
     """User management section"""
     st.subheader("👥 User Management")
@@ -104,7 +183,7 @@ def user_management():
     for user_id, user in users.items():
         if search_query and search_query.lower() not in user['name'].lower() and search_query.lower() not in user['email'].lower():
             continue
-            
+        
         with st.expander(f"👤 {user['name']} ({user['email']})"):
             col1, col2 = st.columns(2)
             
@@ -115,8 +194,8 @@ def user_management():
             
             with col2:
                 st.write(f"**Role:** {user.get('role', 'student')}")
-                st.write(f"**Joined:** {format_date(user.get('joined_date', ''))}")
-                st.write(f"**Last Login:** {format_date(user.get('last_login', ''))}")
+                st.write(f"**Joined:** {format_date(user.get('joined_date'))}")
+                st.write(f"**Last Login:** {format_date(user.get('last_login'))}")
             
             # Admin actions
             if user_id != st.session_state.user['id']:  # Can't modify own account
@@ -143,14 +222,30 @@ def content_moderation():
     confessions = load_data('confessions')
     pending_confessions = [c for c in confessions.values() if c.get('status') == 'pending']
     
+    # Flagged items first, then oldest first
+    pending_confessions.sort(key=lambda c: (-c.get('priority', 0), c.get('created_at', 0)))
+    
+    summary = st.session_state.pop('moderation_summary', None)
+    if summary:
+        st.success(summary)
+    
     if not pending_confessions:
         st.success("✅ No pending confessions")
     else:
+        bulk_confession_actions(pending_confessions)
+        
         for confession in pending_confessions:
             with st.container():
+                if confession.get('priority', 0) >= PRIORITIES['prioritize']:
+                    st.error("🚨 Priority review")
                 st.write(f"**Category:** {confession.get('category', 'General')}")
                 st.write(confession['content'])
                 
+                if confession.get('screened_at') is None:
+                    st.caption("⏳ Awaiting automatic screening")
+                elif confession.get('screening_reasons'):
+                    st.caption(f"🔎 Screening: {', '.join(confession['screening_reasons'])}")
+                
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
@@ -175,6 +270,8 @@ def content_moderation():
     if not pending_reports:
         st.success("✅ No pending reports")
     else:
+        bulk_report_actions(pending_reports)
+        
         for report in pending_reports:
             with st.container():
                 confession = confessions.get(report['confession_id'], {})
@@ -194,6 +291,97 @@ def content_moderation():
                 
                 st.divider()
 
+def bulk_confession_actions(pending_confessions):
+    """Multi-select approve/reject for the pending queue"""
+    with st.expander(f"☑️ Bulk actions ({len(pending_confessions)} pending)", expanded=False):
+        labels = {
+            c['id']: f"[{c.get('category', 'General')}] {c['content'][:60]}"
+            for c in pending_confessions
+        }
+        select_all = st.checkbox("Select all pending", key="bulk_confessions_all")
+        selected = st.multiselect(
+            "Confessions",
+            list(labels),
+            default=list(labels) if select_all else [],
+            format_func=labels.get
+        )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("✅ Approve selected", key="bulk_approve", disabled=not selected):
+                bulk_moderate_confessions(selected, 'approved')
+        
+        with col2:
+            if st.button("❌ Reject selected", key="bulk_reject", disabled=not selected):
+                bulk_moderate_confessions(selected, 'rejected')
+
+def bulk_report_actions(pending_reports):
+    """Multi-select dismiss for pending reports"""
+    with st.expander(f"☑️ Bulk actions ({len(pending_reports)} pending)", expanded=False):
+        labels = {r['id']: f"{r['id']}: {r.get('reason', 'N/A')}" for r in pending_reports}
+        select_all = st.checkbox("Select all reports", key="bulk_reports_all")
+        selected = st.multiselect(
+            "Reports",
+            list(labels),
+            default=list(labels) if select_all else [],
+            format_func=labels.get
+        )
+        
+        if st.button("✅ Dismiss selected", key="bulk_dismiss", disabled=not selected):
+            bulk_dismiss_reports(selected)
+
+def bulk_moderate_confessions(confession_ids, status):
+    """Approve or reject many pending confessions in one batched write"""
+    admin_id = st.session_state.user['id']
+    confessions = load_data('confessions')
+    timestamp = now_timestamp()
+    updated = []
+    
+    action = "approved_confession" if status == 'approved' else "rejected_confession"
+    
+    # State changes and their audit entries in one transaction
+    with batch_write('confessions', 'admin_logs'):
+        for confession_id in confession_ids:
+            confession = confessions.get(confession_id)
+            # Skip items another moderator or the screener already handled
+            if confession is None or confession.get('status') != 'pending':
+                continue
+            confession['status'] = status
+            if status == 'approved':
+                confession['approved_at'] = timestamp
+                confession['approved_by'] = admin_id
+            updated.append(confession_id)
+        log_admin_actions(admin_id, action, "confession", updated)
+    
+    skipped = len(confession_ids) - len(updated)
+    summary = f"{'✅' if status == 'approved' else '❌'} {len(updated)} confession(s) {status}"
+    if skipped:
+        summary += f", {skipped} skipped (no longer pending)"
+    st.session_state.moderation_summary = summary
+    st.rerun()
+
+def bulk_dismiss_reports(report_ids):
+    """Dismiss many pending reports in one batched write"""
+    admin_id = st.session_state.user['id']
+    wanted = set(report_ids)
+    dismissed = []
+    
+    # State changes and their audit entries in one transaction
+    with batch_write('reports', 'admin_logs'):
+        for report in load_data('reports'):
+            if report['id'] in wanted and report.get('status') == 'pending':
+                report['status'] = 'dismissed'
+                dismissed.append(report['id'])
+        log_admin_actions(admin_id, "dismissed_report", "report", dismissed)
+    
+    skipped = len(report_ids) - len(dismissed)
+    summary = f"✅ {len(dismissed)} report(s) dismissed"
+    if skipped:
+        summary += f", {skipped} skipped (no longer pending)"
+    st.session_state.moderation_summary = summary
+    st.rerun()
+
 def announcement_management():
     """Announcement management"""
     st.subheader("📢 Announcement Management")
@@ -217,7 +405,7 @@ def announcement_management():
                         'author_id': st.session_state.user['id'],
                         'type': 'college',
                         'priority': priority.lower(),
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': now_timestamp()
                     }
                     
                     announcements.append(new_announcement)
@@ -237,16 +425,289 @@ def view_admin_logs():
         return
     
     # Show recent logs (last 50)
-    recent_logs = sorted(logs, key=lambda x: x.get('timestamp', ''), reverse=True)[:50]
+    recent_logs = sorted(logs, key=lambda x: x.get('timestamp', 0), reverse=True)[:50]
     
     for log in recent_logs:
         admin = get_user_by_id(log.get('admin_id', ''))
         admin_name = admin['name'] if admin else "Unknown"
         
         st.write(f"**{admin_name}** - {log.get('action', 'Unknown action')}")
-        st.caption(f"Target: {log.get('target_type', 'N/A')} • {format_timestamp(log.get('timestamp', ''))}")
+        st.caption(f"Target: {log.get('target_type', 'N/A')} • {format_datetime(log.get('timestamp'))}")
         st.divider()
 
+def background_jobs_status():
+    """Show background job registry and run history"""
+    st.subheader("⏱️ Background Jobs")
+    
+    if SCHEDULER.running:
+        st.success("✅ Scheduler running")
+    else:
+        st.warning("⚠️ Scheduler not running")
+    
+    jobs = SCHEDULER.status()
+    
+    if not jobs:
+        st.info("No jobs registered")
+        return
+    
+    for job in jobs:
+        status = "🔄" if job['running'] else "🔴" if job['consecutive_failures'] else "🟢"
+        
+        with st.expander(f"{status} {job['name']} ({job['type']})"):
+            st.caption(job['description'])
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Runs", job['runs'])
+            with col2:
+                st.metric("Failures", job['failures'])
+            with col3:
+                duration = job['last_duration']
+                st.metric("Last Duration", f"{duration * 1000:.1f} ms" if duration is not None else "—")
+            
+            st.write(f"**Last run:** {format_datetime(job['last_run'], 'Never')}")
+            st.write(f"**Next run:** {format_datetime(job['next_run'], 'Not scheduled')}")
+            
+            if job['last_error']:
+                st.error(job['last_error'])
+            
+            if job['history']:
+                st.dataframe([
+                    {
+                        'Started': format_datetime(run['started']),
+                        'Duration (ms)': round(run['duration'] * 1000, 1),
+                        'OK': run['ok'],
+                        'Error': run['error'] or ''
+                    }
+                    for run in reversed(job['history'])
+                ], use_container_width=True)
+            
+            if st.button("▶️ Run Now", key=f"run_job_{job['name']}"):
+                SCHEDULER.run_now(job['name'])
+                log_admin_action(st.session_state.user['id'], "ran_background_job", "job", job['name'])
+                st.success(f"Queued {job['name']}")
+
+def render_table(rows):
+    """Render-summary rows as a table with rounded timings"""
+    st.dataframe([
+        {
+            'Page': row['page'],
+            'Renders': row['renders'],
+            **{key: round(row[key], 1) if row[key] is not None else None
+               for key in ('p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'mean (ms)')},
+            'Loads / render': round(row['loads/render'], 1),
+            'Saves / render': round(row['saves/render'], 2),
+            'Causes': ", ".join(f"{cause} {count}" for cause, count in row['causes'].items()),
+            'Reruns / stops': row['outcomes'].get('rerun', 0) + row['outcomes'].get('stop', 0)
+        }
+        for row in rows
+    ], use_container_width=True, hide_index=True)
+
+def performance_dashboard():
+    """Per-page render timings from the router instrumentation"""
+    st.subheader("🚀 Page Performance")
+    st.caption("Rolling percentiles over the most recent renders of each page. Card and chat fragment reruns appear as their own rows (e.g. Chat › transcript) with a 'fragment' cause.")
+    
+    report = RENDER_PROFILER.report()
+    if report:
+        render_table(report)
+    else:
+        st.info("No page renders recorded yet")
+    
+    with st.expander("This session"):
+        render_table(RENDER_PROFILER.session_report(render_session_id()))
+    
+    with st.expander("Recent renders"):
+        st.dataframe([
+            {
+                'Started': format_datetime(int(render['started_at'])),
+                'Page': render['page'],
+                'Session': render['session'],
+                'Wall (ms)': round(render['wall_ms'], 1),
+                'Loads': render['loads'],
+                'Saves': render['saves'],
+                'Cause': render['cause'],
+                'Outcome': render['outcome']
+            }
+            for render in reversed(RENDER_PROFILER.recent)
+        ], use_container_width=True, hide_index=True)
+    
+    trace_file = os.environ.get(TRACE_FILE_ENV)
+    col1, col2 = st.columns(2)
+    with col1:
+        if trace_file:
+            st.caption(f"Tracing every render to `{trace_file}`")
+            if st.button("💾 Dump summary to trace", key="dump_render_stats"):
+                RENDER_PROFILER.dump(trace_file)
+                st.success("Summary appended")
+        else:
+            st.caption(f"Set {TRACE_FILE_ENV} to write a JSONL trace")
+    with col2:
+        if st.button("🧹 Reset statistics", key="reset_render_stats"):
+            RENDER_PROFILER.reset()
+            STORAGE_METRICS.reset()
+            log_admin_action(st.session_state.user['id'], "reset_render_stats")
+            st.rerun()
+    
+    st.divider()
+    storage_metrics_panel()
+    
+    st.divider()
+    memory_panel()
+
+def storage_metrics_panel():
+    """load_data/save_data counters and the slow-operation log"""
+    st.subheader("🗄️ Storage")
+    
+    exports = []
+    if os.environ.get(METRICS_PORT_ENV):
+        exports.append(f"http://127.0.0.1:{os.environ[METRICS_PORT_ENV]}/metrics")
+    if os.environ.get(METRICS_FILE_ENV):
+        exports.append(f"`{os.environ[METRICS_FILE_ENV]}`")
+    st.caption(f"Prometheus export: {', '.join(exports)}" if exports
+               else f"Set {METRICS_PORT_ENV} or {METRICS_FILE_ENV} to export Prometheus metrics")
+    
+    rows = STORAGE_METRICS.snapshot()
+    if not rows:
+        st.info("No storage calls recorded yet")
+        return
+    
+    st.dataframe([
+        {
+            'Operation': row['operation'],
+            'Collection': row['collection'],
+            'Calls': row['calls'],
+            'Records': row['records'],
+            'KB Written': round(row['bytes_written'] / 1024, 1),
+            'Mean (ms)': round(row['mean_ms'], 3),
+            'p95 ≤ (ms)': row['p95_ms'],
+            'Slow': row['slow']
+        }
+        for row in rows
+    ], use_container_width=True, hide_index=True)
+    
+    slow_log = list(STORAGE_METRICS.slow_log)
+    st.write(f"**Slow operations** (≥ {STORAGE_METRICS.slow_ms:g} ms)")
+    if not slow_log:
+        st.caption("None recorded")
+        return
+    
+    st.dataframe([
+        {
+            'At': format_datetime(int(entry['at'])),
+            'Operation': entry['operation'],
+            'Collection': entry['collection'],
+            'ms': round(entry['ms'], 1),
+            'Records': entry['records'],
+            'Caller': entry['caller'] or 'unknown'
+        }
+        for entry in reversed(slow_log)
+    ], use_container_width=True, hide_index=True)
+
+def memory_panel():
+    """Estimated memory per collection, growth rates and soft limits"""
+    st.subheader("🧠 Memory")
+    
+    if st.button("📏 Sample now", key="sample_memory"):
+        MEMORY.sample()
+    
+    snapshot = MEMORY.latest
+    if snapshot is None:
+        st.info("Memory has not been sampled yet")
+        return
+    
+    total_growth = MEMORY.growth('total')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Estimated total", f"{snapshot['total'] / MB:,.1f} MB")
+    with col2:
+        st.metric("Growth", f"{total_growth / MB:+,.2f} MB/h" if total_growth is not None else "—")
+    with col3:
+        st.metric("Samples", len(MEMORY.history))
+    st.caption(f"Sampled {format_datetime(int(snapshot['at']))} in {snapshot['duration'] * 1000:.0f} ms")
+    
+    report = MEMORY.report()
+    st.dataframe([
+        {
+            'Collection': row['collection'],
+            'Records': row['records'],
+            'MB': round(row['bytes'] / MB, 2),
+            'Bytes / record': row['bytes_per_record'],
+            'Growth (MB/h)': round(row['growth_per_hour'] / MB, 3) if row['growth_per_hour'] is not None else None,
+            'Soft limit (MB)': round(row['limit'] / MB) if row['limit'] else None,
+            'Used': f"{row['bytes'] / row['limit']:.0%}" if row['limit'] else ""
+        }
+        for row in report
+    ], use_container_width=True, hide_index=True)
+    
+    if len(MEMORY.history) > 1:
+        largest = [row['collection'] for row in report[:5]]
+        st.line_chart(MEMORY.history_frame(['total'] + largest))
+    
+    with st.expander("Largest records"):
+        st.dataframe([
+            {
+                'Collection': row['collection'],
+                'Record': entry['id'],
+                'KB': round(entry['bytes'] / 1024, 1),
+                'Items': entry['items']
+            }
+            for row in report
+            for entry in row['top']
+        ], use_container_width=True, hide_index=True)
+
+def data_export():
+    """Stream a collection to a file for the registrar or offline analysis"""
+    st.subheader("📤 Data Export")
+    st.caption("Password hashes are never exported. Chat messages export one row per message.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        collection = st.selectbox("Collection", EXPORT_COLLECTIONS, key="export_collection")
+        fmt_label = st.selectbox("Format", list(EXPORT_FORMATS), key="export_format")
+    with col2:
+        date_range = st.date_input(f"Date range ({DATE_FIELDS[collection]})", value=(), key="export_dates")
+        statuses = st.multiselect("Status", STATUS_OPTIONS[collection], key="export_statuses") if collection in STATUS_OPTIONS else None
+    
+    if st.button("📤 Export", key="run_export"):
+        start = end = None
+        if len(date_range) == 2:
+            start = to_timestamp(datetime.combine(date_range[0], time.min))
+            end = to_timestamp(datetime.combine(date_range[1], time.max))
+        
+        progress = st.empty()
+        try:
+            result = export_collection(collection, EXPORT_FORMATS[fmt_label], start, end, statuses,
+                                       progress=lambda rows: progress.caption(f"{rows:,} rows written..."))
+        except Exception as e:
+            progress.empty()
+            st.error(f"Export failed: {e}")
+            return
+        progress.empty()
+        
+        log_admin_action(st.session_state.user['id'], "exported_data", collection, result['path'])
+        st.session_state.last_export = result
+    
+    result = st.session_state.get('last_export')
+    if result:
+        st.success(f"✅ Exported to `{result['path']}`")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Rows", f"{result['rows']:,}")
+        with col2:
+            st.metric("Rows / sec", f"{result['rows_per_second']:,.0f}")
+        with col3:
+            st.metric("File Size", f"{result['bytes'] / 1024:,.1f} KB")
+        
+        if os.path.exists(result['path']):
+            # Streamlit holds a download in memory, so only build one on request
+            if result['bytes'] > DOWNLOAD_MAX_BYTES:
+                st.caption(f"Over {DOWNLOAD_MAX_BYTES / (1024 * 1024):,.0f} MB; copy it from the server path above")
+            elif st.button("⬇️ Prepare Download", key="prepare_export_download"):
+                with open(result['path'], 'rb') as fh:
+                    st.download_button("⬇️ Download", fh, file_name=os.path.basename(result['path']),
+                                       key="download_export")
+
 # Admin action functions
 def make_user_admin(user_id):
     """Make a user an admin"""
@@ -281,7 +742,7 @@ def approve_confession(confession_id):
     confessions = load_data('confessions')
     if confession_id in confessions:
         confessions[confession_id]['status'] = 'approved'
-        confessions[confession_id]['approved_at'] = datetime.now().isoformat()
+        confessions[confession_id]['approved_at'] = now_timestamp()
         confessions[confession_id]['approved_by'] = st.session_state.user['id']
         save_data('confessions', confessions)
         log_admin_action(st.session_state.user['id'], "approved_confession", "confession", confession_id)
@@ -321,26 +782,11 @@ def remove_reported_content(report_id):
         if report['confession_id'] in confessions:
             del confessions[report['confession_id']]
             save_data('confessions', confessions)
+            VOTES.forget(report['confession_id'])
         
         # Mark report as resolved
         report['status'] = 'resolved'
         save_data('reports', reports)
         log_admin_action(st.session_state.user['id'], "removed_reported_content", "confession", report['confession_id'])
         st.success("✅ Content removed and report resolved")
-        st.rerun()
-
-def format_date(date_str):
-    """Format date for display"""
-    try:
-        dt = datetime.fromisoformat(date_str)
-        return dt.strftime("%b %d, %Y")
-    except:
-        return "Unknown"
-
-def format_timestamp(timestamp):
-    """Format timestamp for display"""
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        return dt.strftime("%b %d, %Y at %I:%M %p")
-    except:
-        return timestamp
\ No newline at end of file
+        st.rerun()
\ No newline at end of file
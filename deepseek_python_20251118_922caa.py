@@ -1,6 +1,10 @@
 import streamlit as st
-from datetime import datetime
-from database import load_data, save_data, get_user_by_id
+from database import load_data, save_data, get_user_by_id, get_record, add_member, get_upcoming_events, get_home_stats
+from models import now_timestamp, format_datetime, format_date
+from ranking import ANNOUNCEMENT_FEED, SORT_MODES
+from recommendations import recommend_clubs, recommend_events
+from recurrence import next_occurrence
+from schedule import add_commitment
 
 def home_page():
     """Home feed with announcements and activity"""
@@ -9,23 +13,20 @@ def home_page():
     st.subheader("Latest from your campus community")
     
     # Quick stats
+    stats = get_home_stats()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        clubs = load_data('clubs')
-        st.metric("Active Clubs", len(clubs))
+        st.metric("Active Clubs", stats['clubs'])
     
     with col2:
-        events = load_data('events')
-        st.metric("Upcoming Events", len(events))
+        st.metric("Upcoming Events", stats['events'])
     
     with col3:
-        marketplace = load_data('marketplace')
-        st.metric("Marketplace Items", len(marketplace))
+        st.metric("Marketplace Items", stats['marketplace'])
     
     with col4:
-        users = load_data('users')
-        st.metric("Campus Members", len(users))
+        st.metric("Campus Members", stats['users'])
     
     st.divider()
     
@@ -43,6 +44,7 @@ def home_page():
         display_announcements_feed()
     
     with col2:
+        display_recommendations()
         display_upcoming_events()
         display_active_clubs()
 
@@ -66,7 +68,7 @@ def create_announcement_form():
                     'author_id': st.session_state.user['id'],
                     'type': announcement_type.lower(),
                     'priority': priority.lower(),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_timestamp()
                 }
                 
                 announcements.append(new_announcement)
@@ -78,15 +80,14 @@ def display_announcements_feed():
     """Display announcements feed"""
     st.subheader("📢 Campus Announcements")
     
-    announcements = load_data('announcements')
+    sort_label = st.selectbox("Sort by", list(SORT_MODES), key="announcement_sort")
+    announcements = ANNOUNCEMENT_FEED.ranked(SORT_MODES[sort_label])
     
     if not announcements:
         st.info("No announcements yet. Be the first to post!")
         return
     
-    for announcement in sorted(announcements, 
-                             key=lambda x: x['timestamp'], 
-                             reverse=True):
+    for announcement in announcements:
         with st.container():
             # Priority indicator
             priority = announcement.get('priority', 'medium')
@@ -105,40 +106,62 @@ def display_announcements_feed():
             with col2:
                 st.write(f"**{announcement['title']}**")
                 st.write(announcement['content'])
-                st.caption(f"By {announcement['author']} • {format_timestamp(announcement['timestamp'])}")
+                st.caption(f"By {announcement['author']} • {format_datetime(announcement['timestamp'])}")
             
             st.divider()
 
+def display_recommendations():
+    """Clubs and events matching the user's interests"""
+    user_id = st.session_state.user['id']
+    club_picks = recommend_clubs(user_id)
+    event_picks = recommend_events(user_id)
+    
+    if not club_picks and not event_picks:
+        return
+    
+    st.subheader("✨ Recommended for you")
+    
+    for club_id, _, matched in club_picks:
+        club = get_record('clubs', club_id)
+        st.write(f"👥 **{club['name']}**")
+        st.caption(f"Matches: {', '.join(matched)}")
+        if st.button("Join Club", key=f"rec_club_{club_id}"):
+            join_club(club_id)
+    
+    for event_id, _, matched in event_picks:
+        event = get_record('events', event_id)
+        st.write(f"📅 **{event['title']}**")
+        st.caption(f"{format_date(event.get('date'), 'TBA')} • Matches: {', '.join(matched)}")
+        if st.button("View Details", key=f"rec_event_{event_id}"):
+            st.session_state.view_event = event_id
+            st.session_state.pending_page = "Events"
+            st.rerun()
+    
+    st.divider()
+
 def display_upcoming_events():
     """Display upcoming events sidebar"""
     st.subheader("📅 Upcoming Events")
     
-    events = load_data('events')
-    upcoming_events = []
-    
-    for event_id, event in events.items():
-        if 'date' in event:
-            try:
-                event_date = datetime.fromisoformat(event['date'])
-                if event_date >= datetime.now():
-                    upcoming_events.append(event)
-            except:
-                upcoming_events.append(event)
+    upcoming_events = get_upcoming_events()
     
     if not upcoming_events:
         st.info("No upcoming events")
         return
     
-    for event in sorted(upcoming_events, key=lambda x: x.get('date', ''))[:3]:
+    now = now_timestamp()
+    for event in upcoming_events[:3]:
+        occurrence = next_occurrence(event, now) if event.get('recurrence') else None
         with st.container():
             st.write(f"**{event['title']}**")
-            st.caption(f"📅 {format_date(event.get('date', 'TBA'))}")
+            st.caption(f"📅 {format_date(occurrence[0] if occurrence else event.get('date'), 'TBA')}" + (" 🔁" if occurrence else ""))
             st.caption(f"📍 {event.get('location', 'TBA')}")
             st.caption(f"👥 {len(event.get('rsvps', []))} attending")
             
             if st.button("View Details", key=f"event_{event['id']}"):
                 st.session_state.view_event = event['id']
-                st.session_state.page = "Events"
+                st.session_state.pending_page = "Events"
+                st.rerun()
             
             st.divider()
 
@@ -168,22 +191,6 @@ def display_active_clubs():
             
             st.divider()
 
-def format_timestamp(timestamp):
-    """Format timestamp for display"""
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        return dt.strftime("%b %d, %Y at %I:%M %p")
-    except:
-        return timestamp
-
-def format_date(date_str):
-    """Format date for display"""
-    try:
-        dt = datetime.fromisoformat(date_str)
-        return dt.strftime("%b %d, %Y")
-    except:
-        return date_str
-
 def join_club(club_id):
     """Join a club"""
     clubs = load_data('clubs')
@@ -192,9 +199,7 @@ def join_club(club_id):
         club = clubs[club_id]
         user_id = st.session_state.user['id']
         
-        if user_id not in club.get('members', []):
-            club['members'] = club.get('members', []) + [user_id]
-            clubs[club_id] = club
-            save_data('clubs', clubs)
+        if add_member('clubs', club_id, user_id) == 'added':
+            add_commitment(user_id, 'club', club)
             st.success(f"🎉 Joined {club['name']}!")
             st.rerun()
\ No newline at end of file
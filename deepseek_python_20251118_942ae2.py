@@ -1,7 +1,7 @@
 import streamlit as st
 import uuid
-from datetime import datetime
 from database import load_data, save_data, get_user_by_id
+from models import now_timestamp
 
 def marketplace_page():
     """Marketplace page"""
@@ -64,7 +64,7 @@ def create_listing_form():
                     'seller_id': st.session_state.user['id'],
                     'seller_name': st.session_state.user['name'],
                     'status': 'available',
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': now_timestamp(),
                     'views': 0,
                     'interested': []
                 }
@@ -86,7 +86,7 @@ def display_marketplace_listings(search_query, category_filter, status_filter):
     
     # Filter listings
     filtered_listings = []
-    for listing in marketplace.values():
+    for listing in list(marketplace.values()):
         # Search filter
         if search_query:
             search_lower = search_query.lower()
@@ -110,7 +110,7 @@ def display_marketplace_listings(search_query, category_filter, status_filter):
         return
     
     # Sort by newest first
-    filtered_listings.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+    filtered_listings.sort(key=lambda x: x.get('created_at', 0), reverse=True)
     
     # Display in grid
     for i in range(0, len(filtered_listings), 2):
@@ -180,6 +180,7 @@ def mark_listing_sold(listing_id):
     
     if listing_id in marketplace:
         marketplace[listing_id]['status'] = 'sold'
+        marketplace[listing_id]['sold_at'] = now_timestamp()
         save_data('marketplace', marketplace)
         st.success("✅ Listing marked as sold!")
         st.rerun()
@@ -1,7 +1,55 @@
 import streamlit as st
+import html
 import uuid
-from datetime import datetime
-from database import load_data, save_data, get_user_by_id
+from database import (
+    load_data, save_data, get_user_by_id, direct_chat_id, get_record, save_record, rerun_fragment,
+    batch_write, restore_archived_chat, append_chat_message
+)
+from models import Message, now_timestamp, format_time
+from message_bus import BUS, UNREAD, chat_topic, publish_chat_message
+from profiling import track_fragment
+
+# How often an open chat pane checks the message bus for new messages
+LIVE_REFRESH_SECONDS = 2
+
+# Messages rendered per page of the transcript
+MESSAGES_PER_PAGE = 50
+
+# Message bubble styling, emitted once per transcript
+MESSAGE_BUBBLE_STYLE = """
+<style>
+.message-row {
+    display: flex;
+    align-items: flex-end;
+    gap: 8px;
+}
+.own-row {
+    justify-content: flex-end;
+}
+.message-bubble {
+    padding: 10px 15px;
+    border-radius: 18px;
+    margin: 5px 0;
+    max-width: 80%;
+    word-wrap: break-word;
+    display: inline-block;
+}
+.own-message {
+    background-color: #007bff;
+    color: white;
+    text-align: right;
+}
+.other-message {
+    background-color: #f1f1f1;
+    color: black;
+}
+.message-time {
+    font-size: 0.8em;
+    opacity: 0.7;
+    margin-top: 5px;
+}
+</style>
+"""
 
 def chat_page():
     """Secure chat page"""
@@ -32,9 +80,9 @@ def display_chat_list():
     chats = load_data('chats')
     user_id = st.session_state.user['id']
     
-    # Get user's chats
+    # Get user's chats (from a snapshot; maintenance may archive chats meanwhile)
     user_chats = []
-    for chat_id, chat in chats.items():
+    for chat_id, chat in list(chats.items()):
         if user_id in chat.get('participants', []):
             user_chats.append((chat_id, chat))
     
@@ -76,6 +124,11 @@ def display_chat_list_item(chat_id, chat):
     last_message = messages[-1] if messages else None
     last_preview = last_message['content'][:30] + "..." if last_message and len(last_message['content']) > 30 else last_message['content'] if last_message else "No messages"
     
+    # Unread badge
+    unread = UNREAD.get(user_id).get(chat_id, 0)
+    if unread:
+        display_name = f"{display_name} 🔴 {unread}"
+    
     # Select chat button
     if st.button(f"{emoji} {display_name}\n{last_preview}", 
                  key=f"chat_{chat_id}",
@@ -128,51 +181,65 @@ def create_new_chat(other_user_id, initial_message):
     
     # Create chat ID (sorted to avoid duplicates)
     participants = sorted([user_id, other_user_id])
-    chat_id = f"dm_{'_'.join(participants)}"
-    
-    # Check if chat already exists
-    if chat_id not in chats:
-        new_chat = {
-            'id': chat_id,
-            'participants': participants,
-            'type': 'direct',
-            'created_at': datetime.now().isoformat(),
-            'last_activity': datetime.now().isoformat(),
-            'messages': []
-        }
-        chats[chat_id] = new_chat
-    else:
-        new_chat = chats[chat_id]
+    chat_id = direct_chat_id(user_id, other_user_id)
     
-    # Add initial message
-    message = {
-        'id': str(uuid.uuid4()),
-        'sender': user_id,
-        'content': initial_message,
-        'timestamp': datetime.now().isoformat(),
-        'read': False
-    }
+    # Chats created before ids were interned are keyed by both uuids
+    legacy_chat_id = f"dm_{'_'.join(participants)}"
+    if legacy_chat_id in chats:
+        chat_id = legacy_chat_id
     
-    new_chat['messages'].append(message)
-    new_chat['last_activity'] = datetime.now().isoformat()
+    # Add initial message
+    message = Message(
+        id=str(uuid.uuid4()),
+        sender=user_id,
+        content=initial_message,
+        timestamp=now_timestamp()
+    )
     
-    chats[chat_id] = new_chat
-    save_data('chats', chats)
+    # Under the lock so the archive job cannot move the chat mid-update
+    with batch_write('chats'):
+        # Restore the chat if it was archived for inactivity
+        restore_archived_chat(chat_id)
+        
+        # Check if chat already exists
+        if chat_id not in chats:
+            new_chat = {
+                'id': chat_id,
+                'participants': participants,
+                'type': 'direct',
+                'created_at': now_timestamp(),
+                'last_activity': now_timestamp(),
+                'messages': []
+            }
+            chats[chat_id] = new_chat
+        else:
+            new_chat = chats[chat_id]
+        
+        new_chat['messages'].append(message)
+        new_chat['last_activity'] = now_timestamp()
+        
+        chats[chat_id] = new_chat
+        save_data('chats', chats)
+    publish_chat_message(new_chat, message)
     
     st.session_state.active_chat = chat_id
     st.session_state.show_new_chat = False
     st.rerun()
 
+@st.fragment
+@track_fragment("Chat › messages")
 def display_chat_messages():
-    """Display messages in active chat"""
-    chats = load_data('chats')
+    """Display messages in active chat.
+    
+    Runs as a fragment: sending a message re-renders this pane only.
+    """
     chat_id = st.session_state.active_chat
+    chat = get_record('chats', chat_id)
     
-    if chat_id not in chats:
+    if not chat:
         st.error("Chat not found")
         return
     
-    chat = chats[chat_id]
     user_id = st.session_state.user['id']
     
     # Chat header
@@ -190,69 +257,100 @@ def display_chat_messages():
     messages_container = st.container()
     
     with messages_container:
-        display_chat_messages_list(chat, user_id)
+        display_live_transcript(chat_id, user_id)
     
     # Message input
     st.divider()
     message_input(chat_id)
 
-def display_chat_messages_list(chat, user_id):
-    """Display list of messages in chat"""
-    messages = chat.get('messages', [])
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+@track_fragment("Chat › transcript")
+def display_live_transcript(chat_id, user_id):
+    """Messages in the open chat.
+    
+    Each tick only checks the chat's bus topic. The chat is re-read and the
+    transcript HTML rebuilt when the bus reports a new message or the visible
+    window grows; otherwise the HTML cached in session state is re-emitted.
+    """
+    subscriptions = st.session_state.setdefault('chat_subscriptions', {})
+    
+    if chat_id not in subscriptions:
+        subscriptions[chat_id] = BUS.subscribe(chat_topic(chat_id))
+        has_new = True
+    else:
+        has_new = subscriptions[chat_id].has_new()
     
-    if not messages:
-        st.info("No messages yet. Start the conversation!")
-        return
+    window = st.session_state.setdefault('chat_windows', {}).get(chat_id, MESSAGES_PER_PAGE)
+    transcripts = st.session_state.setdefault('chat_transcripts', {})
+    cached = transcripts.get(chat_id)
+    
+    if has_new or cached is None or cached['window'] != window:
+        chat = get_record('chats', chat_id)
+        if not chat:
+            transcripts.pop(chat_id, None)
+            return
+        
+        if has_new:
+            subscriptions[chat_id].poll()
+            mark_chat_read(chat, user_id)
+        
+        cached = transcripts[chat_id] = render_transcript(chat, user_id, window)
     
-    for message in messages:
-        is_own_message = message['sender'] == user_id
-        display_message_bubble(message, is_own_message)
+    display_chat_messages_list(chat_id, cached)
+
+def mark_chat_read(chat, user_id):
+    """Mark messages from other participants as read"""
+    changed = False
+    for message in chat.get('messages', []):
+        if message['sender'] != user_id and not message.get('read'):
+            message['read'] = True
+            changed = True
+    
+    if changed:
+        save_record('chats', chat['id'], chat)
+    UNREAD.clear(user_id, chat['id'])
 
-def display_message_bubble(message, is_own_message):
-    """Display a single message bubble"""
-    col1, col2 = st.columns([1, 20])
+def render_transcript(chat, user_id, window):
+    """HTML for the most recent `window` messages, and whether earlier ones exist"""
+    messages = chat.get('messages', [])
+    bubbles = "".join(
+        render_message_bubble(message, message['sender'] == user_id)
+        for message in messages[-window:]
+    )
+    return {
+        'window': window,
+        'count': len(messages),
+        'has_earlier': len(messages) > window,
+        'html': MESSAGE_BUBBLE_STYLE + f'<div class="chat-transcript">{bubbles}</div>'
+    }
+
+def display_chat_messages_list(chat_id, transcript):
+    """Display the visible page of messages in chat as one HTML block"""
+    if not transcript['count']:
+        st.info("No messages yet. Start the conversation!")
+        return
     
-    if not is_own_message:
-        with col1:
-            sender = get_user_by_id(message['sender'])
-            st.write("👤")
+    # Only the most recent page of messages is rendered
+    if transcript['has_earlier']:
+        if st.button("⬆️ Load earlier messages", key=f"earlier_{chat_id}"):
+            st.session_state.chat_windows[chat_id] = transcript['window'] + MESSAGES_PER_PAGE
+            rerun_fragment()
     
-    with col2:
-        # Message bubble styling
-        bubble_style = """
-        <style>
-        .message-bubble {
-            padding: 10px 15px;
-            border-radius: 18px;
-            margin: 5px 0;
-            max-width: 80%;
-            word-wrap: break-word;
-            display: inline-block;
-        }
-        .own-message {
-            background-color: #007bff;
-            color: white;
-            margin-left: auto;
-            text-align: right;
-        }
-        .other-message {
-            background-color: #f1f1f1;
-            color: black;
-        }
-        </style>
-        """
-        st.markdown(bubble_style, unsafe_allow_html=True)
-        
-        bubble_class = "own-message" if is_own_message else "other-message"
-        
-        st.markdown(f"""
-        <div class="message-bubble {bubble_class}">
-            <div>{message['content']}</div>
-            <div style="font-size: 0.8em; opacity: 0.7; margin-top: 5px;">
-                {format_timestamp(message['timestamp'])}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(transcript['html'], unsafe_allow_html=True)
+
+def render_message_bubble(message, is_own_message):
+    """Render a single message bubble as HTML"""
+    row_class = "own-row" if is_own_message else "other-row"
+    bubble_class = "own-message" if is_own_message else "other-message"
+    avatar = "" if is_own_message else '<span class="message-avatar">👤</span>'
+    
+    return (
+        f'<div class="message-row {row_class}">{avatar}'
+        f'<div class="message-bubble {bubble_class}">'
+        f'<div>{html.escape(message["content"])}</div>'
+        f'<div class="message-time">{format_time(message["timestamp"])}</div>'
+        f'</div></div>'
+    )
 
 def message_input(chat_id):
     """Message input component"""
@@ -273,21 +371,17 @@ def message_input(chat_id):
 
 def send_message(chat_id, content):
     """Send a message in chat"""
-    chats = load_data('chats')
+    message = Message(
+        id=str(uuid.uuid4()),
+        sender=st.session_state.user['id'],
+        content=content,
+        timestamp=now_timestamp()
+    )
     
-    if chat_id in chats:
-        message = {
-            'id': str(uuid.uuid4()),
-            'sender': st.session_state.user['id'],
-            'content': content,
-            'timestamp': datetime.now().isoformat(),
-            'read': False
-        }
-        
-        chats[chat_id]['messages'].append(message)
-        chats[chat_id]['last_activity'] = datetime.now().isoformat()
-        save_data('chats', chats)
-        st.rerun()
+    chat = append_chat_message(chat_id, message)
+    if chat:
+        publish_chat_message(chat, message)
+        rerun_fragment()
 
 def display_chat_welcome():
     """Display welcome message when no chat is selected"""
@@ -300,12 +394,4 @@ def display_chat_welcome():
     - Messaging sellers from marketplace listings
     
     🔒 **Your messages are secure and private**
-    """)
-
-def format_timestamp(timestamp):
-    """Format timestamp for display"""
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        return dt.strftime("%I:%M %p")
-    except:
-        return timestamp
\ No newline at end of file
+    """)
\ No newline at end of file
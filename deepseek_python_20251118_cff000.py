@@ -1,7 +1,19 @@
 import streamlit as st
 import uuid
 from datetime import datetime, timedelta
-from database import load_data, save_data, get_user_by_id
+from database import load_data, save_data, get_user_by_id, get_record, rerun_fragment, add_member_or_wait, remove_member_and_promote, get_upcoming_events, get_past_events, batch_write
+from models import now_timestamp, to_timestamp, format_datetime, format_time
+from recurrence import make_rule, describe, next_occurrence
+from schedule import find_conflicts, week_agenda, add_commitment, remove_commitment, refresh_commitment
+from profiling import track_fragment
+
+# Repeat choices in the create form -> (frequency, interval)
+REPEAT_OPTIONS = {
+    "Never": (None, 1),
+    "Weekly": ('weekly', 1),
+    "Every 2 weeks": ('weekly', 2),
+    "Daily": ('daily', 1)
+}
 
 def events_page():
     """Events page"""
@@ -12,6 +24,15 @@ def events_page():
     with st.expander("➕ Create New Event", expanded=False):
         create_event_form()
     
+    # An event opened from another page (e.g. Home's "View Details")
+    view_event = st.session_state.get('view_event')
+    if view_event and get_record('events', view_event):
+        if st.button("⬅️ All events", key="close_view_event"):
+            del st.session_state.view_event
+            st.rerun()
+        display_event_card(view_event)
+        return
+    
     # View options
     view_option = st.radio("View:", ["Upcoming Events", "Past Events", "My RSVPs"], horizontal=True)
     
@@ -32,12 +53,16 @@ def create_event_form():
             title = st.text_input("Event Title")
             date = st.date_input("Date", min_value=datetime.now().date())
             time = st.time_input("Time")
+            duration = st.number_input("Duration (hours)", min_value=0.5, max_value=24.0, value=2.0, step=0.5)
             location = st.text_input("Location")
         
         with col2:
             max_attendees = st.number_input("Max Attendees", min_value=1, max_value=1000, value=50)
             club_id = st.selectbox("Hosting Club", get_user_clubs_options())
             tags = st.multiselect("Tags", ["Social", "Academic", "Workshop", "Sports", "Cultural", "Networking"])
+            repeats = st.selectbox("Repeats", list(REPEAT_OPTIONS))
+            until = st.date_input("Repeat until", value=None, min_value=datetime.now().date())
+            skip_dates = st.text_input("Skip dates", placeholder="YYYY-MM-DD, YYYY-MM-DD")
         
         description = st.text_area("Event Description", height=100,
                                  placeholder="Describe your event, what attendees can expect, and any requirements...")
@@ -50,11 +75,18 @@ def create_event_form():
                 # Combine date and time
                 event_datetime = datetime.combine(date, time)
                 
+                try:
+                    recurrence = build_recurrence(repeats, date, time, duration, until, skip_dates)
+                except ValueError:
+                    st.error("Skip dates must be written as YYYY-MM-DD")
+                    return
+                
                 new_event = {
                     'id': event_id,
                     'title': title,
                     'description': description,
-                    'date': event_datetime.isoformat(),
+                    'date': to_timestamp(event_datetime),
+                    'end_date': to_timestamp(event_datetime + timedelta(hours=duration)),
                     'time': time.strftime("%H:%M"),
                     'location': location,
                     'max_attendees': max_attendees,
@@ -62,16 +94,31 @@ def create_event_form():
                     'created_by': st.session_state.user['id'],
                     'rsvps': [st.session_state.user['id']],  # Creator auto-RSVPs
                     'tags': tags,
-                    'created_at': datetime.now().isoformat()
+                    'recurrence': recurrence,
+                    'created_at': now_timestamp()
                 }
                 
                 events[event_id] = new_event
                 save_data('events', events)
+                add_commitment(st.session_state.user['id'], 'event', events[event_id])
                 st.success(f"🎉 Event '{title}' created successfully!")
                 st.rerun()
             else:
                 st.error("Please fill in event title and description")
 
+def build_recurrence(repeats, date, time, duration, until, skip_dates):
+    """Recurrence rule for the create form, or None for a one-off event"""
+    freq, interval = REPEAT_OPTIONS[repeats]
+    if freq is None:
+        return None
+    
+    start = time.hour * 60 + time.minute
+    exceptions = [datetime.strptime(d.strip(), "%Y-%m-%d").date().isoformat() for d in skip_dates.split(",") if d.strip()]
+    weekdays = [date.weekday()] if freq == 'weekly' else None
+    return make_rule(freq, start, start + int(duration * 60), weekdays=weekdays, interval=interval,
+                     starts_on=date.isoformat(), until=until.isoformat() if until else None,
+                     exceptions=exceptions)
+
 def get_user_clubs_options():
     """Get clubs the user can create events for"""
     clubs = load_data('clubs')
@@ -86,49 +133,25 @@ def get_user_clubs_options():
 
 def display_upcoming_events():
     """Display upcoming events"""
-    events = load_data('events')
-    upcoming_events = []
-    
-    for event in events.values():
-        try:
-            event_date = datetime.fromisoformat(event['date'])
-            if event_date >= datetime.now():
-                upcoming_events.append(event)
-        except:
-            pass
+    upcoming_events = get_upcoming_events()
     
     if not upcoming_events:
         st.info("No upcoming events. Create the first one!")
         return
     
-    # Sort by date
-    upcoming_events.sort(key=lambda x: x.get('date', ''))
-    
     for event in upcoming_events:
-        display_event_card(event)
+        display_event_card(event['id'])
 
 def display_past_events():
     """Display past events"""
-    events = load_data('events')
-    past_events = []
-    
-    for event in events.values():
-        try:
-            event_date = datetime.fromisoformat(event['date'])
-            if event_date < datetime.now():
-                past_events.append(event)
-        except:
-            pass
+    past_events = get_past_events()
     
     if not past_events:
         st.info("No past events yet.")
         return
     
-    # Sort by date (most recent first)
-    past_events.sort(key=lambda x: x.get('date', ''), reverse=True)
-    
     for event in past_events:
-        display_event_card(event, is_past=True)
+        display_event_card(event['id'], is_past=True)
 
 def display_my_rsvps():
     """Display events user has RSVP'd to"""
@@ -137,21 +160,63 @@ def display_my_rsvps():
     user_id = st.session_state.user['id']
     
     for event in events.values():
-        if user_id in event.get('rsvps', []):
+        if user_id in event.get('rsvps', []) or user_id in event.get('waitlist', []):
             my_rsvps.append(event)
     
+    display_week_calendar(user_id)
+    
     if not my_rsvps:
         st.info("You haven't RSVP'd to any events yet.")
         return
     
-    # Sort by date
-    my_rsvps.sort(key=lambda x: x.get('date', ''))
+    # Sort by (next) date; finished events go last
+    now = now_timestamp()
+    my_rsvps.sort(key=lambda x: (next_occurrence(x, now) or (float('inf'),))[0] if x.get('recurrence') else x.get('date', 0))
     
     for event in my_rsvps:
-        display_event_card(event, show_rsvp_status=True)
+        display_event_card(event['id'], show_rsvp_status=True)
+
+def display_week_calendar(user_id):
+    """Weekly calendar of RSVP'd events and club meetings"""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_offset = st.session_state.get('calendar_week', 0)
+    week_start = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+    
+    col1, col2, col3 = st.columns([1, 3, 1])
+    with col1:
+        if st.button("◀ Previous", key="calendar_prev"):
+            st.session_state.calendar_week = week_offset - 1
+            st.rerun()
+    with col2:
+        st.write(f"**🗓️ Week of {week_start.strftime('%b %d, %Y')}**")
+    with col3:
+        if st.button("Next ▶", key="calendar_next"):
+            st.session_state.calendar_week = week_offset + 1
+            st.rerun()
+    
+    days = week_agenda(user_id, to_timestamp(week_start))
+    columns = st.columns(7)
+    
+    for offset, (column, entries) in enumerate(zip(columns, days)):
+        with column:
+            st.caption((week_start + timedelta(days=offset)).strftime("%a %d"))
+            for start, end, item in entries:
+                emoji = "📅" if item['type'] == 'event' else "👥"
+                st.write(f"{emoji} **{format_time(start)}**  \n{item['title']}")
+    
+    st.divider()
 
-def display_event_card(event, is_past=False, show_rsvp_status=False):
-    """Display a single event card"""
+@st.fragment
+@track_fragment("Events › card")
+def display_event_card(event_id, is_past=False, show_rsvp_status=False):
+    """Display a single event card.
+    
+    Runs as a fragment: RSVPs and cancellations re-render this card only.
+    """
+    event = get_record('events', event_id)
+    if not event:
+        return
+    
     with st.container():
         col1, col2 = st.columns([3, 1])
         
@@ -159,13 +224,17 @@ def display_event_card(event, is_past=False, show_rsvp_status=False):
             st.subheader(event['title'])
             
             # Event details
-            try:
-                event_date = datetime.fromisoformat(event['date'])
-                date_str = event_date.strftime("%b %d, %Y at %I:%M %p")
-            except:
-                date_str = "Date TBA"
+            occurrence = next_occurrence(event, now_timestamp()) if event.get('recurrence') else None
+            if occurrence:
+                date_str = f"{format_datetime(occurrence[0])} - {format_time(occurrence[1])}"
+            else:
+                date_str = format_datetime(event.get('date'), "Date TBA")
+                if event.get('end_date'):
+                    date_str += f" - {format_time(event['end_date'])}"
             
             st.write(f"**📅 When:** {date_str}")
+            if event.get('recurrence'):
+                st.caption(f"🔁 {describe(event['recurrence'])}")
             st.write(f"**📍 Where:** {event.get('location', 'TBA')}")
             
             # Tags
@@ -187,7 +256,10 @@ def display_event_card(event, is_past=False, show_rsvp_status=False):
             st.write(f"👥 {rsvp_count}/{max_attendees}")
             
             # RSVP button
-            user_rsvped = st.session_state.user['id'] in event.get('rsvps', [])
+            user_id = st.session_state.user['id']
+            user_rsvped = user_id in event.get('rsvps', [])
+            waitlist = event.get('waitlist', [])
+            waitlist_position = waitlist.position(user_id) if len(waitlist) else None
             
             if is_past:
                 st.info("🎉 Event ended")
@@ -196,48 +268,101 @@ def display_event_card(event, is_past=False, show_rsvp_status=False):
                     pass
                 if st.button("❌ Cancel", key=f"cancel_{event['id']}"):
                     cancel_rsvp(event['id'])
+            elif waitlist_position:
+                st.warning(f"⏳ Waitlist #{waitlist_position} of {len(waitlist)}")
+                if st.button("🚪 Leave waitlist", key=f"leave_waitlist_{event['id']}"):
+                    cancel_rsvp(event['id'])
             else:
-                if rsvp_count >= max_attendees:
-                    st.error("❌ Full")
+                if rsvp_count >= max_attendees or len(waitlist):
+                    st.error(f"❌ Full • {len(waitlist)} waiting")
+                    if st.button("⏳ Join waitlist", key=f"waitlist_{event['id']}"):
+                        rsvp_to_event(event['id'])
                 else:
                     if st.button("✋ RSVP", key=f"rsvp_{event['id']}"):
                         rsvp_to_event(event['id'])
             
             if show_rsvp_status and user_rsvped:
                 st.success("✅ You're going!")
+            
+            if occurrence and not is_past and event.get('created_by') == user_id:
+                if st.button("🚫 Skip next", key=f"skip_{event['id']}"):
+                    skip_occurrence(event['id'], occurrence[0])
+        
+        # Pending RSVP that clashes with the user's schedule
+        conflicts = st.session_state.get('rsvp_conflicts', {}).get(event['id'])
+        if conflicts:
+            st.warning("⚠️ This overlaps with: " + "; ".join(
+                f"{item['title']} ({format_datetime(start)})" for start, _, item in conflicts
+            ))
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✋ RSVP anyway", key=f"rsvp_anyway_{event['id']}"):
+                    st.session_state.rsvp_conflicts.pop(event['id'], None)
+                    rsvp_to_event(event['id'], check_conflicts=False)
+            with col2:
+                if st.button("Never mind", key=f"rsvp_skip_{event['id']}"):
+                    st.session_state.rsvp_conflicts.pop(event['id'], None)
+                    rerun_fragment()
         
         st.divider()
 
-def rsvp_to_event(event_id):
-    """RSVP to an event"""
-    events = load_data('events')
+def rsvp_to_event(event_id, check_conflicts=True):
+    """RSVP to an event, joining the waitlist if it is full"""
+    event = get_record('events', event_id)
     
-    if event_id in events:
-        event = events[event_id]
+    if event:
         user_id = st.session_state.user['id']
         
-        if user_id not in event.get('rsvps', []):
-            if len(event.get('rsvps', [])) >= event.get('max_attendees', 50):
-                st.error("❌ Event is full!")
+        if check_conflicts:
+            conflicts = find_conflicts(user_id, event)
+            if conflicts:
+                st.session_state.setdefault('rsvp_conflicts', {})[event_id] = conflicts
+                rerun_fragment()
                 return
-                
-            event['rsvps'] = event.get('rsvps', []) + [user_id]
-            events[event_id] = event
-            save_data('events', events)
+        
+        result = add_member_or_wait('events', event_id, user_id, 'rsvps', 'waitlist',
+                                    limit=event.get('max_attendees', 50))
+        
+        if result == 'waitlisted':
+            st.info(f"⏳ Event is full - you're #{event['waitlist'].position(user_id)} on the waitlist")
+            rerun_fragment()
+        elif result == 'added':
+            add_commitment(user_id, 'event', event)
             st.success("🎉 You're going!")
-            st.rerun()
+            rerun_fragment()
+
+def skip_occurrence(event_id, start):
+    """Add one occurrence of a recurring event to its exceptions"""
+    with batch_write('events'):
+        event = get_record('events', event_id)
+        if not event or not event.get('recurrence'):
+            return
+        skipped = datetime.fromtimestamp(start).date().isoformat()
+        rule = dict(event['recurrence'])
+        rule['exceptions'] = sorted(set(rule.get('exceptions', [])) | {skipped})
+        event['recurrence'] = rule
+    refresh_commitment('event', event, event['rsvps'])
+    
+    st.info(f"🚫 Skipped {format_datetime(start)}")
+    rerun_fragment()
 
 def cancel_rsvp(event_id):
-    """Cancel RSVP to an event"""
-    events = load_data('events')
+    """Cancel an RSVP or leave the waitlist, promoting the next waiter"""
+    event = get_record('events', event_id)
+    if not event:
+        return
     
-    if event_id in events:
-        event = events[event_id]
-        user_id = st.session_state.user['id']
-        
-        if user_id in event.get('rsvps', []):
-            event['rsvps'] = [r for r in event.get('rsvps', []) if r != user_id]
-            events[event_id] = event
-            save_data('events', events)
-            st.info("👋 RSVP cancelled")
-            st.rerun()
\ No newline at end of file
+    user_id = st.session_state.user['id']
+    result, promoted = remove_member_and_promote('events', event_id, user_id, 'rsvps', 'waitlist',
+                                                 limit=event.get('max_attendees', 50))
+    
+    for promoted_id in promoted:
+        add_commitment(promoted_id, 'event', event)
+    
+    if result == 'removed':
+        remove_commitment(user_id, 'event', event_id)
+        st.info("👋 RSVP cancelled")
+        rerun_fragment()
+    elif result == 'left_queue':
+        st.info("👋 Left the waitlist")
+        rerun_fragment()
\ No newline at end of file
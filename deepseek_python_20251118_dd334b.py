@@ -1,6 +1,6 @@
 import streamlit as st
-from datetime import datetime
 from database import load_data, save_data
+from models import format_long_date
 
 def profile_page():
     """User profile page"""
@@ -12,8 +12,8 @@ def profile_page():
     
     with col1:
         st.image("https://cdn-icons-png.flaticon.com/512/3135/3135715.png", width=150)
-        st.write(f"**Member since:** {format_date(user.get('joined_date', ''))}")
-        st.write(f"**Last login:** {format_date(user.get('last_login', ''))}")
+        st.write(f"**Member since:** {format_long_date(user.get('joined_date'))}")
+        st.write(f"**Last login:** {format_long_date(user.get('last_login'))}")
         
     with col2:
         st.subheader(user['name'])
@@ -52,7 +52,7 @@ def display_user_activity():
     
     with col3:
         marketplace = load_data('marketplace')
-        user_listings = sum(1 for listing in marketplace.values() if listing.get('seller_id') == st.session_state.user['id'])
+        user_listings = sum(1 for listing in list(marketplace.values()) if listing.get('seller_id') == st.session_state.user['id'])
         st.metric("Listings", user_listings)
     
     with col4:
@@ -97,12 +97,4 @@ def edit_profile_form():
             st.session_state.user = user
             
             st.success("✅ Profile updated successfully!")
-            st.rerun()
-
-def format_date(date_str):
-    """Format date for display"""
-    try:
-        dt = datetime.fromisoformat(date_str)
-        return dt.strftime("%B %d, %Y")
-    except:
-        return "Unknown"
\ No newline at end of file
+            st.rerun()
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import csv
+import json
+import time
+from dataclasses import fields
+from datetime import datetime
+
+from database import load_data
+from models import MODELS, Message, IdSet, IdQueue, Record
+
+# Where export files are written
+EXPORT_DIR_ENV = 'CAMPUS_EXPORT_DIR'
+DEFAULT_EXPORT_DIR = 'exports'
+
+EXPORT_FORMATS = {
+    'CSV': 'csv',
+    'JSONL': 'jsonl',
+    'Parquet': 'parquet'
+}
+
+# Rows buffered per Parquet row group; the only rows held in memory at once
+PARQUET_BATCH_ROWS = 5000
+
+# Largest export offered as a browser download; the download is read into memory
+DOWNLOAD_MAX_BYTES = 50 * 1024 * 1024
+
+# Never leave the server
+REDACTED_FIELDS = ('password',)
+
+# Collection -> field the date range filters on
+DATE_FIELDS = {
+    'users': 'joined_date',
+    'clubs': 'created_at',
+    'events': 'date',
+    'marketplace': 'created_at',
+    'confessions': 'created_at',
+    'chats': 'created_at',
+    'messages': 'timestamp',
+    'announcements': 'timestamp',
+    'reports': 'created_at',
+    'admin_logs': 'timestamp'
+}
+
+STATUS_OPTIONS = {
+    'marketplace': ['available', 'sold'],
+    'confessions': ['pending', 'approved', 'rejected'],
+    'reports': ['pending', 'resolved', 'dismissed']
+}
+
+# Chat messages are exported as their own collection, one row per message
+EXCLUDED_FIELDS = {
+    'chats': ('messages',),
+    'confessions': ('comments',)
+}
+
+EXPORT_COLLECTIONS = list(DATE_FIELDS)
+
+def export_dir():
+    return os.environ.get(EXPORT_DIR_ENV, DEFAULT_EXPORT_DIR)
+
+def export_columns(collection):
+    """(name, type) of each exported column, in order"""
+    model = Message if collection == 'messages' else MODELS[collection]
+    skipped = set(REDACTED_FIELDS) | set(EXCLUDED_FIELDS.get(collection, ()))
+    # User id fields hold interned ints but read back as uuid strings
+    columns = [(f.name, str if f.name in model.USER_ID_FIELDS else f.type)
+               for f in fields(model) if f.name not in skipped]
+    if collection == 'messages':
+        columns.insert(0, ('chat_id', str))
+    return columns
+
+def plain(value):
+    """JSON-serializable copy of a field value"""
+    if isinstance(value, (IdSet, IdQueue)):
+        return list(value)
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [plain(v) for v in value]
+    return value
+
+def iter_records(collection):
+    """Yield the records of a collection (or every chat message) one at a time.
+    
+    Only the list of references is snapshotted, so writers adding records
+    while an export runs cannot break iteration.
+    """
+    if collection == 'messages':
+        for chat in list(load_data('chats').values()):
+            for message in list(chat['messages']):
+                yield chat['id'], message
+        return
+    
+    data = load_data(collection)
+    for record in list(data.values() if isinstance(data, dict) else data):
+        yield None, record
+
+def iter_rows(collection, columns, start=None, end=None, statuses=None):
+    """Filtered, redacted rows as dicts, one per record"""
+    date_field = DATE_FIELDS.get(collection)
+    names = [name for name, _ in columns]
+    
+    for chat_id, record in iter_records(collection):
+        if start is not None or end is not None:
+            when = record.get(date_field)
+            if when is None or (start is not None and when < start) or (end is not None and when >= end):
+                continue
+        if statuses and record.get('status') not in statuses:
+            continue
+        
+        row = {name: plain(record.get(name)) for name in names if name != 'chat_id'}
+        if chat_id is not None:
+            row['chat_id'] = chat_id
+        yield row
+
+def flat(value):
+    """Scalar for a tabular cell; nested values become JSON text"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+def write_csv(rows, columns, path):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=[name for name, _ in columns])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: flat(value) for key, value in row.items()})
+            yield
+
+def write_jsonl(rows, columns, path):
+    with open(path, 'w', encoding='utf-8') as fh:
+        for row in rows:
+            fh.write(json.dumps(row, default=str))
+            fh.write('\n')
+            yield
+
+def parquet_schema(columns):
+    import pyarrow as pa
+    
+    types = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    # Lists, sets and rules are stored as JSON text
+    return pa.schema([(name, types.get(kind, pa.string())) for name, kind in columns])
+
+def write_parquet(rows, columns, path):
+    import pyarrow.parquet as pq
+    
+    schema = parquet_schema(columns)
+    names = [name for name, _ in columns]
+    batch = []
+    
+    with pq.ParquetWriter(path, schema) as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == PARQUET_BATCH_ROWS:
+                writer.write_table(parquet_table(batch, names, schema))
+                batch = []
+            yield
+        if batch:
+            writer.write_table(parquet_table(batch, names, schema))
+
+def parquet_cell(value, kind):
+    value = flat(value)
+    if kind == 'string' and value is not None and not isinstance(value, str):
+        return str(value)
+    return value
+
+def parquet_table(batch, names, schema):
+    import pyarrow as pa
+    
+    arrays = {}
+    for name in names:
+        kind = schema.field(name).type
+        arrays[name] = pa.array([parquet_cell(row.get(name), str(kind)) for row in batch], type=kind)
+    return pa.table(arrays, schema=schema)
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'parquet': write_parquet
+}
+
+def export_collection(collection, fmt, start=None, end=None, statuses=None, directory=None, progress=None):
+    """Stream a collection to a CSV, JSONL or Parquet file.
+    
+    Records flow through generators (read -> filter/redact -> write) so only
+    the current row (or one Parquet row group) is in memory, whatever the
+    collection size. start/end are epoch seconds on the collection's date
+    field. progress, if given, is called with the row count every 1000 rows.
+    Returns the path, row count, duration, rows per second and file size. A
+    failed export removes its partial file and re-raises.
+    """
+    directory = directory or export_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{collection}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{fmt}")
+    
+    columns = export_columns(collection)
+    rows = iter_rows(collection, columns, start, end, set(statuses) if statuses else None)
+    
+    started = time.perf_counter()
+    count = 0
+    try:
+        for _ in WRITERS[fmt](rows, columns, path):
+            count += 1
+            if progress and count % 1000 == 0:
+                progress(count)
+    except BaseException:
+        # Never leave a half-written file behind
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    duration = time.perf_counter() - started
+    
+    return {
+        'path': path,
+        'rows': count,
+        'seconds': duration,
+        'rows_per_second': count / duration if duration > 0 else float(count),
+        'bytes': os.path.getsize(path)
+    }
\ No newline at end of file
@@ -0,0 +1,180 @@
+import time
+import threading
+import numpy as np
+from scipy import sparse
+
+from database import load_data
+from models import USER_IDS
+from recommendations import concepts
+
+# Seconds between batch recomputations of suggestions
+FRIENDS_REFRESH_SECONDS = 15 * 60
+
+# Suggestions kept per user
+FRIENDS_TOP_K = 20
+
+# Users scored per block; bounds the sparse co-membership product held at once
+BLOCK_SIZE = 512
+
+# Co-members per user re-ranked on interests, branch and year
+CANDIDATES_PER_USER = 200
+
+# Weight of each shared signal in a candidate's score
+FRIEND_WEIGHTS = {
+    'clubs': 3.0,
+    'events': 1.0,
+    'interests': 1.0,
+    'branch': 2.0,
+    'year': 1.0
+}
+
+class FriendSuggestions:
+    """Top-k people-you-may-know per user, recomputed in batch"""
+    
+    def __init__(self):
+        self.candidates = {}
+        self.computed_at = None
+        self.duration = None
+        self.users = 0
+        self._lock = threading.Lock()
+    
+    def get(self, user_id):
+        """Suggestions for a user: dicts with user_id, score and shared counts"""
+        return self.candidates.get(user_id, [])
+    
+    def publish(self, candidates, users, duration):
+        with self._lock:
+            self.candidates = candidates
+            self.users = users
+            self.duration = duration
+            self.computed_at = time.time()
+
+SUGGESTIONS = FriendSuggestions()
+
+def incidence(records, field, row_of, n):
+    """Sparse users x records matrix from each record's IdSet field"""
+    rows, cols = [], []
+    for col, record in enumerate(records):
+        ids = np.frombuffer(record[field].ids, dtype=np.uint32)
+        # Ids interned after row_of was built, or not belonging to a user, are skipped
+        ids = ids[ids < len(row_of)]
+        members = row_of[ids]
+        members = members[members >= 0]
+        rows.append(members)
+        cols.append(np.full(len(members), col))
+    rows = np.concatenate(rows) if rows else np.empty(0, np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, np.int64)
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n, len(records)))
+
+def one_hot(values):
+    """Sparse users x distinct-values matrix for a list of value sets"""
+    vocabulary = {}
+    rows, cols = [], []
+    for row, items in enumerate(values):
+        for item in items:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(item, len(vocabulary)))
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(values), len(vocabulary)))
+
+def codes(values):
+    """Integer code per user for a single-valued attribute, -1 where unset"""
+    vocabulary = {}
+    return np.array([vocabulary.setdefault(value, len(vocabulary)) if value else -1 for value in values],
+                    dtype=np.int64)
+
+def shared_counts(matrix, left, right):
+    """Features shared by each (left[i], right[i]) pair of rows"""
+    return np.asarray(matrix[left].multiply(matrix[right]).sum(axis=1)).ravel()
+
+def top_candidates(block, block_start, limit):
+    """(row, other) pairs of the strongest co-members in each row of a sparse block"""
+    lengths = np.diff(block.indptr)
+    left = np.repeat(np.arange(block.shape[0]) + block_start, lengths)
+    right = block.indices.astype(np.int64)
+    weights = block.data
+    
+    # Rows over the limit keep only their strongest entries
+    keep = np.ones(len(right), dtype=bool)
+    for row in np.flatnonzero(lengths > limit):
+        begin, end = block.indptr[row], block.indptr[row + 1]
+        keep[begin:end] = False
+        keep[begin + np.argpartition(-weights[begin:end], limit)[:limit + 1]] = True
+    
+    # Never suggest yourself
+    keep &= left != right
+    return left[keep], right[keep]
+
+def compute_friend_suggestions(top_k=FRIENDS_TOP_K):
+    """Batch job: suggest co-members of clubs and events, ranked by every shared signal.
+    
+    Clubs and events are sparse users x records incidence matrices, and their
+    co-membership products are taken one block of users at a time and kept
+    sparse, so the cost follows the number of co-member pairs rather
+    than users squared. The strongest CANDIDATES_PER_USER co-members of each
+    user are then scored on clubs, events, interests, branch and year, and
+    the top_k are kept. Users who share no club or event get no suggestions.
+    """
+    start = time.time()
+    users = list(load_data('users').values())
+    user_ids = [user['id'] for user in users]
+    n = len(user_ids)
+    
+    # Interned id -> row in this batch
+    interned = [USER_IDS.intern(user_id) for user_id in user_ids]
+    row_of = np.full(len(USER_IDS), -1, dtype=np.int64)
+    row_of[interned] = np.arange(n)
+    
+    clubs = incidence(list(load_data('clubs').values()), 'members', row_of, n)
+    events = incidence(list(load_data('events').values()), 'rsvps', row_of, n)
+    interests = one_hot([concepts(user.get('interests', [])) for user in users])
+    branch = codes([user['branch'].strip().lower() if user.get('branch') else None for user in users])
+    year = codes([user.get('year') for user in users])
+    
+    clubs_t = clubs.T.tocsr()
+    events_t = events.T.tocsr()
+    
+    candidates = {}
+    if top_k <= 0:
+        SUGGESTIONS.publish(candidates, n, time.time() - start)
+        return n
+    
+    for block_start in range(0, n, BLOCK_SIZE):
+        block_end = min(block_start + BLOCK_SIZE, n)
+        shared_clubs = (clubs[block_start:block_end] @ clubs_t).tocsr()
+        shared_events = (events[block_start:block_end] @ events_t).tocsr()
+        # Sorted indices make the per-pair lookups below a binary search
+        shared_clubs.sort_indices()
+        shared_events.sort_indices()
+        co_members = (FRIEND_WEIGHTS['clubs'] * shared_clubs + FRIEND_WEIGHTS['events'] * shared_events).tocsr()
+        left, right = top_candidates(co_members, block_start, CANDIDATES_PER_USER)
+        if not len(left):
+            continue
+        
+        shared = {
+            'clubs': np.asarray(shared_clubs[left - block_start, right]).ravel(),
+            'events': np.asarray(shared_events[left - block_start, right]).ravel(),
+            'interests': shared_counts(interests, left, right),
+            'branch': (branch[left] == branch[right]) & (branch[left] >= 0),
+            'year': (year[left] == year[right]) & (year[left] >= 0)
+        }
+        score = sum(FRIEND_WEIGHTS[name] * counts for name, counts in shared.items())
+        
+        # Pairs are grouped by user; order each group by score and keep top_k
+        order = np.lexsort((-score, left))
+        bounds = np.flatnonzero(np.diff(left[order])) + 1
+        for group in np.split(order, bounds):
+            candidates[user_ids[left[group[0]]]] = [
+                {
+                    'user_id': user_ids[right[pair]],
+                    'score': float(score[pair]),
+                    **{name: int(shared[name][pair]) for name in ('clubs', 'events', 'interests')},
+                    'same_branch': bool(shared['branch'][pair]),
+                    'same_year': bool(shared['year'][pair])
+                }
+                for pair in group[:top_k]
+            ]
+    
+    SUGGESTIONS.publish(candidates, n, time.time() - start)
+    return n
\ No newline at end of file
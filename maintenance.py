@@ -0,0 +1,122 @@
+import os
+from database import (
+    load_data, bump_collection_version, batch_write, get_upcoming_events, get_past_events,
+    get_home_stats
+)
+from models import now_timestamp
+from scheduler import SCHEDULER
+from votes import VOTES, VOTE_FLUSH_SECONDS
+from ranking import rescore_feeds, RESCORE_SECONDS
+from friends import compute_friend_suggestions, FRIENDS_REFRESH_SECONDS
+from analytics import update_rollups, ROLLUP_SECONDS
+from storage_metrics import write_metrics_file, METRICS_FILE_ENV, METRICS_FILE_SECONDS
+from memory_usage import sample_memory, MEMORY_SAMPLE_SECONDS
+
+DAY = 24 * 3600
+
+# Retention settings
+SOLD_LISTING_TTL_DAYS = 30
+ADMIN_LOG_RETENTION_DAYS = 90
+ADMIN_LOG_MAX_ENTRIES = 10000
+DORMANT_CHAT_DAYS = 180
+
+def refresh_event_views():
+    """Recompute the upcoming/past event split for the current minute"""
+    get_upcoming_events()
+    get_past_events()
+
+def refresh_aggregates():
+    """Recompute shared aggregates so sessions read them from the view cache"""
+    get_home_stats()
+
+def expire_sold_listings():
+    """Remove listings that were marked sold more than SOLD_LISTING_TTL_DAYS ago"""
+    marketplace = load_data('marketplace')
+    cutoff = now_timestamp() - SOLD_LISTING_TTL_DAYS * DAY
+    
+    def expired(listing):
+        return (listing.get('status') == 'sold'
+                and listing.get('sold_at', listing.get('created_at', 0)) < cutoff)
+    
+    candidates = [listing_id for listing_id, listing in list(marketplace.items()) if expired(listing)]
+    if not candidates:
+        return 0
+    
+    # Re-check under the lock: a listing may have been relisted since the scan
+    removed = 0
+    with batch_write('marketplace'):
+        for listing_id in candidates:
+            listing = marketplace.get(listing_id)
+            if listing is not None and expired(listing):
+                del marketplace[listing_id]
+                removed += 1
+    return removed
+
+def prune_admin_logs():
+    """Drop admin logs past the retention window or over the entry cap"""
+    logs = load_data('admin_logs')
+    cutoff = now_timestamp() - ADMIN_LOG_RETENTION_DAYS * DAY
+    
+    # Logs are appended in time order, so old entries are at the front
+    stale = 0
+    for log in logs:
+        if log.get('timestamp', 0) >= cutoff:
+            break
+        stale += 1
+    stale = max(stale, len(logs) - ADMIN_LOG_MAX_ENTRIES)
+    
+    if stale > 0:
+        # Delete in place so concurrent appends are not lost
+        del logs[:stale]
+        bump_collection_version('admin_logs')
+    return max(stale, 0)
+
+def archive_dormant_chats():
+    """Move chats with no activity for DORMANT_CHAT_DAYS to the archive"""
+    chats = load_data('chats')
+    archive = load_data('archived_chats')
+    cutoff = now_timestamp() - DORMANT_CHAT_DAYS * DAY
+    
+    def dormant(chat):
+        return chat.get('last_activity', chat.get('created_at', 0)) < cutoff
+    
+    candidates = [chat_id for chat_id, chat in list(chats.items()) if dormant(chat)]
+    if not candidates:
+        return 0
+    
+    # Re-check under the lock: a message sent since the scan keeps the chat live
+    archived = 0
+    with batch_write('chats', 'archived_chats'):
+        for chat_id in candidates:
+            chat = chats.get(chat_id)
+            if chat is not None and dormant(chat):
+                archive[chat_id] = chats.pop(chat_id)
+                archived += 1
+    return archived
+
+def register_maintenance_jobs(scheduler=SCHEDULER):
+    """Register housekeeping jobs with the scheduler"""
+    scheduler.add_periodic("refresh_event_views", refresh_event_views, interval=30,
+                           description="Split upcoming and past events for the current minute")
+    scheduler.add_periodic("refresh_aggregates", refresh_aggregates, interval=60,
+                           description="Recompute home stats")
+    scheduler.add_periodic("rescore_feeds", rescore_feeds, interval=RESCORE_SECONDS,
+                           description="Re-apply time decay to confession and announcement rankings")
+    scheduler.add_periodic("flush_votes", VOTES.flush, interval=VOTE_FLUSH_SECONDS,
+                           description="Write buffered confession vote counts to the store")
+    scheduler.add_periodic("compute_friend_suggestions", compute_friend_suggestions, interval=FRIENDS_REFRESH_SECONDS,
+                           description="Score people-you-may-know from shared clubs, events and interests")
+    scheduler.add_periodic("update_rollups", update_rollups, interval=ROLLUP_SECONDS, initial_delay=30,
+                           description="Recount recent days of the daily analytics rollups")
+    if os.environ.get(METRICS_FILE_ENV):
+        scheduler.add_periodic("write_storage_metrics", write_metrics_file, interval=METRICS_FILE_SECONDS,
+                               description="Write storage metrics in Prometheus text format")
+    scheduler.add_periodic("sample_memory", sample_memory, interval=MEMORY_SAMPLE_SECONDS, initial_delay=45,
+                           description="Estimate memory per collection and check soft limits")
+    scheduler.add_periodic("expire_sold_listings", expire_sold_listings, interval=3600, initial_delay=60,
+                           description=f"Remove listings sold more than {SOLD_LISTING_TTL_DAYS} days ago")
+    scheduler.add_periodic("prune_admin_logs", prune_admin_logs, interval=3600, initial_delay=120,
+                           description=f"Keep {ADMIN_LOG_RETENTION_DAYS} days / {ADMIN_LOG_MAX_ENTRIES} admin log entries")
+    scheduler.add_periodic("archive_dormant_chats", archive_dormant_chats, interval=6 * 3600, initial_delay=180,
+                           description=f"Archive chats idle for {DORMANT_CHAT_DAYS} days")
+    return scheduler
\ No newline at end of file
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import random
+import heapq
+import threading
+from collections import deque
+
+import pandas as pd
+
+from database import DATA_STORE, estimate_size
+from models import IdSet, IdQueue
+
+# Seconds between memory samples
+MEMORY_SAMPLE_SECONDS = 5 * 60
+
+# Samples kept for growth rates (24 hours at the default interval)
+MEMORY_HISTORY = 288
+
+# Growth is the least-squares slope over this many recent samples
+GROWTH_WINDOW = 12
+
+# Records deep-measured per collection; the collection total is extrapolated
+SAMPLE_RECORDS = 200
+
+# Largest records reported per collection
+TOP_RECORDS = 5
+
+MB = 1024 * 1024
+
+# Collection -> soft limit in bytes. Override with MEMORY_SOFT_LIMITS, a JSON
+# object of collection (or "total") -> megabytes.
+SOFT_LIMITS_ENV = 'MEMORY_SOFT_LIMITS'
+DEFAULT_SOFT_LIMITS = {
+    'chats': 512 * MB,
+    'archived_chats': 512 * MB,
+    'confessions': 128 * MB,
+    'admin_logs': 64 * MB,
+    'total': 1024 * MB
+}
+
+def soft_limits():
+    """Soft limits in bytes, with any configured overrides applied"""
+    limits = dict(DEFAULT_SOFT_LIMITS)
+    configured = os.environ.get(SOFT_LIMITS_ENV)
+    if configured:
+        try:
+            limits.update({name: int(float(mb) * MB) for name, mb in json.loads(configured).items()})
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return limits
+
+def record_weight(record):
+    """Cheap size proxy: number of items in the record's list and set fields"""
+    weight = 1
+    for cls in type(record).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            value = getattr(record, name, None)
+            if isinstance(value, (list, IdSet, IdQueue)):
+                weight += len(value)
+    return weight
+
+def measure_collection(data):
+    """Estimated bytes of a collection plus its largest records.
+    
+    The largest records are found with record_weight (item counts, no deep
+    walk) and measured exactly, so one huge chat is not averaged away. Up to
+    SAMPLE_RECORDS of the rest are deep-measured and their mean is scaled to
+    the remaining records; the sample is seeded by the record count so an
+    unchanged collection measures the same every time. One seen-set is shared
+    across everything measured, so interned ids, shared tag strings and other
+    objects referenced from many records are counted once, not per record.
+    """
+    keyed = data.items() if isinstance(data, dict) else enumerate(data)
+    items = list(keyed)
+    count = len(items)
+    container = sys.getsizeof(data)
+    if not count:
+        return {'records': 0, 'bytes': container, 'bytes_per_record': 0, 'top': []}
+    
+    seen = set()
+    
+    def measure(key, record):
+        # Dict keys (record ids) are part of the collection's footprint too
+        return estimate_size(record, seen) + (estimate_size(key, seen) if isinstance(data, dict) else 0)
+    
+    heaviest = heapq.nlargest(TOP_RECORDS, items, key=lambda item: record_weight(item[1]))
+    top = [
+        {'id': str(getattr(record, 'id', None) or key), 'bytes': measure(key, record), 'items': record_weight(record)}
+        for key, record in heaviest
+    ]
+    
+    measured = {id(record) for _, record in heaviest}
+    rest = [item for item in items if id(item[1]) not in measured]
+    sample = rest if len(rest) <= SAMPLE_RECORDS else random.Random(count).sample(rest, SAMPLE_RECORDS)
+    per_record = sum(measure(key, record) for key, record in sample) / len(sample) if sample else 0
+    
+    total = container + sum(entry['bytes'] for entry in top) + per_record * len(rest)
+    return {
+        'records': count,
+        'bytes': int(total),
+        'bytes_per_record': int(total / count),
+        'top': sorted(top, key=lambda entry: entry['bytes'], reverse=True)
+    }
+
+def slope(points):
+    """Least-squares slope of (x, y) points, or None for fewer than two"""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+class MemoryAccountant:
+    """Periodic per-collection size estimates, growth rates and soft-limit warnings"""
+    
+    def __init__(self):
+        self.history = deque(maxlen=MEMORY_HISTORY)
+        self.latest = None
+        self.warnings = []
+        self._lock = threading.Lock()
+    
+    def sample(self):
+        """Measure every collection and record a snapshot; returns the total bytes"""
+        start = time.time()
+        collections = {name: measure_collection(data) for name, data in list(DATA_STORE.items())}
+        snapshot = {
+            'at': start,
+            'collections': collections,
+            'total': sum(entry['bytes'] for entry in collections.values()),
+            'duration': time.time() - start
+        }
+        
+        with self._lock:
+            self.history.append({
+                'at': snapshot['at'],
+                'total': snapshot['total'],
+                **{name: entry['bytes'] for name, entry in collections.items()}
+            })
+            self.latest = snapshot
+            self.warnings = self._check_limits(snapshot)
+        return snapshot['total']
+    
+    def _growth(self, name):
+        points = [(entry['at'] / 3600, entry[name]) for entry in list(self.history)[-GROWTH_WINDOW:] if name in entry]
+        return slope(points)
+    
+    def growth(self, name):
+        """Bytes per hour over the recent samples, for a collection or 'total'"""
+        with self._lock:
+            return self._growth(name)
+    
+    def _check_limits(self, snapshot):
+        warnings = []
+        sizes = {name: entry['bytes'] for name, entry in snapshot['collections'].items()}
+        sizes['total'] = snapshot['total']
+        for name, limit in soft_limits().items():
+            size = sizes.get(name)
+            if size is None:
+                continue
+            if size >= limit:
+                warnings.append(f"{name} is {size / MB:,.1f} MB, over its {limit / MB:,.0f} MB soft limit")
+                continue
+            # Also warn when current growth would cross the limit within a day
+            rate = self._growth(name)
+            if rate and rate > 0 and (limit - size) / rate < 24:
+                warnings.append(f"{name} grows {rate / MB:,.1f} MB/h and will reach its "
+                                f"{limit / MB:,.0f} MB soft limit in {(limit - size) / rate:,.1f} h")
+        return warnings
+    
+    def report(self):
+        """Per-collection rows from the latest snapshot, largest first"""
+        snapshot = self.latest
+        if snapshot is None:
+            return []
+        limits = soft_limits()
+        rows = []
+        for name, entry in snapshot['collections'].items():
+            rows.append({
+                'collection': name,
+                'records': entry['records'],
+                'bytes': entry['bytes'],
+                'bytes_per_record': entry['bytes_per_record'],
+                'growth_per_hour': self.growth(name),
+                'limit': limits.get(name),
+                'top': entry['top']
+            })
+        return sorted(rows, key=lambda row: row['bytes'], reverse=True)
+    
+    def history_frame(self, names):
+        """MB over time for the given collections (or 'total'), indexed by sample time"""
+        with self._lock:
+            history = list(self.history)
+        frame = pd.DataFrame(
+            [{name: entry.get(name, 0) / MB for name in names} for entry in history],
+            index=pd.to_datetime([entry['at'] for entry in history], unit='s'),
+            columns=names
+        )
+        return frame
+
+MEMORY = MemoryAccountant()
+
+def sample_memory():
+    """Background job entry point"""
+    return MEMORY.sample()
\ No newline at end of file
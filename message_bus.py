@@ -0,0 +1,165 @@
+import threading
+import weakref
+from collections import deque
+
+from database import load_data
+
+# Messages kept per topic so late subscribers can catch up without a store read
+TOPIC_BACKLOG = 100
+
+class Subscription:
+    """A subscriber's position in one topic"""
+    
+    def __init__(self, bus, topic):
+        self.bus = bus
+        self.topic = topic
+        self.seen = bus.sequence(topic)
+        self.event = threading.Event()
+    
+    def has_new(self):
+        """Check for unseen messages without consuming them"""
+        return self.bus.sequence(self.topic) != self.seen
+    
+    def poll(self):
+        """Return messages published since the last poll.
+        
+        Returns None if the subscriber fell behind the topic backlog and
+        should reload from the store instead.
+        """
+        self.event.clear()
+        messages, sequence = self.bus.since(self.topic, self.seen)
+        self.seen = sequence
+        return messages
+    
+    def wait(self, timeout=None):
+        """Block until a message arrives or the timeout expires"""
+        if self.has_new():
+            return True
+        return self.event.wait(timeout)
+    
+    def close(self):
+        """Stop receiving notifications"""
+        self.bus.unsubscribe(self)
+
+class MessageBus:
+    """In-process publish/subscribe hub shared by all sessions"""
+    
+    def __init__(self, backlog=TOPIC_BACKLOG):
+        self.backlog = backlog
+        self._lock = threading.Lock()
+        self._sequences = {}
+        self._recent = {}
+        self._subscribers = {}
+    
+    def subscribe(self, topic):
+        """Subscribe to a topic.
+        
+        Subscribers are held weakly, so a session that goes away without
+        unsubscribing is dropped once its subscription is garbage collected.
+        """
+        subscription = Subscription(self, topic)
+        with self._lock:
+            self._subscribers.setdefault(topic, weakref.WeakSet()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Remove a subscription"""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+    
+    def publish(self, topic, payload):
+        """Publish a message and wake the topic's subscribers"""
+        with self._lock:
+            sequence = self._sequences.get(topic, 0) + 1
+            self._sequences[topic] = sequence
+            self._recent.setdefault(topic, deque(maxlen=self.backlog)).append((sequence, payload))
+            subscribers = list(self._subscribers.get(topic, ()))
+        
+        for subscription in subscribers:
+            subscription.event.set()
+        return sequence
+    
+    def sequence(self, topic):
+        """Latest sequence number published on a topic"""
+        return self._sequences.get(topic, 0)
+    
+    def since(self, topic, seen):
+        """Messages on a topic after a sequence number"""
+        with self._lock:
+            sequence = self._sequences.get(topic, 0)
+            recent = list(self._recent.get(topic, ()))
+        
+        if sequence == seen:
+            return [], sequence
+        if recent and recent[0][0] > seen + 1:
+            return None, sequence
+        return [payload for seq, payload in recent if seq > seen], sequence
+
+class UnreadCounters:
+    """Per-user unread message counts, maintained incrementally"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+    
+    def _load(self, user_id):
+        """Count a user's unread messages from the store once"""
+        counts = {}
+        for chat_id, chat in list(load_data('chats').items()):
+            if user_id not in chat.get('participants', []):
+                continue
+            unread = sum(
+                1 for message in chat.get('messages', [])
+                if message.get('sender') != user_id and not message.get('read')
+            )
+            if unread:
+                counts[chat_id] = unread
+        return counts
+    
+    def _user_counts(self, user_id):
+        if user_id not in self._counts:
+            self._counts[user_id] = self._load(user_id)
+        return self._counts[user_id]
+    
+    def increment(self, user_id, chat_id):
+        """Record a new message for a user.
+        
+        Users whose counts are not loaded yet are skipped; their first
+        lookup counts from the store, which already holds the message.
+        """
+        with self._lock:
+            counts = self._counts.get(user_id)
+            if counts is not None:
+                counts[chat_id] = counts.get(chat_id, 0) + 1
+    
+    def clear(self, user_id, chat_id):
+        """Mark a chat as read for a user"""
+        with self._lock:
+            self._user_counts(user_id).pop(chat_id, None)
+    
+    def get(self, user_id):
+        """Unread counts per chat for a user"""
+        with self._lock:
+            return dict(self._user_counts(user_id))
+    
+    def total(self, user_id):
+        """Total unread messages for a user"""
+        with self._lock:
+            return sum(self._user_counts(user_id).values())
+
+BUS = MessageBus()
+UNREAD = UnreadCounters()
+
+def chat_topic(chat_id):
+    """Topic carrying new messages for a chat"""
+    return f"chat:{chat_id}"
+
+def publish_chat_message(chat, message):
+    """Deliver a new chat message to open panes and unread counters"""
+    BUS.publish(chat_topic(chat['id']), message)
+    
+    for participant in chat.get('participants', []):
+        if participant != message['sender']:
+            UNREAD.increment(participant, chat['id'])
\ No newline at end of file
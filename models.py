@@ -0,0 +1,481 @@
+import time
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from functools import lru_cache
+from recurrence import parse_meeting_schedule
+
+# Display formats shared by every page
+DATETIME_FORMAT = "%b %d, %Y at %I:%M %p"
+DATE_FORMAT = "%b %d, %Y"
+LONG_DATE_FORMAT = "%B %d, %Y"
+TIME_FORMAT = "%I:%M %p"
+
+def now_timestamp():
+    """Current time as epoch seconds"""
+    return int(time.time())
+
+def to_timestamp(value):
+    """Convert an ISO string, datetime or number to epoch seconds"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+@lru_cache(maxsize=8192)
+def format_timestamp(timestamp, fmt=DATETIME_FORMAT, default="Unknown"):
+    """Format a timestamp for display, cached across pages and sessions"""
+    ts = to_timestamp(timestamp)
+    if ts is None:
+        return default
+    return datetime.fromtimestamp(ts).strftime(fmt)
+
+def format_datetime(timestamp, default="Unknown"):
+    """Format as 'Jan 05, 2025 at 06:00 PM'"""
+    return format_timestamp(timestamp, DATETIME_FORMAT, default)
+
+def format_date(timestamp, default="Unknown"):
+    """Format as 'Jan 05, 2025'"""
+    return format_timestamp(timestamp, DATE_FORMAT, default)
+
+def format_long_date(timestamp, default="Unknown"):
+    """Format as 'January 05, 2025'"""
+    return format_timestamp(timestamp, LONG_DATE_FORMAT, default)
+
+def format_time(timestamp, default=""):
+    """Format as '06:00 PM'"""
+    return format_timestamp(timestamp, TIME_FORMAT, default)
+
+class UserIdTable:
+    """Interns user id strings as dense integers.
+    
+    Each uuid string is stored once here; membership sets, chat participants
+    and message senders hold the small integer instead.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = {}
+        self._ids = []
+    
+    def intern(self, user_id):
+        """Integer for a user id, assigning the next one if it is new"""
+        index = self._index.get(user_id)
+        if index is None:
+            with self._lock:
+                index = self._index.get(user_id)
+                if index is None:
+                    index = len(self._ids)
+                    self._ids.append(user_id)
+                    self._index[user_id] = index
+        return index
+    
+    def get(self, user_id):
+        """Integer for a user id, or None if it was never interned"""
+        return self._index.get(user_id)
+    
+    def lookup(self, index):
+        """User id for an interned integer"""
+        return self._ids[index]
+    
+    def __len__(self):
+        return len(self._ids)
+
+USER_IDS = UserIdTable()
+
+class IdSet:
+    """Set of user ids stored as a sorted array of interned integers.
+    
+    Membership is a binary search, O(log n). Adding or removing a member is
+    O(n): the tail of the array is shifted by one slot. That is a memmove of
+    4-byte ints (about 1 us at 10k members, 8 us at 100k), kept over a hash
+    set alongside the array, which would multiply the memory per member.
+    """
+    __slots__ = ('ids',)
+    
+    def __init__(self, values=()):
+        self.ids = array('I', sorted({USER_IDS.intern(value) for value in values}))
+    
+    def _position(self, index):
+        position = bisect_left(self.ids, index)
+        return position, position < len(self.ids) and self.ids[position] == index
+    
+    def __contains__(self, user_id):
+        index = USER_IDS.get(user_id)
+        return index is not None and self._position(index)[1]
+    
+    def add(self, user_id):
+        index = USER_IDS.intern(user_id)
+        position, found = self._position(index)
+        if not found:
+            self.ids.insert(position, index)
+    
+    def discard(self, user_id):
+        index = USER_IDS.get(user_id)
+        if index is not None:
+            position, found = self._position(index)
+            if found:
+                del self.ids[position]
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __iter__(self):
+        return (USER_IDS.lookup(index) for index in self.ids)
+    
+    def __repr__(self):
+        return f"IdSet({list(self)!r})"
+
+class IdQueue:
+    """FIFO of user ids stored as interned integers.
+    
+    Backed by an insertion-ordered dict, so joining, leaving and taking the
+    head of the queue are all O(1).
+    """
+    __slots__ = ('ids',)
+    
+    def __init__(self, values=()):
+        self.ids = dict.fromkeys(USER_IDS.intern(value) for value in values)
+    
+    def __contains__(self, user_id):
+        index = USER_IDS.get(user_id)
+        return index is not None and index in self.ids
+    
+    def append(self, user_id):
+        self.ids.setdefault(USER_IDS.intern(user_id))
+    
+    def discard(self, user_id):
+        index = USER_IDS.get(user_id)
+        if index is not None:
+            self.ids.pop(index, None)
+    
+    def popleft(self):
+        """Remove and return the user id at the head, or None if empty"""
+        for index in self.ids:
+            del self.ids[index]
+            return USER_IDS.lookup(index)
+        return None
+    
+    def position(self, user_id):
+        """1-based position of a user id, or None if not queued"""
+        index = USER_IDS.get(user_id)
+        if index is None or index not in self.ids:
+            return None
+        for position, queued in enumerate(self.ids, 1):
+            if queued == index:
+                return position
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __iter__(self):
+        return (USER_IDS.lookup(index) for index in self.ids)
+    
+    def __repr__(self):
+        return f"IdQueue({list(self)!r})"
+
+class Record:
+    """Base for slotted records.
+    
+    Supports dict-style access (record['field'], record.get('field', default))
+    so page code reads models the same way it read plain dicts. Timestamp
+    fields are converted to epoch seconds, user id set fields to IdSets, queue
+    fields to IdQueues and user id fields to interned integers whenever they
+    are assigned; dict-style reads translate interned ids back to uuid strings.
+    """
+    __slots__ = ()
+    
+    TIMESTAMP_FIELDS = ()
+    SET_FIELDS = ()
+    QUEUE_FIELDS = ()
+    USER_ID_FIELDS = ()
+    
+    def __post_init__(self):
+        for name in self.TIMESTAMP_FIELDS:
+            object.__setattr__(self, name, to_timestamp(getattr(self, name)))
+        for name in self.SET_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, IdSet):
+                object.__setattr__(self, name, IdSet(value or ()))
+        for name in self.QUEUE_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, IdQueue):
+                object.__setattr__(self, name, IdQueue(value or ()))
+        for name in self.USER_ID_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                object.__setattr__(self, name, USER_IDS.intern(value))
+    
+    def __getitem__(self, key):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if key in self.USER_ID_FIELDS and value is not None:
+            return USER_IDS.lookup(value)
+        return value
+    
+    def __setitem__(self, key, value):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        if key in self.TIMESTAMP_FIELDS:
+            value = to_timestamp(value)
+        elif key in self.SET_FIELDS and not isinstance(value, IdSet):
+            value = IdSet(value or ())
+        elif key in self.QUEUE_FIELDS and not isinstance(value, IdQueue):
+            value = IdQueue(value or ())
+        elif key in self.USER_ID_FIELDS and value is not None:
+            value = USER_IDS.intern(value)
+        setattr(self, key, value)
+    
+    def __contains__(self, key):
+        return key in self.__dataclass_fields__
+    
+    def get(self, key, default=None):
+        """Field value, or default if the field is unset"""
+        if key not in self.__dataclass_fields__:
+            return default
+        value = self[key]
+        return default if value is None else value
+    
+    def keys(self):
+        return self.__dataclass_fields__.keys()
+    
+    def to_dict(self):
+        """Plain-dict copy of the record, nested records included"""
+        data = {}
+        for f in fields(self):
+            value = self[f.name]
+            if isinstance(value, (IdSet, IdQueue)):
+                value = list(value)
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, Record) else v for v in value]
+            elif isinstance(value, Record):
+                value = value.to_dict()
+            data[f.name] = value
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict, ignoring unknown keys"""
+        known = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+@dataclass(slots=True, eq=False)
+class User(Record):
+    id: str = None
+    email: str = None
+    name: str = None
+    year: str = None
+    branch: str = None
+    interests: list = field(default_factory=list)
+    password: str = None
+    is_verified: bool = False
+    joined_date: int = None
+    role: str = 'student'
+    last_login: int = None
+    
+    TIMESTAMP_FIELDS = ('joined_date', 'last_login')
+
+@dataclass(slots=True, eq=False)
+class Club(Record):
+    id: str = None
+    name: str = None
+    description: str = None
+    members: IdSet = field(default_factory=IdSet)
+    admins: IdSet = field(default_factory=IdSet)
+    tags: list = field(default_factory=list)
+    meeting_schedule: str = None
+    recurrence: dict = None
+    location: str = None
+    max_members: int = None
+    created_at: int = None
+    created_by: str = None
+    
+    TIMESTAMP_FIELDS = ('created_at',)
+    SET_FIELDS = ('members', 'admins')
+    
+    def __post_init__(self):
+        Record.__post_init__(self)
+        if self.recurrence is None:
+            self.recurrence = parse_meeting_schedule(self.meeting_schedule)
+
+@dataclass(slots=True, eq=False)
+class Event(Record):
+    id: str = None
+    title: str = None
+    description: str = None
+    date: int = None
+    end_date: int = None
+    time: str = None
+    location: str = None
+    club_id: str = None
+    created_by: str = None
+    rsvps: IdSet = field(default_factory=IdSet)
+    waitlist: IdQueue = field(default_factory=IdQueue)
+    max_attendees: int = None
+    created_at: int = None
+    tags: list = field(default_factory=list)
+    image_url: str = None
+    recurrence: dict = None
+    
+    TIMESTAMP_FIELDS = ('date', 'end_date', 'created_at')
+    SET_FIELDS = ('rsvps',)
+    QUEUE_FIELDS = ('waitlist',)
+
+@dataclass(slots=True, eq=False)
+class Listing(Record):
+    id: str = None
+    title: str = None
+    description: str = None
+    price: float = 0.0
+    category: str = None
+    condition: str = None
+    contact_method: str = None
+    contact_info: str = None
+    location: str = None
+    seller_id: str = None
+    seller_name: str = None
+    status: str = 'available'
+    created_at: int = None
+    sold_at: int = None
+    views: int = 0
+    interested: list = field(default_factory=list)
+    
+    TIMESTAMP_FIELDS = ('created_at', 'sold_at')
+
+@dataclass(slots=True, eq=False)
+class Comment(Record):
+    id: str = None
+    content: str = None
+    timestamp: int = None
+    
+    TIMESTAMP_FIELDS = ('timestamp',)
+
+@dataclass(slots=True, eq=False)
+class Confession(Record):
+    id: str = None
+    content: str = None
+    category: str = 'General'
+    status: str = 'pending'
+    upvotes: int = 0
+    downvotes: int = 0
+    reports: int = 0
+    comments: list = field(default_factory=list)
+    created_at: int = None
+    approved_at: int = None
+    approved_by: str = None
+    priority: int = 0
+    screening_reasons: list = field(default_factory=list)
+    screened_at: int = None
+    
+    TIMESTAMP_FIELDS = ('created_at', 'approved_at', 'screened_at')
+    
+    def __post_init__(self):
+        Record.__post_init__(self)
+        self.comments = [as_record(Comment, c) for c in self.comments]
+
+@dataclass(slots=True, eq=False)
+class Message(Record):
+    id: str = None
+    sender: int = None
+    content: str = None
+    timestamp: int = None
+    read: bool = False
+    
+    TIMESTAMP_FIELDS = ('timestamp',)
+    USER_ID_FIELDS = ('sender',)
+
+@dataclass(slots=True, eq=False)
+class Chat(Record):
+    id: str = None
+    participants: IdSet = field(default_factory=IdSet)
+    type: str = 'direct'
+    name: str = None
+    created_at: int = None
+    last_activity: int = None
+    messages: list = field(default_factory=list)
+    
+    TIMESTAMP_FIELDS = ('created_at', 'last_activity')
+    SET_FIELDS = ('participants',)
+    
+    def __post_init__(self):
+        Record.__post_init__(self)
+        self.messages = [as_record(Message, m) for m in self.messages]
+
+@dataclass(slots=True, eq=False)
+class Announcement(Record):
+    id: str = None
+    title: str = None
+    content: str = None
+    author: str = None
+    author_id: str = None
+    type: str = 'college'
+    priority: str = 'medium'
+    timestamp: int = None
+    
+    TIMESTAMP_FIELDS = ('timestamp',)
+
+@dataclass(slots=True, eq=False)
+class Report(Record):
+    id: str = None
+    confession_id: str = None
+    reporter_id: str = None
+    reason: str = None
+    status: str = 'pending'
+    created_at: int = None
+    
+    TIMESTAMP_FIELDS = ('created_at',)
+
+@dataclass(slots=True, eq=False)
+class AdminLog(Record):
+    admin_id: str = None
+    action: str = None
+    target_type: str = None
+    target_id: str = None
+    timestamp: int = None
+    ip_address: str = None
+    
+    TIMESTAMP_FIELDS = ('timestamp',)
+
+# Collection name -> record type
+MODELS = {
+    'users': User,
+    'clubs': Club,
+    'events': Event,
+    'marketplace': Listing,
+    'confessions': Confession,
+    'chats': Chat,
+    'archived_chats': Chat,
+    'announcements': Announcement,
+    'reports': Report,
+    'admin_logs': AdminLog
+}
+
+def as_record(model, value):
+    """Convert a dict to a record of the given type, leaving records as they are"""
+    if isinstance(value, Record):
+        return value
+    return model.from_dict(value)
+
+def to_record(data_type, value):
+    """Convert a dict to the record type of a collection"""
+    model = MODELS.get(data_type)
+    if model is None:
+        return value
+    return as_record(model, value)
+
+def migrate_collection(data_type, data):
+    """Convert a collection of dicts with ISO timestamps to records"""
+    if isinstance(data, dict):
+        return {key: to_record(data_type, value) for key, value in data.items()}
+    return [to_record(data_type, value) for value in data]
\ No newline at end of file
@@ -0,0 +1,193 @@
+import os
+import re
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from database import get_record, batch_write, log_admin_action
+from models import now_timestamp
+
+# Screening worker threads
+SCREENING_WORKERS = 2
+
+# Auto-approve confessions with no blocklist or PII hits
+AUTO_APPROVE_CLEAN = True
+
+# Optional JSON file overriding BLOCKLISTS: {"category": ["term", ...]}
+BLOCKLIST_FILE_ENV = "CONFESSION_BLOCKLIST_FILE"
+
+# Category -> terms. Matching is case-insensitive on whole words/phrases.
+BLOCKLISTS = {
+    'hate': ['go back to your country', 'subhuman', 'vermin'],
+    'harassment': ['kill yourself', 'kys', 'nobody would miss you', 'i know where you live'],
+    'threat': ['i will hurt', 'bring a gun', 'shoot up'],
+    'self_harm': ['want to die', 'end my life', 'kill myself', 'suicidal', 'self harm'],
+    'profanity': ['wtf', 'damn', 'crap', 'bs']
+}
+
+# Category -> screening action
+CATEGORY_ACTIONS = {
+    'hate': 'reject',
+    'harassment': 'reject',
+    'threat': 'reject',
+    'self_harm': 'prioritize',
+    'profanity': 'review'
+}
+
+# Review priority per action (higher is reviewed first)
+PRIORITIES = {
+    'prioritize': 100,
+    'review': 10,
+    'approve': 0,
+    'reject': 0
+}
+
+PII_PATTERNS = {
+    'email': re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+'),
+    'phone': re.compile(r'(?<!\d)(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)')
+}
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every term from all blocklists in one pass"""
+    
+    def __init__(self, patterns):
+        # patterns: iterable of (term, category)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        
+        for term, category in patterns:
+            term = term.lower()
+            if not term:
+                continue
+            state = 0
+            for char in term:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append((term, category))
+        
+        # Breadth-first pass to build failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+    
+    def search(self, text):
+        """Yield (start, end, term, category) for whole-word matches"""
+        text = text.lower()
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for term, category in self.output[state]:
+                start = i - len(term) + 1
+                end = i + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    yield start, end, term, category
+
+def load_blocklists():
+    """Blocklists from BLOCKLIST_FILE_ENV if set, else the defaults"""
+    path = os.environ.get(BLOCKLIST_FILE_ENV)
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return BLOCKLISTS
+
+def build_matcher(blocklists=None):
+    """Compile blocklists into a single matcher"""
+    blocklists = blocklists if blocklists is not None else load_blocklists()
+    return AhoCorasick(
+        (term, category)
+        for category, terms in blocklists.items()
+        for term in terms
+    )
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher():
+    """Compiled matcher, built on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = build_matcher()
+    return _matcher
+
+def configure_blocklists(blocklists):
+    """Replace the blocklists used for screening"""
+    global _matcher
+    with _matcher_lock:
+        _matcher = build_matcher(blocklists)
+
+def screen_text(text):
+    """Screen text and return (action, priority, reason codes).
+    
+    Action is one of 'approve', 'reject', 'prioritize' or 'review'.
+    """
+    reasons = []
+    actions = set()
+    
+    for _, _, term, category in get_matcher().search(text):
+        code = f"blocklist:{category}"
+        if code not in reasons:
+            reasons.append(code)
+        actions.add(CATEGORY_ACTIONS.get(category, 'review'))
+    
+    for kind, pattern in PII_PATTERNS.items():
+        if pattern.search(text):
+            reasons.append(f"pii:{kind}")
+            actions.add('reject')
+    
+    # Self-harm goes to a human first even if other rules would reject it
+    for action in ('prioritize', 'reject', 'review'):
+        if action in actions:
+            return action, PRIORITIES[action], reasons
+    
+    if AUTO_APPROVE_CLEAN:
+        return 'approve', PRIORITIES['approve'], ['clean']
+    return 'review', PRIORITIES['review'], ['clean']
+
+def screen_confession(confession_id):
+    """Screen a pending confession and apply the decision"""
+    with batch_write('confessions'):
+        confession = get_record('confessions', confession_id)
+        if not confession or confession.get('status') != 'pending':
+            return None
+        
+        action, priority, reasons = screen_text(confession['content'])
+        
+        confession['screening_reasons'] = reasons
+        confession['priority'] = priority
+        confession['screened_at'] = now_timestamp()
+        
+        if action == 'approve':
+            confession['status'] = 'approved'
+            confession['approved_at'] = now_timestamp()
+            confession['approved_by'] = 'auto_screening'
+        elif action == 'reject':
+            confession['status'] = 'rejected'
+    
+    # Approvals are recorded on the confession (approved_by); logging each one
+    # would add an admin-log row per clean submission
+    if action == 'reject':
+        log_admin_action('system', "auto_rejected_confession", "confession", confession_id)
+    return action
+
+_executor = ThreadPoolExecutor(max_workers=SCREENING_WORKERS, thread_name_prefix="confession-screening")
+
+def submit_for_screening(confession_id):
+    """Queue a confession for asynchronous screening"""
+    return _executor.submit(screen_confession, confession_id)
\ No newline at end of file
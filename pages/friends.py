@@ -0,0 +1,65 @@
+import streamlit as st
+from database import get_user_by_id
+from models import format_datetime
+from friends import SUGGESTIONS
+from scheduler import SCHEDULER
+from pages.chat import create_new_chat
+
+# Suggestions listed on the page
+SUGGESTIONS_SHOWN = 10
+
+def friends_page():
+    """People you may know"""
+    st.title("🤝 Find Friends")
+    st.write("Students who share your clubs, events, interests, branch or year")
+    
+    if SUGGESTIONS.computed_at:
+        st.caption(f"Suggestions updated {format_datetime(int(SUGGESTIONS.computed_at))}")
+    
+    suggestions = SUGGESTIONS.get(st.session_state.user['id'])[:SUGGESTIONS_SHOWN]
+    
+    if not suggestions:
+        st.info("No suggestions yet. Join clubs and RSVP to events to meet people!")
+        if st.button("🔄 Refresh suggestions"):
+            SCHEDULER.run_now("compute_friend_suggestions")
+            st.success("Suggestions are being recomputed")
+        return
+    
+    for suggestion in suggestions:
+        display_suggestion(suggestion)
+
+def suggestion_reasons(suggestion):
+    """Human-readable reasons for a suggestion"""
+    reasons = []
+    if suggestion['clubs']:
+        reasons.append(f"👥 {suggestion['clubs']} shared club{'s' if suggestion['clubs'] > 1 else ''}")
+    if suggestion['events']:
+        reasons.append(f"📅 {suggestion['events']} shared event{'s' if suggestion['events'] > 1 else ''}")
+    if suggestion['interests']:
+        reasons.append(f"💡 {suggestion['interests']} shared interest{'s' if suggestion['interests'] > 1 else ''}")
+    if suggestion['same_branch']:
+        reasons.append("🎓 Same branch")
+    if suggestion['same_year']:
+        reasons.append("📚 Same year")
+    return reasons
+
+def display_suggestion(suggestion):
+    """Display one suggested student"""
+    other = get_user_by_id(suggestion['user_id'])
+    if not other:
+        return
+    
+    with st.container():
+        col1, col2 = st.columns([4, 1])
+        
+        with col1:
+            st.write(f"**{other['name']}**")
+            st.caption(f"{other.get('year', 'Student')} • {other.get('branch', '')}")
+            st.caption(" • ".join(suggestion_reasons(suggestion)))
+        
+        with col2:
+            if st.button("👋 Say hi", key=f"say_hi_{other['id']}"):
+                st.session_state.pending_page = "Chat"
+                create_new_chat(other['id'], f"Hi {other['name'].split()[0]}! 👋")
+        
+        st.divider()
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import json
+import math
+import time
+import uuid
+import threading
+import functools
+from collections import deque, Counter, OrderedDict
+from contextlib import contextmanager
+import streamlit as st
+
+from database import storage_call_counts
+
+# Recent renders kept per page (and per session page) for percentiles
+RENDER_SAMPLE_WINDOW = 1000
+
+# Sessions tracked individually; the least recently active are dropped first
+MAX_TRACKED_SESSIONS = 500
+
+# Latest renders kept for the admin view
+RECENT_RENDERS = 200
+
+# Set to a path to append one JSON line per page render
+TRACE_FILE_ENV = 'RENDER_TRACE_FILE'
+
+PERCENTILES = (50, 95, 99)
+
+# Page being timed on this script thread, if any
+_rendering = threading.local()
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+class RollingHistogram:
+    """The last `window` samples of a measurement, for rolling percentiles"""
+    
+    __slots__ = ('samples', 'count', 'total')
+    
+    def __init__(self, window=RENDER_SAMPLE_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+    
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+    
+    def percentiles(self, qs=PERCENTILES):
+        ordered = sorted(self.samples)
+        return {f"p{q}": percentile(ordered, q) for q in qs}
+
+class PageStats:
+    """Render timings, storage calls and rerun causes for one page"""
+    
+    __slots__ = ('wall_ms', 'loads', 'saves', 'causes', 'outcomes')
+    
+    def __init__(self):
+        self.wall_ms = RollingHistogram()
+        self.loads = 0
+        self.saves = 0
+        self.causes = Counter()
+        self.outcomes = Counter()
+    
+    def add(self, render):
+        self.wall_ms.add(render['wall_ms'])
+        self.loads += render['loads']
+        self.saves += render['saves']
+        self.causes[render['cause']] += 1
+        self.outcomes[render['outcome']] += 1
+    
+    def summary(self):
+        renders = self.wall_ms.count
+        return {
+            'renders': renders,
+            **{f"{name} (ms)": value for name, value in self.wall_ms.percentiles().items()},
+            'mean (ms)': self.wall_ms.total / renders if renders else None,
+            'loads/render': self.loads / renders if renders else 0,
+            'saves/render': self.saves / renders if renders else 0,
+            'causes': dict(self.causes),
+            'outcomes': dict(self.outcomes)
+        }
+
+class RenderProfiler:
+    """Process-wide per-page and per-session render statistics"""
+    
+    def __init__(self):
+        self.pages = {}
+        self.sessions = OrderedDict()
+        self.recent = deque(maxlen=RECENT_RENDERS)
+        self._lock = threading.Lock()
+        self._trace_lock = threading.Lock()
+    
+    def record(self, render):
+        with self._lock:
+            self.pages.setdefault(render['page'], PageStats()).add(render)
+            
+            session = self.sessions.pop(render['session'], None) or {}
+            session.setdefault(render['page'], PageStats()).add(render)
+            self.sessions[render['session']] = session
+            while len(self.sessions) > MAX_TRACKED_SESSIONS:
+                self.sessions.popitem(last=False)
+            
+            self.recent.append(render)
+        
+        trace_file = os.environ.get(TRACE_FILE_ENV)
+        if trace_file:
+            self.trace(render, trace_file)
+    
+    def trace(self, render, path):
+        """Append one render to a JSONL trace file"""
+        try:
+            with self._trace_lock, open(path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(render) + '\n')
+        except OSError:
+            pass
+    
+    def report(self):
+        """Per-page summaries, slowest p95 first"""
+        with self._lock:
+            rows = [{'page': page, **stats.summary()} for page, stats in self.pages.items()]
+        return sorted(rows, key=lambda row: row['p95 (ms)'] or 0, reverse=True)
+    
+    def session_report(self, session_id):
+        """Per-page summaries for one session"""
+        with self._lock:
+            pages = dict(self.sessions.get(session_id, {}))
+            return [{'page': page, **stats.summary()} for page, stats in pages.items()]
+    
+    def dump(self, path):
+        """Write the current per-page summaries to a JSONL file, one line per page"""
+        snapshot_at = time.time()
+        with self._trace_lock, open(path, 'a', encoding='utf-8') as fh:
+            for row in self.report():
+                fh.write(json.dumps({'snapshot_at': snapshot_at, **row}) + '\n')
+    
+    def reset(self):
+        with self._lock:
+            self.pages.clear()
+            self.sessions.clear()
+            self.recent.clear()
+
+RENDER_PROFILER = RenderProfiler()
+
+def render_session_id():
+    """Short id for the current browser session"""
+    if 'render_session_id' not in st.session_state:
+        st.session_state.render_session_id = uuid.uuid4().hex[:8]
+    return st.session_state.render_session_id
+
+def rerun_cause(page_name):
+    """Why this script run happened, judged from the previous render of the session"""
+    last = st.session_state.get('last_render')
+    if last is None:
+        return 'session_start'
+    if last['outcome'] == 'rerun':
+        return 'st.rerun'
+    if last['page'] != page_name:
+        return 'navigation'
+    return 'interaction'
+
+@contextmanager
+def track_render(page_name, fragment=False):
+    """Time one page execution and record it with its storage calls and rerun cause.
+    
+    st.rerun() and st.stop() end a page by raising; those runs are recorded
+    with a 'rerun' or 'stop' outcome and the exception is re-raised. Fragment
+    reruns are recorded with a 'fragment' cause and leave the session's page
+    unchanged for judging the next full run.
+    """
+    cause = 'fragment' if fragment else rerun_cause(page_name)
+    loads, saves = storage_call_counts()
+    start = time.perf_counter()
+    outcome = 'ok'
+    previous = getattr(_rendering, 'page', None)
+    _rendering.page = page_name
+    
+    try:
+        yield
+    except BaseException as e:
+        name = type(e).__name__
+        outcome = 'rerun' if name == 'RerunException' else 'stop' if name == 'StopException' else 'error'
+        raise
+    finally:
+        wall_ms = (time.perf_counter() - start) * 1000
+        end_loads, end_saves = storage_call_counts()
+        _rendering.page = previous
+        page = st.session_state.get('page') if fragment else page_name
+        st.session_state.last_render = {'page': page, 'outcome': outcome}
+        RENDER_PROFILER.record({
+            'page': page_name,
+            'session': render_session_id(),
+            'started_at': time.time() - wall_ms / 1000,
+            'wall_ms': wall_ms,
+            'loads': end_loads - loads,
+            'saves': end_saves - saves,
+            'cause': cause,
+            'outcome': outcome
+        })
+
+def track_fragment(name):
+    """Record a fragment's own reruns with track_render.
+    
+    A fragment also runs as part of its page, and that time is already in the
+    page's render, so only runs outside a tracked page are recorded.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_rendering, 'page', None) is not None:
+                return func(*args, **kwargs)
+            with track_render(name, fragment=True):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,164 @@
+import threading
+from bisect import bisect_left, insort
+
+from database import load_data, get_collection_version
+from models import now_timestamp
+
+# Seconds between background re-scores (time decay moves every score)
+RESCORE_SECONDS = 60
+
+HOUR = 3600
+
+# Scoring parameters per mode
+RANKING_CONFIG = {
+    'hot': {'gravity': 1.8, 'offset_hours': 2},
+    'rising': {'gravity': 1.2, 'window_hours': 24},
+    'top_week': {'window_hours': 7 * 24}
+}
+
+# Sort selector labels -> mode
+SORT_MODES = {
+    "🔥 Hot": 'hot',
+    "📈 Rising": 'rising',
+    "🏆 Top this week": 'top_week',
+    "⭐ Top all time": 'top',
+    "🆕 New": 'new'
+}
+
+# Announcement priority stands in for votes
+ANNOUNCEMENT_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+
+def score(mode, points, created, now):
+    """Rank score for an item, or None if the mode excludes it"""
+    age_hours = max(now - (created or 0), 0) / HOUR
+    config = RANKING_CONFIG.get(mode, {})
+    
+    if mode == 'hot':
+        return (points + 1) / (age_hours + config['offset_hours']) ** config['gravity']
+    if mode == 'rising':
+        if age_hours > config['window_hours']:
+            return None
+        return points / (age_hours + 1) ** config['gravity']
+    if mode == 'top_week':
+        if age_hours > config['window_hours']:
+            return None
+        return points
+    if mode == 'top':
+        return points
+    return created or 0
+
+class FeedIndex:
+    """Ranked orderings of one feed, one sorted key list per mode.
+    
+    When the collection version changes, sync() scans for items whose votes,
+    status or timestamp changed and moves only those within each sorted list
+    (bisect + insort). All placements between re-scores are scored against the
+    same reference time so they stay comparable. rescore() recomputes every
+    score at the current time and runs on the background scheduler, so pages
+    never sort the feed themselves.
+    """
+    
+    def __init__(self, collection, select, points, created_field):
+        self.collection = collection
+        self.select = select
+        self.points = points
+        self.created_field = created_field
+        self._keys = {mode: [] for mode in SORT_MODES.values()}
+        self._item_keys = {mode: {} for mode in SORT_MODES.values()}
+        self._signatures = {}
+        self._records = {}
+        self._version = None
+        self._scored_at = now_timestamp()
+        self._lock = threading.Lock()
+    
+    def _items(self):
+        data = load_data(self.collection)
+        return data.values() if isinstance(data, dict) else data
+    
+    def _place(self, item_id, signature):
+        points, created = signature
+        for mode, keys in self._keys.items():
+            old = self._item_keys[mode].pop(item_id, None)
+            if old is not None:
+                del keys[bisect_left(keys, old)]
+            value = score(mode, points, created, self._scored_at)
+            if value is not None:
+                key = (-value, -(created or 0), item_id)
+                self._item_keys[mode][item_id] = key
+                insort(keys, key)
+    
+    def _remove(self, item_id):
+        for mode, keys in self._keys.items():
+            old = self._item_keys[mode].pop(item_id, None)
+            if old is not None:
+                del keys[bisect_left(keys, old)]
+        self._signatures.pop(item_id, None)
+        self._records.pop(item_id, None)
+    
+    def sync(self):
+        """Re-place items that changed since the last sync"""
+        version = get_collection_version(self.collection)
+        if version == self._version:
+            return
+        
+        with self._lock:
+            seen = set()
+            for item in list(self._items()):
+                if not self.select(item):
+                    continue
+                item_id = item['id']
+                seen.add(item_id)
+                self._records[item_id] = item
+                signature = (self.points(item), item.get(self.created_field))
+                if self._signatures.get(item_id) != signature:
+                    self._signatures[item_id] = signature
+                    self._place(item_id, signature)
+            
+            for item_id in set(self._signatures) - seen:
+                self._remove(item_id)
+            self._version = version
+    
+    def rescore(self):
+        """Recompute every score at the current time"""
+        self.sync()
+        with self._lock:
+            self._scored_at = now_timestamp()
+            for mode in self._keys:
+                item_keys = {}
+                for item_id, (points, created) in self._signatures.items():
+                    value = score(mode, points, created, self._scored_at)
+                    if value is not None:
+                        item_keys[item_id] = (-value, -(created or 0), item_id)
+                self._item_keys[mode] = item_keys
+                self._keys[mode] = sorted(item_keys.values())
+    
+    def ranked(self, mode):
+        """Records in rank order for a mode"""
+        self.sync()
+        with self._lock:
+            return [self._records[key[2]] for key in self._keys[mode]]
+
+def confession_points(confession):
+    return confession.get('upvotes', 0) - confession.get('downvotes', 0)
+
+def announcement_points(announcement):
+    return ANNOUNCEMENT_WEIGHTS.get(announcement.get('priority', 'medium'), 2)
+
+CONFESSION_FEED = FeedIndex(
+    'confessions',
+    select=lambda c: c.get('status') == 'approved',
+    points=confession_points,
+    created_field='created_at'
+)
+
+ANNOUNCEMENT_FEED = FeedIndex(
+    'announcements',
+    select=lambda a: True,
+    points=announcement_points,
+    created_field='timestamp'
+)
+
+def rescore_feeds():
+    """Background job: apply time decay to every feed"""
+    CONFESSION_FEED.rescore()
+    ANNOUNCEMENT_FEED.rescore()
\ No newline at end of file
@@ -0,0 +1,236 @@
+import re
+import threading
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+
+from database import load_data, get_record, get_collection_version, current_minute, get_upcoming_events
+
+# Suggestions shown per panel
+RECOMMENDATION_COUNT = 3
+
+# Users whose ranked candidates are kept, per kind (clubs, events)
+RECOMMENDATION_CACHE_USERS = 2048
+
+# Candidates ranked beyond k, so a few joins or RSVPs are filtered without re-ranking
+RECOMMENDATION_SLACK = 10
+
+# Normalized term -> canonical concepts. Interests offered at signup and tags
+# used by clubs and events are mapped onto a shared vocabulary here.
+SYNONYMS = {
+    'ai/ml': ('ai', 'machine learning'),
+    'ai': ('ai',),
+    'ml': ('machine learning',),
+    'machine learning': ('machine learning',),
+    'artificial intelligence': ('ai',),
+    'data science': ('data science', 'machine learning'),
+    'programming': ('programming',),
+    'coding': ('programming',),
+    'python': ('programming',),
+    'web development': ('web development', 'programming'),
+    'webdev': ('web development', 'programming'),
+    'technology': ('technology',),
+    'tech': ('technology',),
+    'engineering': ('engineering', 'technology'),
+    'arts': ('arts',),
+    'performance': ('arts', 'music'),
+    'singing': ('music',),
+    'music': ('music',),
+    'dance': ('dance', 'arts'),
+    'photography': ('photography', 'arts'),
+    'writing': ('writing',),
+    'research': ('research', 'academic'),
+    'academic': ('academic',),
+    'workshop': ('academic',),
+    'debate': ('debate',),
+    'public speaking': ('debate',),
+    'critical thinking': ('debate', 'academic'),
+    'politics': ('debate',),
+    'business': ('business',),
+    'management': ('business',),
+    'networking': ('business', 'social'),
+    'social': ('social',),
+    'party': ('social',),
+    'welcome': ('social',),
+    'sports': ('sports',),
+    'gaming': ('gaming',)
+}
+
+@lru_cache(maxsize=4096)
+def normalize(term):
+    """Lowercase, trim and collapse whitespace/separators"""
+    term = re.sub(r'\s+', ' ', term.strip().lower())
+    return re.sub(r'\s*([/&+-])\s*', r'\1', term)
+
+@lru_cache(maxsize=4096)
+def term_concepts(term):
+    term = normalize(term)
+    return SYNONYMS.get(term, (term,))
+
+def concepts(terms):
+    """Canonical concepts for a list of interests or tags"""
+    result = set()
+    for term in terms:
+        result.update(term_concepts(term))
+    return result
+
+class TagMatrix:
+    """Candidates encoded as L2-normalized rows over a concept vocabulary"""
+    
+    __slots__ = ('ids', 'concepts', 'vocabulary', 'matrix')
+    
+    def __init__(self, records):
+        self.ids = [record['id'] for record in records]
+        self.concepts = [concepts(record.get('tags', [])) for record in records]
+        self.vocabulary = {c: i for i, c in enumerate(sorted(set().union(*self.concepts)))}
+        
+        rows = [row for row, item_concepts in enumerate(self.concepts) for _ in item_concepts]
+        cols = [self.vocabulary[c] for item_concepts in self.concepts for c in item_concepts]
+        self.matrix = np.zeros((len(self.ids), len(self.vocabulary)), dtype=np.float32)
+        self.matrix[rows, cols] = 1.0
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        np.divide(self.matrix, norms, out=self.matrix, where=norms > 0)
+    
+    def encode(self, user_concepts):
+        """User vector in this matrix's vocabulary"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for concept in user_concepts:
+            index = self.vocabulary.get(concept)
+            if index is not None:
+                vector[index] = 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def rank(self, user_concepts):
+        """Candidate row indexes with a positive score, best first, and all scores"""
+        if not self.ids:
+            return np.array([], dtype=np.intp), np.array([], dtype=np.float32)
+        scores = self.matrix @ self.encode(user_concepts)
+        candidates = np.flatnonzero(scores > 0)
+        return candidates[np.argsort(-scores[candidates], kind='stable')], scores
+
+class TagIndex:
+    """A TagMatrix rebuilt only when candidate ids or tags change.
+    
+    Joins and RSVPs bump the collection version without touching tags, so on a
+    version change the index compares each candidate's tags with the ones it
+    was built from and keeps the existing matrix when nothing moved. The
+    generation counts rebuilds, so callers can tell matrices apart without
+    holding on to old ones.
+    """
+    
+    def __init__(self, collection, records):
+        self.collection = collection
+        self.records = records
+        self._marker = None
+        self._signature = None
+        self._current = (0, TagMatrix([]))
+        self._lock = threading.Lock()
+    
+    def current(self, *marker):
+        """(generation, matrix) for the current collection version (plus any extra marker)"""
+        marker = (get_collection_version(self.collection),) + marker
+        if marker == self._marker:
+            return self._current
+        
+        with self._lock:
+            if marker != self._marker:
+                records = self.records()
+                signature = [(record['id'], tuple(record.get('tags', []))) for record in records]
+                if signature != self._signature:
+                    self._current = (self.generation + 1, TagMatrix(records))
+                    self._signature = signature
+                self._marker = marker
+            return self._current
+    
+    @property
+    def generation(self):
+        """Number of times the matrix has been rebuilt"""
+        return self._current[0]
+
+CLUB_TAGS = TagIndex('clubs', lambda: list(load_data('clubs').values()))
+EVENT_TAGS = TagIndex('events', get_upcoming_events)
+
+class RecommendationCache:
+    """Per-user ranked candidates, kept apart from the shared VIEW_CACHE.
+    
+    An entry is reused while the user's interests and the generation of the
+    tag matrix it was ranked against are unchanged, so only a profile edit or
+    a rebuilt matrix (tags, or the set of clubs or upcoming events, changed)
+    replaces it. Entries hold the generation number, not the matrix, so old
+    matrices are freed as soon as they are replaced.
+    Entries exclude nothing; joined clubs and RSVP'd events are filtered when
+    read, so joins and RSVPs never invalidate anyone's entry.
+    """
+    
+    def __init__(self, max_entries=RECOMMENDATION_CACHE_USERS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, user_id, marker, compute):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == marker:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        value = compute()
+        with self._lock:
+            self._entries[user_id] = (marker, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+CLUB_RECOMMENDATIONS = RecommendationCache()
+EVENT_RECOMMENDATIONS = RecommendationCache()
+
+def _ranked(matrix, user_concepts, limit=None):
+    """(item_id, score, matched concepts) for the best-matching candidates"""
+    order, scores = matrix.rank(user_concepts)
+    return [
+        (matrix.ids[row], float(scores[row]), sorted(user_concepts & matrix.concepts[row]))
+        for row in order[:limit]
+    ]
+
+def _recommend(cache, current, user_id, k, exclude):
+    """Top k candidates the user is not already part of"""
+    generation, matrix = current
+    interests = _interests(user_id)
+    user_concepts = concepts(interests)
+    limit = k + RECOMMENDATION_SLACK
+    ranked = cache.get_or_compute(user_id, (interests, generation, limit),
+                                  lambda: _ranked(matrix, user_concepts, limit))
+    
+    picks = [pick for pick in ranked if not exclude(pick[0])][:k]
+    if len(picks) < k and len(ranked) == limit:
+        # The user already belongs to most of the cached candidates
+        picks = [pick for pick in _ranked(matrix, user_concepts) if not exclude(pick[0])][:k]
+    return picks
+
+def _interests(user_id):
+    user = get_record('users', user_id)
+    return tuple(sorted(user.get('interests', []))) if user else ()
+
+def recommend_clubs(user_id, k=RECOMMENDATION_COUNT):
+    """Clubs the user has not joined, best match first.
+    
+    Returns (club_id, score, matched concepts) tuples. The ranking is cached
+    per user until their interests or the clubs' tags change.
+    """
+    return _recommend(
+        CLUB_RECOMMENDATIONS, CLUB_TAGS.current(), user_id, k,
+        lambda club_id: user_id in get_record('clubs', club_id)['members']
+    )
+
+def recommend_events(user_id, k=RECOMMENDATION_COUNT):
+    """Upcoming events the user has not RSVP'd to, best match first"""
+    return _recommend(
+        EVENT_RECOMMENDATIONS, EVENT_TAGS.current(current_minute()), user_id, k,
+        lambda event_id: user_id in get_record('events', event_id)['rsvps']
+    )
\ No newline at end of file
@@ -0,0 +1,188 @@
+import re
+from datetime import date, datetime, timedelta
+
+WEEKDAYS = {
+    'mon': 0, 'monday': 0, 'mondays': 0,
+    'tue': 1, 'tues': 1, 'tuesday': 1, 'tuesdays': 1,
+    'wed': 2, 'wednesday': 2, 'wednesdays': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3, 'thursdays': 3,
+    'fri': 4, 'friday': 4, 'fridays': 4,
+    'sat': 5, 'saturday': 5, 'saturdays': 5,
+    'sun': 6, 'sunday': 6, 'sundays': 6
+}
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Meeting length when a schedule gives only a start time
+DEFAULT_MEETING_MINUTES = 60
+
+# Events without an end time are assumed to last this long
+DEFAULT_EVENT_SECONDS = 2 * 3600
+
+# How far ahead to look for the next occurrence of a series
+NEXT_OCCURRENCE_HORIZON_DAYS = 366
+
+_TIME = r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?'
+_TIME_RANGE = re.compile(_TIME + r'(?:\s*(?:-|–|to)\s*' + _TIME + r')?', re.IGNORECASE)
+
+def _minutes(hour, minute, meridiem):
+    hour = int(hour) % 24
+    minute = int(minute or 0)
+    if meridiem:
+        meridiem = meridiem.lower()
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+    return hour * 60 + minute
+
+def parse_meeting_schedule(text):
+    """Parse free-text schedules like "Every Wednesday 6-8 PM" into a weekly rule.
+    
+    Returns a rule from make_rule, or None when no weekday or time can be
+    found. "Every other" and "biweekly" give a two-week interval.
+    """
+    if not text:
+        return None
+    
+    weekdays = sorted({
+        WEEKDAYS[word] for word in re.findall(r'[a-z]+', text.lower())
+        if word in WEEKDAYS
+    })
+    match = next((m for m in _TIME_RANGE.finditer(text) if m.group(2) or m.group(3) or m.group(4) or m.group(6)), None)
+    if not weekdays or match is None:
+        return None
+    
+    start_h, start_m, start_mer, end_h, end_m, end_mer = match.groups()
+    # "6-8 PM": the start shares the end's meridiem unless that would put it after the end
+    start = _minutes(start_h, start_m, start_mer or end_mer)
+    if end_h is None:
+        end = start + DEFAULT_MEETING_MINUTES
+    else:
+        end = _minutes(end_h, end_m, end_mer or start_mer)
+        if end <= start and not start_mer and end_mer:
+            start = _minutes(start_h, start_m, 'am' if end_mer.lower() == 'pm' else 'pm')
+        # "10 to 2" with no meridiem at all: the end is in the afternoon
+        if end <= start and not start_mer and not end_mer and end + 12 * 60 > start:
+            end += 12 * 60
+        if end <= start:
+            end += 24 * 60
+    
+    interval = 2 if re.search(r'every other|biweekly|bi-weekly|alternate', text, re.IGNORECASE) else 1
+    return make_rule('weekly', start, end, weekdays=weekdays, interval=interval,
+                     starts_on=date.today().isoformat() if interval > 1 else None)
+
+def make_rule(freq, start, end, weekdays=None, interval=1, starts_on=None, until=None, count=None, exceptions=()):
+    """Build a recurrence rule.
+    
+    start/end are minutes after midnight, starts_on/until ISO dates
+    (YYYY-MM-DD) and exceptions a list of ISO dates to skip. A count is turned
+    into the matching until date so expansion never has to count from the
+    start of the series.
+    """
+    rule = {
+        'freq': freq,
+        'weekdays': sorted(weekdays) if weekdays else list(range(7)),
+        'interval': max(int(interval or 1), 1),
+        'start': start,
+        'end': end if end > start else end + 24 * 60,
+        'starts_on': starts_on,
+        'until': until,
+        'exceptions': sorted(set(exceptions))
+    }
+    if count and starts_on:
+        first = int(datetime.fromisoformat(starts_on).timestamp())
+        last = None
+        for index, (occurrence, _) in enumerate(expand(rule, first, first + 5 * 366 * 24 * 3600), 1):
+            last = occurrence
+            if index == count:
+                break
+        if last is not None:
+            rule['until'] = datetime.fromtimestamp(last).date().isoformat()
+    return rule
+
+def _matches(rule, day, anchor):
+    if day.weekday() not in rule['weekdays']:
+        return False
+    interval = rule.get('interval', 1)
+    if interval > 1 and anchor is not None:
+        if rule['freq'] == 'daily':
+            return (day - anchor).days % interval == 0
+        anchor_week = anchor - timedelta(days=anchor.weekday())
+        return (day - anchor_week).days // 7 % interval == 0
+    return True
+
+def expand(rule, window_start, window_end):
+    """Yield (start, end) timestamps of rule occurrences overlapping the window.
+    
+    Occurrences are generated lazily, one day at a time and only between the
+    window bounds (clipped to the rule's starts_on/until), so a semester-long
+    series costs nothing beyond the days actually asked for. Dates listed in
+    the rule's exceptions are skipped.
+    """
+    if not rule:
+        return
+    
+    # Start a day early so a meeting running past midnight into the window is included
+    day = datetime.fromtimestamp(window_start).date() - timedelta(days=1)
+    last_day = datetime.fromtimestamp(window_end).date()
+    
+    anchor = date.fromisoformat(rule['starts_on']) if rule.get('starts_on') else None
+    if anchor is not None and day < anchor:
+        day = anchor
+    if rule.get('until'):
+        last_day = min(last_day, date.fromisoformat(rule['until']))
+    exceptions = set(rule.get('exceptions', ()))
+    
+    while day <= last_day:
+        if _matches(rule, day, anchor) and day.isoformat() not in exceptions:
+            midnight = datetime.combine(day, datetime.min.time())
+            start = int((midnight + timedelta(minutes=rule['start'])).timestamp())
+            end = int((midnight + timedelta(minutes=rule['end'])).timestamp())
+            if start >= window_end:
+                return
+            if end > window_start:
+                yield start, end
+        day += timedelta(days=1)
+
+def event_occurrences(event, window_start, window_end):
+    """Yield (start, end) of an event, or of each occurrence of a recurring one"""
+    if event.get('recurrence'):
+        yield from expand(event['recurrence'], window_start, window_end)
+        return
+    start = event.get('date')
+    if start is None:
+        return
+    end = event.get('end_date') or start + DEFAULT_EVENT_SECONDS
+    if end > window_start and start < window_end:
+        yield start, end
+
+def next_occurrence(event, after, horizon_days=NEXT_OCCURRENCE_HORIZON_DAYS):
+    """(start, end) of the first occurrence starting at or after a time, or None"""
+    for start, end in event_occurrences(event, after, after + horizon_days * 24 * 3600):
+        if start >= after:
+            return start, end
+    return None
+
+def series_ended(event, now):
+    """Whether a recurring event has no occurrences left"""
+    until = event['recurrence'].get('until')
+    return bool(until) and int(datetime.fromisoformat(until).timestamp()) + 24 * 3600 <= now
+
+def describe(rule):
+    """Readable summary of a rule, e.g. 'Every 2 weeks on Wednesdays 06:00 PM-08:00 PM'"""
+    if not rule:
+        return None
+    interval = rule.get('interval', 1)
+    if rule['freq'] == 'daily':
+        days = "Daily" if interval == 1 else f"Every {interval} days"
+    else:
+        days = ", ".join(WEEKDAY_NAMES[d] + "s" for d in rule['weekdays'])
+        if interval > 1:
+            days = f"Every {interval} weeks on {days}"
+    start = (datetime.min + timedelta(minutes=rule['start'])).strftime("%I:%M %p")
+    end = (datetime.min + timedelta(minutes=rule['end'] % (24 * 60))).strftime("%I:%M %p")
+    summary = f"{days} {start}-{end}"
+    if rule.get('until'):
+        summary += f" until {date.fromisoformat(rule['until']).strftime('%b %d')}"
+    return summary
\ No newline at end of file
@@ -0,0 +1,172 @@
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+
+from database import load_data
+from models import now_timestamp
+from recurrence import expand, event_occurrences
+
+# How far ahead club meetings are expanded into a user's schedule
+SCHEDULE_HORIZON_DAYS = 120
+
+# Users whose schedule trees are kept in memory
+SCHEDULE_CACHE_USERS = 2048
+
+DAY = 24 * 3600
+
+class IntervalTree:
+    """Static interval tree over (start, end, item) entries.
+    
+    Entries are sorted by start and a segment tree over them stores the
+    latest end in each subtree. An overlap query bisects to the entries that
+    start before the query ends, then descends only into subtrees whose
+    latest end is after the query starts: O(log n + k) for k overlaps.
+    """
+    __slots__ = ('starts', 'ends', 'items', 'size', 'max_end')
+    
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda entry: (entry[0], entry[1]))
+        self.starts = [entry[0] for entry in entries]
+        self.ends = [entry[1] for entry in entries]
+        self.items = [entry[2] for entry in entries]
+        
+        self.size = 1
+        while self.size < len(entries):
+            self.size *= 2
+        self.max_end = [float('-inf')] * (2 * self.size)
+        self.max_end[self.size:self.size + len(entries)] = self.ends
+        for node in range(self.size - 1, 0, -1):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def overlapping(self, start, end):
+        """Items whose interval overlaps [start, end), in start order"""
+        limit = bisect_left(self.starts, end)
+        found = []
+        if limit:
+            self._collect(1, 0, self.size, limit, start, found)
+        return [(self.starts[i], self.ends[i], self.items[i]) for i in found]
+    
+    def _collect(self, node, low, high, limit, start, found):
+        if low >= limit or self.max_end[node] <= start:
+            return
+        if high - low == 1:
+            found.append(low)
+            return
+        middle = (low + high) // 2
+        self._collect(2 * node, low, middle, limit, start, found)
+        self._collect(2 * node + 1, middle, high, limit, start, found)
+
+def record_entries(kind, record, window_start, window_end):
+    """(start, end, item) for each occurrence of an event or club meeting inside a window"""
+    if kind == 'event':
+        occurrences = event_occurrences(record, window_start, window_end)
+        item = {'type': 'event', 'id': record['id'], 'title': record['title']}
+    else:
+        occurrences = expand(record['recurrence'], window_start, window_end) if record.get('recurrence') else ()
+        item = {'type': 'club', 'id': record['id'], 'title': record['name']}
+    for start, end in occurrences:
+        yield start, end, item
+
+def schedule_entries(user_id, window_start, window_end):
+    """The user's RSVP'd events and club meetings inside a window"""
+    for event in load_data('events').values():
+        if user_id in event.get('rsvps', []):
+            yield from record_entries('event', event, window_start, window_end)
+    
+    for club in load_data('clubs').values():
+        if club.get('recurrence') and user_id in club.get('members', []):
+            yield from record_entries('club', club, window_start, window_end)
+
+class ScheduleCache:
+    """Per-user schedule trees, updated from that user's own changes.
+    
+    A user's tree is built from the store once per day. After that, RSVPs,
+    cancellations, joins and leaves add or drop just that event's or club's
+    entries and rebuild the tree from the user's own entries, without
+    scanning other records. Other users' changes never touch it.
+    """
+    
+    def __init__(self, max_entries=SCHEDULE_CACHE_USERS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # User -> whether they changed while their tree was being built
+        self._building = {}
+    
+    def tree(self, user_id, day):
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached[0] == day:
+                self._entries.move_to_end(user_id)
+                return cached[2]
+            self._building[user_id] = False
+        
+        entries = list(schedule_entries(user_id, day, day + SCHEDULE_HORIZON_DAYS * DAY))
+        tree = IntervalTree(entries)
+        with self._lock:
+            if self._building.pop(user_id, True):
+                # The scan may have missed a concurrent change; build again next time
+                return tree
+            self._entries[user_id] = (day, entries, tree)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return tree
+    
+    def update(self, user_id, kind, record_id, record=None):
+        """Replace one event's or club's entries in a cached tree (drop them if record is None)"""
+        with self._lock:
+            if user_id in self._building:
+                self._building[user_id] = True
+            cached = self._entries.get(user_id)
+            if cached is None:
+                return
+            day, entries, _ = cached
+            entries = [entry for entry in entries if not (entry[2]['type'] == kind and entry[2]['id'] == record_id)]
+            if record is not None:
+                entries.extend(record_entries(kind, record, day, day + SCHEDULE_HORIZON_DAYS * DAY))
+            self._entries[user_id] = (day, entries, IntervalTree(entries))
+
+SCHEDULES = ScheduleCache()
+
+def add_commitment(user_id, kind, record):
+    """Record that a user RSVP'd to an event ('event') or joined a club ('club')"""
+    SCHEDULES.update(user_id, kind, record['id'], record)
+
+def remove_commitment(user_id, kind, record_id):
+    """Record that a user cancelled an RSVP or left a club"""
+    SCHEDULES.update(user_id, kind, record_id)
+
+def refresh_commitment(kind, record, members):
+    """Re-expand an edited event or club in its members' cached trees"""
+    for user_id in members:
+        SCHEDULES.update(user_id, kind, record['id'], record)
+
+def user_schedule(user_id):
+    """Interval tree of the user's commitments from today over the horizon"""
+    return SCHEDULES.tree(user_id, now_timestamp() // DAY * DAY)
+
+def find_conflicts(user_id, event):
+    """The user's commitments overlapping an event (every occurrence of a series in the horizon)"""
+    day = now_timestamp() // DAY * DAY
+    tree = user_schedule(user_id)
+    conflicts = []
+    for start, end in event_occurrences(event, day, day + SCHEDULE_HORIZON_DAYS * DAY):
+        conflicts.extend(
+            entry for entry in tree.overlapping(start, end)
+            if not (entry[2]['type'] == 'event' and entry[2]['id'] == event['id'])
+        )
+    return conflicts
+
+def week_agenda(user_id, week_start):
+    """Entries for the seven days from week_start (local midnight), grouped by day"""
+    first_day = datetime.fromtimestamp(week_start).date()
+    days = [[] for _ in range(7)]
+    for start, end, item in sorted(schedule_entries(user_id, week_start, week_start + 7 * DAY), key=lambda e: e[0]):
+        index = (datetime.fromtimestamp(start).date() - first_day).days
+        days[min(max(index, 0), 6)].append((start, end, item))
+    return days
\ No newline at end of file
@@ -0,0 +1,191 @@
+import time
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads shared by all jobs
+MAX_WORKERS = 4
+
+# Runs kept per job for the status view
+HISTORY_SIZE = 20
+
+# Longest delay between retries of a failing job
+MAX_BACKOFF_SECONDS = 3600
+
+class Job:
+    """A registered job and its run history"""
+    
+    def __init__(self, name, func, interval=None, run_at=None, description=""):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.description = description
+        self.next_run = run_at if run_at is not None else time.time()
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+        self.history = deque(maxlen=HISTORY_SIZE)
+    
+    @property
+    def periodic(self):
+        return self.interval is not None
+    
+    def backoff(self):
+        """Delay before retrying after consecutive failures"""
+        base = self.interval or 60
+        return min(base * 2 ** (self.consecutive_failures - 1), MAX_BACKOFF_SECONDS)
+    
+    def status(self):
+        """Snapshot of the job for display"""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'type': 'periodic' if self.periodic else 'one-shot',
+            'interval': self.interval,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'last_error': self.last_error,
+            'next_run': self.next_run,
+            'history': list(self.history)
+        }
+
+class Scheduler:
+    """In-process scheduler for periodic and one-shot jobs.
+    
+    A single timer thread picks due jobs and hands them to a thread pool, so
+    maintenance work runs off the request path. A job never overlaps with
+    itself, and failing jobs are retried with exponential backoff.
+    """
+    
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = None
+        self._thread = None
+    
+    def add_periodic(self, name, func, interval, initial_delay=0, description=""):
+        """Register a job that runs every interval seconds"""
+        job = Job(name, func, interval=interval, run_at=time.time() + initial_delay, description=description)
+        return self._add(job)
+    
+    def add_once(self, name, func, delay=0, description=""):
+        """Register a job that runs once after delay seconds"""
+        job = Job(name, func, run_at=time.time() + delay, description=description)
+        return self._add(job)
+    
+    def _add(self, job):
+        with self._lock:
+            self.jobs[job.name] = job
+        self._wakeup.set()
+        return job
+    
+    def remove(self, name):
+        """Unregister a job"""
+        with self._lock:
+            return self.jobs.pop(name, None)
+    
+    def run_now(self, name):
+        """Schedule a registered job to run immediately"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            job.next_run = time.time()
+        self._wakeup.set()
+        return True
+    
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the timer thread and worker pool"""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="campus-job")
+        self._thread = threading.Thread(target=self._loop, name="campus-scheduler", daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait=True):
+        """Stop scheduling new runs"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+    
+    def _loop(self):
+        while not self._stopped.is_set():
+            now = time.time()
+            next_wakeup = now + 60
+            
+            with self._lock:
+                for job in list(self.jobs.values()):
+                    if job.running or job.next_run is None:
+                        continue
+                    if job.next_run <= now:
+                        job.running = True
+                        self._executor.submit(self._run, job)
+                    else:
+                        next_wakeup = min(next_wakeup, job.next_run)
+            
+            self._wakeup.wait(max(0.0, next_wakeup - time.time()))
+            self._wakeup.clear()
+    
+    def _run(self, job):
+        started = time.time()
+        error = None
+        try:
+            job.func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        
+        finished = time.time()
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.last_run = started
+            job.last_duration = finished - started
+            job.last_error = error
+            job.history.append({
+                'started': started,
+                'duration': finished - started,
+                'ok': error is None,
+                'error': error
+            })
+            
+            if error is not None:
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.next_run = finished + job.backoff()
+            else:
+                job.consecutive_failures = 0
+                if job.periodic:
+                    job.next_run = started + job.interval
+                else:
+                    job.next_run = None
+        self._wakeup.set()
+    
+    def status(self):
+        """Status of every registered job"""
+        with self._lock:
+            return [job.status() for job in self.jobs.values()]
+
+SCHEDULER = Scheduler()
\ No newline at end of file
@@ -0,0 +1,240 @@
+import os
+import sys
+import time
+import logging
+import threading
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Operations at least this slow are kept in the slow-operation log
+SLOW_OPERATION_MS_ENV = 'STORAGE_SLOW_MS'
+DEFAULT_SLOW_OPERATION_MS = 25.0
+
+SLOW_LOG_SIZE = 200
+
+# Prometheus text export: a file rewritten by a background job and/or a local endpoint
+METRICS_FILE_ENV = 'STORAGE_METRICS_FILE'
+METRICS_PORT_ENV = 'STORAGE_METRICS_PORT'
+METRICS_FILE_SECONDS = 15
+
+PREFIX = 'campus_storage'
+
+logger = logging.getLogger(__name__)
+
+def approximate_bytes(value):
+    """Size of a record and its direct field values, without following nested containers"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(sys.getsizeof(item) for item in value.values())
+    for cls in type(value).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(value, name):
+                size += sys.getsizeof(getattr(value, name))
+    return size
+
+def calling_page():
+    """Module.function of the page code that issued the current storage call"""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('pages.'):
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and module not in (__name__, 'database', 'contextlib'):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+    
+    __slots__ = ('buckets', 'count', 'sum')
+    
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds):
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+    
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (inf past the last bound)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+class OperationStats:
+    """Counters for one (operation, collection) pair"""
+    
+    __slots__ = ('calls', 'records', 'bytes_written', 'slow', 'latency')
+    
+    def __init__(self):
+        self.calls = 0
+        self.records = 0
+        self.bytes_written = 0
+        self.slow = 0
+        self.latency = LatencyHistogram()
+
+class StorageMetrics:
+    """Per-collection call counts, latencies, records touched and bytes written.
+    
+    Calls at or over the slow threshold are also appended to a bounded log
+    with the page function that made them.
+    """
+    
+    def __init__(self, slow_ms=None):
+        if slow_ms is None:
+            slow_ms = float(os.environ.get(SLOW_OPERATION_MS_ENV, DEFAULT_SLOW_OPERATION_MS))
+        self.slow_ms = slow_ms
+        self.operations = {}
+        self.slow_log = deque(maxlen=SLOW_LOG_SIZE)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+    
+    def observe(self, operation, collection, seconds, records=0, bytes_written=0):
+        slow = seconds * 1000 >= self.slow_ms
+        with self._lock:
+            stats = self.operations.get((operation, collection))
+            if stats is None:
+                stats = self.operations[(operation, collection)] = OperationStats()
+            stats.calls += 1
+            stats.records += records
+            stats.bytes_written += bytes_written
+            stats.latency.observe(seconds)
+            if slow:
+                stats.slow += 1
+        
+        if slow:
+            self.slow_log.append({
+                'at': time.time(),
+                'operation': operation,
+                'collection': collection,
+                'ms': seconds * 1000,
+                'records': records,
+                'caller': calling_page()
+            })
+    
+    def snapshot(self):
+        """One row per (operation, collection), busiest first"""
+        with self._lock:
+            rows = [
+                {
+                    'operation': operation,
+                    'collection': collection,
+                    'calls': stats.calls,
+                    'records': stats.records,
+                    'bytes_written': stats.bytes_written,
+                    'slow': stats.slow,
+                    'mean_ms': stats.latency.sum / stats.calls * 1000 if stats.calls else None,
+                    'p95_ms': stats.latency.quantile(0.95) * 1000 if stats.calls else None
+                }
+                for (operation, collection), stats in self.operations.items()
+            ]
+        return sorted(rows, key=lambda row: row['calls'], reverse=True)
+    
+    def prometheus(self):
+        """All counters and histograms in the Prometheus text exposition format"""
+        with self._lock:
+            items = sorted(self.operations.items())
+            lines = []
+            
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            
+            def labels(operation, collection, extra=""):
+                return f'{{operation="{operation}",collection="{collection}"{extra}}}'
+            
+            family('operations_total', 'counter', "Storage calls by operation and collection")
+            for (operation, collection), stats in items:
+                lines.append(f"{PREFIX}_operations_total{labels(operation, collection)} {stats.calls}")
+            
+            family('records_total', 'counter', "Records returned or written")
+            for (operation, collection), stats in items:
+                lines.append(f"{PREFIX}_records_total{labels(operation, collection)} {stats.records}")
+            
+            family('bytes_written_total', 'counter', "Approximate bytes of records written")
+            for (operation, collection), stats in items:
+                if operation != 'load':
+                    lines.append(f"{PREFIX}_bytes_written_total{labels(operation, collection)} {stats.bytes_written}")
+            
+            family('slow_operations_total', 'counter', f"Calls slower than {self.slow_ms:g} ms")
+            for (operation, collection), stats in items:
+                lines.append(f"{PREFIX}_slow_operations_total{labels(operation, collection)} {stats.slow}")
+            
+            family('latency_seconds', 'histogram', "Storage call latency")
+            for (operation, collection), stats in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), stats.latency.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                    bucket = labels(operation, collection, ',le="' + le + '"')
+                    lines.append(f"{PREFIX}_latency_seconds_bucket{bucket} {cumulative}")
+                lines.append(f"{PREFIX}_latency_seconds_sum{labels(operation, collection)} {stats.latency.sum:.9f}")
+                lines.append(f"{PREFIX}_latency_seconds_count{labels(operation, collection)} {stats.latency.count}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        with self._lock:
+            self.operations.clear()
+            self.slow_log.clear()
+            self.started_at = time.time()
+
+STORAGE_METRICS = StorageMetrics()
+
+def write_metrics_file(path=None):
+    """Rewrite the Prometheus text file (atomically, for node_exporter's textfile collector)"""
+    path = path or os.environ.get(METRICS_FILE_ENV)
+    if not path:
+        return False
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as fh:
+        fh.write(STORAGE_METRICS.prometheus())
+    os.replace(temporary, path)
+    return True
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = STORAGE_METRICS.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port=None):
+    """Serve /metrics on localhost in a daemon thread; returns the server or None.
+    
+    A port that cannot be bound (already in use, invalid) is logged and
+    skipped so the app still starts.
+    """
+    port = port or os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(('127.0.0.1', int(port)), MetricsHandler)
+    except (OSError, ValueError) as e:
+        logger.warning("Storage metrics endpoint not started on port %s: %s", port, e)
+        return None
+    threading.Thread(target=server.serve_forever, name='storage-metrics', daemon=True).start()
+    return server
\ No newline at end of file
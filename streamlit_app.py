@@ -1,13 +1,6 @@
 import streamlit as st
-import json
-import uuid
-from datetime import datetime, timedelta
-import pandas as pd
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import time
+import importlib
 
 # Page configuration
 st.set_page_config(
@@ -19,19 +12,99 @@ st.set_page_config(
 
 # Import our modules
 from auth import login_page, logout
-from database import (
-    load_data, save_data, get_user_by_email, create_user,
-    get_clubs, get_events, get_marketplace_items,
-    get_confessions, get_chats, initialize_sample_data
-)
-from pages.home import home_page
-from pages.clubs import clubs_page
-from pages.events import events_page
-from pages.marketplace import marketplace_page
-from pages.confessions import confessions_page
-from pages.chat import chat_page
-from pages.admin import admin_page
-from pages.profile import profile_page
+from database import initialize_sample_data, migrate_data_store
+from profiling import track_render
+
+# Page registry: page name -> (module, entry point).
+# Page modules are imported on first navigation, so sessions that only see
+# the login screen or the home feed never pay for admin, marketplace or chat code.
+PAGE_REGISTRY = {
+    "Home Feed": ("pages.home", "home_page"),
+    "Clubs & Communities": ("pages.clubs", "clubs_page"),
+    "Events": ("pages.events", "events_page"),
+    "Marketplace": ("pages.marketplace", "marketplace_page"),
+    "Confessions": ("pages.confessions", "confessions_page"),
+    "Chat": ("pages.chat", "chat_page"),
+    "Find Friends": ("pages.friends", "friends_page"),
+    "Admin Dashboard": ("pages.admin", "admin_page"),
+    "My Profile": ("pages.profile", "profile_page"),
+}
+
+@st.cache_resource
+def load_environment():
+    """Load environment variables once per process"""
+    from dotenv import load_dotenv
+    return load_dotenv()
+
+@st.cache_resource
+def migrate_existing_data():
+    """Convert dict records already in the store to models once per process"""
+    migrate_data_store()
+    return True
+
+@st.cache_resource
+def start_background_jobs():
+    """Start the maintenance scheduler once per process"""
+    from maintenance import register_maintenance_jobs
+    scheduler = register_maintenance_jobs()
+    scheduler.start()
+    return scheduler
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Serve storage metrics on localhost once per process, if a port is configured"""
+    from storage_metrics import start_metrics_server
+    return start_metrics_server()
+
+@st.cache_resource
+def get_import_profile():
+    """Process-wide record of page module import times"""
+    return {}
+
+def resolve_page(page_name):
+    """Import a page module on first navigation and return its entry point"""
+    if page_name not in PAGE_REGISTRY:
+        return None
+    
+    module_name, func_name = PAGE_REGISTRY[page_name]
+    profile = get_import_profile()
+    
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    
+    # Only the first import is real work; later calls hit sys.modules
+    if module_name not in profile:
+        profile[module_name] = {
+            'page': page_name,
+            'import_ms': (time.perf_counter() - start) * 1000,
+            'imported_at': time.time()
+        }
+    
+    return getattr(module, func_name)
+
+def import_profile_report():
+    """Page module import times, slowest first"""
+    profile = get_import_profile()
+    return sorted(
+        ({'module': name, **entry} for name, entry in profile.items()),
+        key=lambda x: x['import_ms'],
+        reverse=True
+    )
+
+def display_import_profile():
+    """Show the import-time profile report"""
+    report = import_profile_report()
+    
+    if not report:
+        st.caption("No page modules imported yet")
+        return
+    
+    for entry in report:
+        st.caption(f"`{entry['module']}` • {entry['import_ms']:.1f} ms")
+    
+    not_loaded = [name for name in PAGE_REGISTRY if PAGE_REGISTRY[name][0] not in get_import_profile()]
+    if not_loaded:
+        st.caption(f"Not loaded: {', '.join(not_loaded)}")
 
 def main():
     """Main application entry point"""
@@ -44,9 +117,17 @@ def main():
     if 'privacy_consent' not in st.session_state:
         st.session_state.privacy_consent = False
     
-    # Initialize sample data
+    # Load environment variables
+    load_environment()
+    
+    # Convert any existing dict records, then add sample data
+    migrate_existing_data()
     initialize_sample_data()
     
+    # Housekeeping runs in the background, not in page renders
+    start_background_jobs()
+    start_metrics_endpoint()
+    
     # Check if user is logged in
     if not st.session_state.user:
         login_page()
@@ -111,6 +192,7 @@ def main_app():
             "🛒 Marketplace",
             "🗣️ Confessions",
             "💬 Chat",
+            "🤝 Find Friends",
             "👤 My Profile"
         ]
         
@@ -118,44 +200,50 @@ def main_app():
         if st.session_state.user.get('role') == 'admin':
             menu_options.append("⚡ Admin Dashboard")
         
-        selected_menu = st.radio("Navigate to:", menu_options)
+        # Pages request navigation by setting pending_page before a rerun
+        pending_page = st.session_state.pop('pending_page', None)
+        for option in menu_options:
+            if option.split(" ", 1)[1] == pending_page:
+                st.session_state.nav_menu = option
+        
+        selected_menu = st.radio("Navigate to:", menu_options, key="nav_menu")
         
         # Extract page name from emoji
         st.session_state.page = selected_menu.split(" ", 1)[1]
         
+        # An event opened via "View Details" is closed by leaving Events
+        if st.session_state.page != "Events":
+            st.session_state.pop('view_event', None)
+        
         st.divider()
         
         # Quick actions
         st.write("**Quick Actions**")
         if st.button("📢 Create Post", use_container_width=True):
             st.session_state.show_create_post = True
-            
+        
         if st.button("🔍 Find Friends", use_container_width=True):
-            st.session_state.page = "Clubs & Communities"
-            
+            st.session_state.pending_page = "Find Friends"
+            st.rerun()
+        
         st.divider()
         
+        # Import-time profile (admins only)
+        if st.session_state.user.get('role') == 'admin':
+            with st.expander("⏱️ Import Profile"):
+                display_import_profile()
+            
+            st.divider()
+        
         # Logout
         if st.button("🚪 Logout", use_container_width=True, type="secondary"):
             logout()
     
-    # Route to appropriate page
-    if st.session_state.page == "Home Feed":
-        home_page()
-    elif st.session_state.page == "Clubs & Communities":
-        clubs_page()
-    elif st.session_state.page == "Events":
-        events_page()
-    elif st.session_state.page == "Marketplace":
-        marketplace_page()
-    elif st.session_state.page == "Confessions":
-        confessions_page()
-    elif st.session_state.page == "Chat":
-        chat_page()
-    elif st.session_state.page == "Admin Dashboard":
-        admin_page()
-    elif st.session_state.page == "My Profile":
-        profile_page()
+    # Route to appropriate page, timing each render
+    page = resolve_page(st.session_state.page)
+    if page:
+        with track_render(st.session_state.page):
+            page()
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Make the app's modules importable by the names they use for each other.
+
+The app's modules import database by name, but in this tree it is kept under
+its generated file name. It is loaded from that file and registered under the
+imported name unless the name is already importable (for example in a deployed
+layout that has the renamed files).
+"""
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported name -> file in this tree
+MODULE_FILES = {
+    'database': 'deepseek_python_20251118_30465b.py'
+}
+
+sys.path.insert(0, ROOT)
+
+for name, filename in MODULE_FILES.items():
+    if importlib.util.find_spec(name) is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
\ No newline at end of file
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from seed import seed_data_store, scale_counts, BENCH_ADMIN
+from database import load_data, save_data, to_record
+from models import now_timestamp
+from export import EXPORT_COLLECTIONS, EXPORT_FORMATS, export_collection
+
+@pytest.fixture(scope='module')
+def seeded():
+    seed_data_store(scale_counts(20))
+    now = now_timestamp()
+    save_data('announcements', [to_record('announcements', {
+        'id': 'announcement_1', 'title': "Welcome", 'content': "Hello", 'author_id': BENCH_ADMIN['id'], 'timestamp': now
+    })])
+    save_data('reports', [to_record('reports', {
+        'id': 'report_1', 'confession_id': 'confession_000000', 'reporter_id': 'user_000001',
+        'reason': "Spam", 'created_at': now
+    })])
+    save_data('admin_logs', [to_record('admin_logs', {
+        'admin_id': BENCH_ADMIN['id'], 'action': "seeded", 'timestamp': now
+    })])
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS.values()))
+@pytest.mark.parametrize('collection', EXPORT_COLLECTIONS)
+def test_export_every_collection(seeded, tmp_path, collection, fmt):
+    if fmt == 'parquet':
+        pytest.importorskip('pyarrow')
+    
+    result = export_collection(collection, fmt, directory=str(tmp_path))
+    
+    expected = sum(len(chat['messages']) for chat in load_data('chats').values()) if collection == 'messages' \
+        else len(load_data(collection))
+    assert result['rows'] == expected > 0
+    assert os.path.getsize(result['path']) == result['bytes']
+    
+    with open(result['path'], 'rb') as fh:
+        assert b'x' * 60 not in fh.read()
+
+def test_failed_export_removes_partial_file(seeded, tmp_path, monkeypatch):
+    import export
+    
+    def failing(rows, columns, path):
+        with open(path, 'w') as fh:
+            fh.write("partial")
+        yield
+        raise ValueError("writer failed")
+    
+    monkeypatch.setitem(export.WRITERS, 'csv', failing)
+    with pytest.raises(ValueError):
+        export_collection('users', 'csv', directory=str(tmp_path))
+    assert os.listdir(tmp_path) == []
\ No newline at end of file
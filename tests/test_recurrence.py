@@ -0,0 +1,22 @@
+import pytest
+
+from recurrence import parse_meeting_schedule
+
+@pytest.mark.parametrize('text, weekdays, start, end', [
+    ("Every Wednesday 6-8 PM", [2], 18 * 60, 20 * 60),
+    ("Fridays 4-6 PM", [4], 16 * 60, 18 * 60),
+    ("Biweekly Saturdays 10am-12pm", [5], 10 * 60, 12 * 60),
+    ("Tuesdays and Thursdays 7-9 PM", [1, 3], 19 * 60, 21 * 60),
+    ("Every Friday 5 PM", [4], 17 * 60, 18 * 60),
+    ("Mondays 11 PM - 1 AM", [0], 23 * 60, 25 * 60),
+    ("Fridays 10 to 2", [4], 10 * 60, 14 * 60),
+    ("Sundays 9:30-11", [6], 9 * 60 + 30, 11 * 60),
+    ("Saturdays 22-2", [5], 22 * 60, 26 * 60)
+])
+def test_parse_meeting_schedule(text, weekdays, start, end):
+    rule = parse_meeting_schedule(text)
+    assert (rule['weekdays'], rule['start'], rule['end']) == (weekdays, start, end)
+
+@pytest.mark.parametrize('text', ["", "Whenever we can", "Fridays after class"])
+def test_parse_meeting_schedule_without_weekday_or_time(text):
+    assert parse_meeting_schedule(text) is None
\ No newline at end of file
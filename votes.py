@@ -0,0 +1,92 @@
+import threading
+
+from database import get_record, batch_write
+from models import USER_IDS
+
+# Seconds between flushes of buffered vote counts to the store
+VOTE_FLUSH_SECONDS = 2
+
+UPVOTE = 1
+DOWNVOTE = -1
+
+class VoteLedger:
+    """One vote per (confession, voter), with write-behind counters.
+    
+    Casting a vote only touches the ledger and an in-memory delta for the
+    confession. flush() folds the accumulated deltas into the stored
+    upvotes/downvotes in one batched write, so a burst of clicks on a hot
+    confession costs a single store write per flush interval.
+    """
+    
+    def __init__(self):
+        self._votes = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def cast(self, confession_id, user_id, direction):
+        """Vote in direction, switch direction, or retract a repeated vote.
+        
+        Returns the user's vote afterwards: UPVOTE, DOWNVOTE or 0.
+        """
+        key = (confession_id, USER_IDS.intern(user_id))
+        with self._lock:
+            previous = self._votes.get(key, 0)
+            current = 0 if previous == direction else direction
+            if current:
+                self._votes[key] = current
+            else:
+                self._votes.pop(key, None)
+            
+            delta = self._pending.setdefault(confession_id, [0, 0])
+            delta[0] += (current == UPVOTE) - (previous == UPVOTE)
+            delta[1] += (current == DOWNVOTE) - (previous == DOWNVOTE)
+            return current
+    
+    def vote_of(self, confession_id, user_id):
+        """The user's current vote on a confession"""
+        user_int = USER_IDS.get(user_id)
+        if user_int is None:
+            return 0
+        return self._votes.get((confession_id, user_int), 0)
+    
+    def counts(self, confession):
+        """(upvotes, downvotes) including deltas not yet flushed"""
+        with self._lock:
+            up = confession.get('upvotes', 0)
+            down = confession.get('downvotes', 0)
+            delta = self._pending.get(confession['id'])
+            if delta:
+                up += delta[0]
+                down += delta[1]
+            return up, down
+    
+    def pending(self):
+        """Number of confessions with unflushed deltas"""
+        return len(self._pending)
+    
+    def flush(self):
+        """Apply buffered deltas to the store in one batch"""
+        # Held through the write so counts() never sees a delta twice or not at all
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            changed = {cid: delta for cid, delta in pending.items() if delta[0] or delta[1]}
+            if not changed:
+                return 0
+            
+            with batch_write('confessions'):
+                for confession_id, (up, down) in changed.items():
+                    confession = get_record('confessions', confession_id)
+                    if confession is None:
+                        continue
+                    confession['upvotes'] = confession.get('upvotes', 0) + up
+                    confession['downvotes'] = confession.get('downvotes', 0) + down
+            return len(changed)
+    
+    def forget(self, confession_id):
+        """Drop ledger entries for a deleted confession"""
+        with self._lock:
+            self._pending.pop(confession_id, None)
+            for key in [k for k in self._votes if k[0] == confession_id]:
+                del self._votes[key]
+
+VOTES = VoteLedger()
\ No newline at end of file